@@ -0,0 +1,327 @@
+import hashlib
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+import requests
+import urllib3
+from TransientDownloadError import TransientDownloadError
+from typing import Dict, Set, Tuple
+
+class _HashingReader:
+    """
+    A file-like wrapper that hashes, counts and times the bytes read from a stream.
+
+    Attributes:
+        sha256 (hashlib._Hash): The SHA-256 of the bytes read so far.
+        size (int): The number of bytes read so far.
+        read_time (float): The time, in seconds, spent waiting for the stream.
+    """
+
+    def __init__(self, stream, max_size: int = None) -> None:
+        """
+        Initializes the _HashingReader object.
+
+        Args:
+            stream: The stream to read from.
+            max_size (int, optional): The maximum number of bytes allowed. Defaults to no limit.
+        """
+
+        self.__stream = stream
+        self.__max_size = max_size
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.read_time = 0.0
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Reads bytes from the stream.
+
+        Args:
+            size (int, optional): The maximum number of bytes to read. Defaults to -1 (everything).
+
+        Returns:
+            bytes: The bytes read.
+
+        Raises:
+            RuntimeError: If the stream exceeds the maximum size allowed.
+        """
+
+        start = time.perf_counter()
+        data = self.__stream.read(size)
+        self.read_time += time.perf_counter() - start
+
+        self.sha256.update(data)
+        self.size += len(data)
+
+        if self.__max_size is not None and self.size > self.__max_size:
+            raise RuntimeError(f"Archive exceeds the maximum size of {self.__max_size} bytes")
+
+        return data
+
+class ArchiveDownloader:
+    """
+    A class for downloading the code of commits from GitHub as archives, without buffering them in memory.
+
+    Tarballs are extracted while they are downloaded. ZIP archives, which need random access, are
+    downloaded in chunks to a spooled temporary file in the scratch directory and then extracted.
+    The size and SHA-256 of every archive are checked, and the time of each phase is returned.
+
+    Attributes:
+        project_url (str): The URL of the project repository.
+        archive_format (str): The format of the archives, either "tar.gz" or "zip".
+        scratch_directory (str): The directory for temporary files. None uses the system default.
+        chunk_size (int): The number of bytes read from the network at a time.
+        max_archive_size (int): The maximum size of an archive, in bytes. None means no limit.
+        spool_max_size (int): The maximum number of bytes of a ZIP archive kept in memory before spilling to disk.
+        timeout (int): The timeout, in seconds, of the HTTP requests.
+    """
+
+    def __init__(
+        self,
+        project_url: str,
+        archive_format: str = "tar.gz",
+        scratch_directory: str = None,
+        chunk_size: int = 1024 * 1024,
+        max_archive_size: int = None,
+        spool_max_size: int = 64 * 1024 * 1024,
+        timeout: int = 300
+    ) -> None:
+        """
+        Initializes the ArchiveDownloader object.
+
+        Args:
+            project_url (str): The URL of the project repository.
+            archive_format (str, optional): The format of the archives, either "tar.gz" or "zip". Defaults to "tar.gz".
+            scratch_directory (str, optional): The directory for temporary files. Defaults to the system default.
+            chunk_size (int, optional): The number of bytes read from the network at a time. Defaults to 1 MiB.
+            max_archive_size (int, optional): The maximum size of an archive, in bytes. Defaults to no limit.
+            spool_max_size (int, optional): The maximum number of bytes of a ZIP archive kept in memory. Defaults to 64 MiB.
+            timeout (int, optional): The timeout, in seconds, of the HTTP requests. Defaults to 300.
+
+        Raises:
+            ValueError: If the archive format is not supported.
+        """
+
+        if archive_format not in ("tar.gz", "zip"):
+            raise ValueError(f"Unsupported archive format: {archive_format}")
+
+        self.project_url = project_url
+        self.archive_format = archive_format
+        self.scratch_directory = scratch_directory
+        self.chunk_size = chunk_size
+        self.max_archive_size = max_archive_size
+        self.spool_max_size = spool_max_size
+        self.timeout = timeout
+
+        if scratch_directory is not None:
+            os.makedirs(scratch_directory, exist_ok=True)
+
+    @staticmethod
+    def __check_size(response: requests.Response, size: int) -> None:
+        """
+        Checks the number of bytes received against the Content-Length header, when the server sends it.
+
+        Args:
+            response (requests.Response): The HTTP response.
+            size (int): The number of bytes received.
+
+        Raises:
+            TransientDownloadError: If the sizes do not match.
+        """
+
+        content_length = response.headers.get("Content-Length")
+
+        if content_length is not None and int(content_length) != size:
+            raise TransientDownloadError(f"Incomplete archive: expected {content_length} bytes, received {size}")
+
+    @staticmethod
+    def __check_checksum(sha256: str, expected_sha256: str) -> None:
+        """
+        Checks the SHA-256 of an archive against the expected one, when it is known.
+
+        Args:
+            sha256 (str): The SHA-256 of the archive received.
+            expected_sha256 (str): The expected SHA-256 or None.
+
+        Raises:
+            RuntimeError: If the checksums do not match.
+        """
+
+        if expected_sha256 is not None and sha256 != expected_sha256:
+            raise RuntimeError(f"Checksum mismatch: expected {expected_sha256}, received {sha256}")
+
+    @staticmethod
+    def __add_root_directory(name: str, root_directories: Set[str]) -> None:
+        """
+        Records the top-level directory of a member of an archive, rejecting the members that would be written
+        outside of the destination, as the top-level directories are removed if the download fails.
+
+        Args:
+            name (str): The name of the member.
+            root_directories (Set[str]): The top-level directories extracted so far.
+
+        Raises:
+            RuntimeError: If the name is an absolute path or goes up with "..".
+        """
+
+        path = os.path.normpath(name)
+
+        if os.path.isabs(path) or path.split(os.sep)[0] == "..":
+            raise RuntimeError(f"Unsafe member in archive: {name}")
+
+        # The member "./" of some tarballs is the destination itself
+        if path != ".":
+            root_directories.add(path.split(os.sep)[0])
+
+    def __stream_tarball(self, reader: _HashingReader, destination: str, root_directories: Set[str]) -> Tuple[float, float]:
+        """
+        Extracts a tarball while it is downloaded.
+
+        Args:
+            reader (_HashingReader): The reader of the streamed HTTP response.
+            destination (str): The directory where the archive is extracted.
+            root_directories (Set[str]): Filled with the top-level directories extracted.
+
+        Returns:
+            Tuple[float, float]: The time spent waiting for the network and the remaining time.
+
+        Raises:
+            RuntimeError: If a member would be written outside of the destination.
+            tarfile.FilterError: If a member is rejected by the "data" extraction filter (e.g. a link outside
+                of the destination or a device file).
+        """
+
+        start = time.perf_counter()
+
+        with tarfile.open(fileobj=reader, mode="r|gz", bufsize=self.chunk_size) as tar:
+            for member in tar:
+                self.__add_root_directory(member.name, root_directories)
+                tar.extract(member, destination, filter="data")
+
+        # Reads the padding after the end-of-archive marker, so the checksum covers the whole file
+        while reader.read(self.chunk_size):
+            pass
+
+        elapsed = time.perf_counter() - start
+
+        return reader.read_time, elapsed - reader.read_time
+
+    def __spool_zip(self, reader: _HashingReader, destination: str, root_directories: Set[str]) -> Tuple[float, float]:
+        """
+        Downloads a ZIP archive in chunks to a spooled temporary file and then extracts it.
+
+        Args:
+            reader (_HashingReader): The reader of the streamed HTTP response.
+            destination (str): The directory where the archive is extracted.
+            root_directories (Set[str]): Filled with the top-level directories extracted.
+
+        Returns:
+            Tuple[float, float]: The download time and the extract time.
+
+        Raises:
+            RuntimeError: If a member would be written outside of the destination.
+        """
+
+        with tempfile.SpooledTemporaryFile(max_size=self.spool_max_size, dir=self.scratch_directory) as spool:
+            start = time.perf_counter()
+
+            while True:
+                chunk = reader.read(self.chunk_size)
+
+                if not chunk:
+                    break
+
+                spool.write(chunk)
+
+            download_time = time.perf_counter() - start
+
+            spool.seek(0)
+            start = time.perf_counter()
+
+            with zipfile.ZipFile(spool) as zip:
+                for name in zip.namelist():
+                    self.__add_root_directory(name, root_directories)
+
+                zip.extractall(destination)
+
+            extract_time = time.perf_counter() - start
+
+        return download_time, extract_time
+
+    def download_commit(self, commit_sha: str, destination: str = ".", expected_sha256: str = None) -> Dict:
+        """
+        Downloads the code corresponding to a given commit SHA and extracts it.
+
+        If the download or any check fails, the directories already extracted are removed.
+
+        Args:
+            commit_sha (str): The SHA of the commit to be downloaded.
+            destination (str, optional): The directory where the archive is extracted. Defaults to ".".
+            expected_sha256 (str, optional): The expected SHA-256 of the archive. Defaults to no check.
+
+        Returns:
+            Dict: The size and SHA-256 of the archive, and the time, in seconds, of the connect, download
+                and extract phases. For tarballs, download and extract overlap, and the extract time is the
+                time not spent waiting for the network.
+
+        Raises:
+            TransientDownloadError: If the server fails (5xx), rate limits the request (429) or the archive is
+                incomplete, which may succeed if retried.
+            RuntimeError: If the download fails otherwise or the archive does not pass the checks.
+        """
+
+        commit_url = f"{self.project_url}/archive/{commit_sha}.{self.archive_format}"
+        root_directories = set()
+
+        start = time.perf_counter()
+        response = requests.get(commit_url, stream=True, timeout=self.timeout)
+        connect_time = time.perf_counter() - start
+
+        try:
+            # Server errors and rate limits are temporary, unlike a missing commit
+            if response.status_code >= 500 or response.status_code == 429:
+                raise TransientDownloadError(f"Error downloading {commit_url}. Status Code: {response.status_code}")
+
+            if response.status_code != 200:
+                raise RuntimeError(f"Error downloading {commit_url}. Status Code: {response.status_code}")
+
+            reader = _HashingReader(response.raw, self.max_archive_size)
+
+            try:
+                if self.archive_format == "tar.gz":
+                    download_time, extract_time = self.__stream_tarball(reader, destination, root_directories)
+                else:
+                    download_time, extract_time = self.__spool_zip(reader, destination, root_directories)
+            except (urllib3.exceptions.HTTPError, EOFError, tarfile.ReadError, zipfile.BadZipFile) as error:
+                content_length = response.headers.get("Content-Length")
+                is_cut_off = content_length is not None and reader.size < int(content_length)
+
+                # A connection closed or timed out mid-stream, or a stream that ends early, is an incomplete download
+                if isinstance(error, (urllib3.exceptions.HTTPError, EOFError)) or is_cut_off:
+                    raise TransientDownloadError(f"Incomplete archive {commit_url}: {error}") from error
+
+                raise
+
+            sha256 = reader.sha256.hexdigest()
+
+            self.__check_size(response, reader.size)
+            self.__check_checksum(sha256, expected_sha256)
+
+        except Exception:
+            for directory in root_directories:
+                shutil.rmtree(os.path.join(destination, directory), ignore_errors=True)
+            raise
+
+        finally:
+            response.close()
+
+        return {
+            "size": reader.size,
+            "sha256": sha256,
+            "connect": connect_time,
+            "download": download_time,
+            "extract": extract_time
+        }
@@ -1,9 +1,14 @@
+import hashlib
+import json
 import os
 import subprocess
 import shutil
 import re
 import logging
-from typing import List
+import threading
+from BuildOutputCache import BuildOutputCache
+from commons.IOUtils import read_input_file, write_output_file
+from typing import Dict, List, Optional, Tuple
 
 class BuildHandler:
     """
@@ -11,21 +16,72 @@ class BuildHandler:
 
     Attributes:
         compile_command (str): The command used to compile the project.
+        incremental (bool): Whether the build outputs already in the tree are reused.
+        output_cache (BuildOutputCache): The cache of build outputs or None.
+        maven_repository (str): The absolute path of the local Maven repository shared by all builds or None.
+        offline (bool): Whether Maven builds run offline against the shared local repository.
+        maven_settings_file (str): The Maven settings file used when dependencies are downloaded or None.
+        gradle_build_cache (str): The absolute path of the local Gradle build cache shared by all builds or None.
+        gradle_user_home (str): The absolute path of the Gradle user home shared by all builds or None.
         __log_file (str): The path to the build errors log file.
         __logger (logging.Logger): The logger object for logging build errors.
+        __gradle_init_script (str): The path to the init script passed to Gradle builds.
+        __task_timings_file (str): The path to the file with the duration of the Gradle tasks of each commit.
+        __task_timings_lock (threading.Lock): Lock shared by all instances to update the task timings file.
+        __classpaths (Dict[str, List[str]]): The dependency classpath of the projects, keyed by the hash of their POM files.
+        __classpaths_lock (threading.Lock): Lock that guards the cache of classpaths.
     """
 
-    def __init__(self, compile_command: str) -> None:
+    __task_timings_lock = threading.Lock()
+
+    def __init__(
+        self,
+        compile_command: str,
+        incremental: bool = False,
+        output_cache: BuildOutputCache = None,
+        maven_repository: str = None,
+        offline: bool = False,
+        maven_settings_file: str = None,
+        gradle_build_cache: str = None,
+        gradle_user_home: str = None
+    ) -> None:
         """
         Initializes the BuildHandler object.
 
         Args:
             compile_command (str): The command used to compile the project.
+            incremental (bool, optional): Whether the build outputs already in the tree are reused. If so, the
+                `clean` goal (or task) is removed from the compile command. Defaults to False.
+            output_cache (BuildOutputCache, optional): The cache of build outputs. Defaults to None (no cache).
+            maven_repository (str, optional): The local Maven repository shared by all builds. Defaults to None
+                (the default local repository of Maven).
+            offline (bool, optional): Whether Maven builds run offline against the shared local repository.
+                A build missing dependencies is retried online. Defaults to False.
+            maven_settings_file (str, optional): The Maven settings file used when dependencies are downloaded,
+                e.g. with a mirror pointing to a local repository manager. Defaults to None.
+            gradle_build_cache (str, optional): The local Gradle build cache shared by all builds. Defaults to None
+                (the build cache of the Gradle user home).
+            gradle_user_home (str, optional): The Gradle user home shared by all builds, with the dependencies and
+                the daemons. Defaults to None (the default Gradle user home).
         """
                 
+        if incremental:
+            compile_command = re.sub(r"(?<=\s)clean(?=\s|$)\s*", "", compile_command).strip()
+
         self.compile_command = compile_command
+        self.incremental = incremental
+        self.output_cache = output_cache
+        self.maven_repository = os.path.abspath(maven_repository) if maven_repository is not None else None
+        self.offline = offline and maven_repository is not None
+        self.maven_settings_file = os.path.abspath(maven_settings_file) if maven_settings_file is not None else None
+        self.gradle_build_cache = os.path.abspath(gradle_build_cache) if gradle_build_cache is not None else None
+        self.gradle_user_home = os.path.abspath(gradle_user_home) if gradle_user_home is not None else None
         self.__log_file = "./3-SonarQube_Execution/logs/build-errors.log"
         self.__logger = self.__setup_logger()
+        self.__gradle_init_script = os.path.abspath("./3-SonarQube_Execution/gradle/init.gradle")
+        self.__task_timings_file = "./3-SonarQube_Execution/logs/gradle-tasks/{repo}.json"
+        self.__classpaths = {}
+        self.__classpaths_lock = threading.Lock()
 
     def __setup_logger(self) -> logging.Logger:
         """
@@ -45,7 +101,41 @@ class BuildHandler:
         
         return logger
 
-    def check_build_files(self, repo: str, pr_number: int, commit_sha: str) -> None:
+    @staticmethod
+    def get_output_directories(compile_command: str) -> List[str]:
+        """
+        Returns the names of the directories where the build tool of a compile command writes its outputs.
+
+        Args:
+            compile_command (str): The command used to compile the project.
+
+        Returns:
+            List[str]: The names of the build output directories.
+        """
+
+        if "gradle" in compile_command:
+            return ["build", ".gradle"]
+
+        return ["target"]
+
+    @staticmethod
+    def get_module_build_files(compile_command: str) -> List[str]:
+        """
+        Returns the names of the files that define a module (or the root project) of the build tool of a compile command.
+
+        Args:
+            compile_command (str): The command used to compile the project.
+
+        Returns:
+            List[str]: The names of the build files.
+        """
+
+        if "gradle" in compile_command:
+            return ["build.gradle", "build.gradle.kts", "settings.gradle", "settings.gradle.kts"]
+
+        return ["pom.xml"]
+
+    def check_build_files(self, repo: str, pr_number: int, commit_sha: str, workspace: str = ".") -> None:
         """
         Checks if necessary build files exist for the project.
         Currently, only supports Maven and Gradle build tools.
@@ -54,17 +144,20 @@ class BuildHandler:
             repo (str): The name of the repository.
             pr_number (int): The number of the pull request.
             commit_sha (str): The SHA of the commit.
+            workspace (str, optional): The directory where the commit was extracted. Defaults to ".".
         """
-                
-        pom_location = f"./{repo}-{commit_sha}/pom.xml"
-        build_gradle_location = f"./{repo}-{commit_sha}/build.gradle"
+
+        code_directory = os.path.join(workspace, f"{repo}-{commit_sha}")
+        pom_location = os.path.join(code_directory, "pom.xml")
+        gradle_files = ["build.gradle", "build.gradle.kts", "settings.gradle", "settings.gradle.kts"]
+        has_gradle_files = any(os.path.exists(os.path.join(code_directory, gradle_file)) for gradle_file in gradle_files)
 
         if "mvn" in self.compile_command and not os.path.exists(pom_location):
-            shutil.rmtree(f"{repo}-{commit_sha}")
+            shutil.rmtree(code_directory)
             error_msg = f"Pom file not found for PR: {pr_number}"
             raise Exception(error_msg)
-        elif "gradle" in self.compile_command and not os.path.exists(build_gradle_location):
-            shutil.rmtree(f"{repo}-{commit_sha}")
+        elif "gradle" in self.compile_command and not has_gradle_files:
+            shutil.rmtree(code_directory)
             error_msg = f"Gradle file(s) missing for PR: {pr_number}"
             raise Exception(error_msg)
 
@@ -98,31 +191,497 @@ class BuildHandler:
         return error_lines[start_index:]
 
         
-    def compile_project(self, repo: str, pr_number: int, commit_sha: str) -> bool:
+    @staticmethod
+    def find_modules(code_directory: str, changed_files: List[str], build_files: List[str]) -> Optional[List[str]]:
         """
-        Compiles the project and logs any errors.
+        Maps the changed files to the modules that own them, i.e. the nearest directory above each file
+        that has a build file.
+
+        Args:
+            code_directory (str): The directory where the commit was extracted.
+            changed_files (List[str]): The paths of the changed files, relative to the root of the repository.
+            build_files (List[str]): The names of the files that define a module (e.g. "pom.xml").
+
+        Returns:
+            Optional[List[str]]: The paths of the modules, relative to the root of the repository, or None if
+                a file belongs to the root module, in which case the whole project must be built.
+        """
+
+        modules = set()
+
+        for changed_file in changed_files:
+            # Old names of moved files no longer exist, but their directories may still belong to a module
+            directory = os.path.dirname(changed_file)
+
+            while directory and not any(
+                os.path.exists(os.path.join(code_directory, directory, build_file)) for build_file in build_files
+            ):
+                directory = os.path.dirname(directory)
+
+            if not directory:
+                return None
+
+            modules.add(directory)
+
+        return sorted(modules)
+
+    def get_scoped_modules(self, code_directory: str, changed_files: List[str]) -> Optional[List[str]]:
+        """
+        Finds the modules a scoped build must compile, i.e. the modules owning the changed files.
+
+        Args:
+            code_directory (str): The directory where the commit was extracted.
+            changed_files (List[str]): The paths of the changed files, relative to the root of the repository.
+
+        Returns:
+            Optional[List[str]]: The paths of the modules or None if the build cannot be scoped.
+        """
+
+        if not changed_files:
+            return None
+
+        if "mvn" in self.compile_command:
+            return self.find_modules(code_directory, changed_files, ["pom.xml"])
+
+        if "gradle" in self.compile_command:
+            return self.find_modules(code_directory, changed_files, ["build.gradle", "build.gradle.kts"])
+
+        return None
+
+    def get_scoped_compile_command(self, modules: Optional[List[str]]) -> Optional[str]:
+        """
+        Builds a compile command restricted to the given modules and the modules they depend on.
+        For Maven, the modules are selected with `-pl` and their upstream modules with `-am`. For Gradle,
+        each subproject is built with `-p`, which also builds the subprojects it depends on.
+
+        Args:
+            modules (Optional[List[str]]): The paths of the modules, as returned by `get_scoped_modules`.
+
+        Returns:
+            Optional[str]: The scoped compile command or None if the build cannot be scoped.
+        """
+
+        if modules is None:
+            return None
+
+        if "mvn" in self.compile_command:
+            return re.sub(r"\b(mvnw?)\b", rf"\1 -pl {','.join(modules)} -am", self.compile_command, count=1)
+
+        if "gradle" in self.compile_command:
+            return " && ".join(
+                re.sub(r"\b(gradlew?)\b", rf"\1 -p {module}", self.compile_command, count=1) for module in modules
+            )
+
+        return None
+
+    def __get_maven_command(self, command: str, offline: bool) -> str:
+        """
+        Adds the options of the shared local repository, the offline mode and the settings file to a Maven command.
+
+        Args:
+            command (str): The Maven command.
+            offline (bool): Whether the command runs offline.
+
+        Returns:
+            str: The command with the options, or the command itself if it does not run Maven.
+        """
+
+        if "mvn" not in command:
+            return command
+
+        options = ["-B"]
+
+        if self.maven_repository is not None:
+            # Several builds may write to the shared local repository at the same time
+            options += [
+                f"-Dmaven.repo.local={self.maven_repository}",
+                "-Daether.syncContext.named.factory=file-lock",
+                "-Daether.syncContext.named.nameMapper=file-gav"
+            ]
+
+        if offline:
+            options.append("-o")
+        elif self.maven_settings_file is not None:
+            options.append(f"-s {self.maven_settings_file}")
+
+        return re.sub(r"\b(mvnw?)\b", rf"\1 {' '.join(options)}", command, count=1)
+
+    @staticmethod
+    def get_gradle_version(code_directory: str) -> Optional[Tuple[int, int]]:
+        """
+        Reads the Gradle version of a project from the distribution of its wrapper.
+
+        Args:
+            code_directory (str): The directory where the commit was extracted.
+
+        Returns:
+            Optional[Tuple[int, int]]: The major and minor version, or None if the project has no wrapper or its
+                distribution has no version (e.g. a custom distribution).
+        """
+
+        properties_file = os.path.join(code_directory, "gradle", "wrapper", "gradle-wrapper.properties")
+
+        if not os.path.exists(properties_file):
+            return None
+
+        with open(properties_file, "r") as f:
+            match = re.search(r"^distributionUrl=.*gradle-(\d+)\.(\d+)", f.read(), re.MULTILINE)
+
+        return (int(match.group(1)), int(match.group(2))) if match is not None else None
+
+    def __get_gradle_command(self, command: str, code_directory: str) -> str:
+        """
+        Adds the options of the daemon, the build cache, the configuration cache and the init script to the
+        Gradle invocations of a command, each one only when the Gradle version of the wrapper supports it.
+        Without a known version (e.g. no wrapper), only the options supported by every version are added.
+
+        Args:
+            command (str): The Gradle command.
+            code_directory (str): The directory where the commit was extracted.
+
+        Returns:
+            str: The command with the options, or the command itself if it does not run Gradle.
+        """
+
+        if "gradle" not in command:
+            return command
+
+        version = self.get_gradle_version(code_directory) or (0, 0)
+        options = ["--daemon"]
+
+        if version >= (3, 5):
+            options.append("--build-cache")
+
+        if version >= (6, 6):
+            options += [
+                "--configuration-cache",
+                # Builds whose configuration is not compatible with the configuration cache still run
+                "--configuration-cache-problems=warn"
+            ]
+
+        # The init script uses build services and the listener registry of Gradle 6.1
+        if version >= (6, 1):
+            options.append(f"--init-script {self.__gradle_init_script}")
+
+            if self.gradle_build_cache is not None:
+                options.append(f"-DbuildCacheDirectory={self.gradle_build_cache}")
+
+        if self.gradle_user_home is not None:
+            options.append(f"--gradle-user-home {self.gradle_user_home}")
+
+        # Only the gradle word that starts each invocation is replaced, not the ones in its paths or arguments
+        return " && ".join(
+            re.sub(r"\b(gradlew?)\b", rf"\1 {' '.join(options)}", invocation, count=1) for invocation in command.split(" && ")
+        )
+
+    def __record_task_timings(self, repo: str, commit_sha: str, workspace: str) -> None:
+        """
+        Moves the duration of the Gradle tasks of a commit, written by the init script, to the task timings
+        file of the repository, slowest tasks first.
 
         Args:
             repo (str): The name of the repository.
-            pr_number (int): The number of the pull request.
             commit_sha (str): The SHA of the commit.
+            workspace (str): The directory where the commit was extracted.
+        """
+
+        timings_file = os.path.join(workspace, f"{repo}-{commit_sha}.task-timings.jsonl")
+
+        if not os.path.exists(timings_file):
+            return
+
+        with open(timings_file, "r") as f:
+            tasks = [json.loads(line) for line in f if line.strip()]
+
+        os.remove(timings_file)
+
+        tasks.sort(key=lambda task: task["duration"], reverse=True)
+        file = self.__task_timings_file.format(repo=repo)
+
+        with BuildHandler.__task_timings_lock:
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+            task_timings = read_input_file(file) if os.path.exists(file) else {}
+
+            # A commit may be built more than once (e.g. a scoped build and then the full build)
+            task_timings.setdefault(commit_sha, []).extend(tasks)
+
+            write_output_file(file, task_timings)
+
+    @staticmethod
+    def is_offline_miss(output: str) -> bool:
+        """
+        Checks if an offline Maven build failed because dependencies are missing from the local repository.
+
+        Args:
+            output (str): The output of the build.
 
         Returns:
-            bool: True if compilation is successful, False otherwise.
+            bool: True if the build failed because of missing dependencies, False otherwise.
         """
-                
-        subprocess.call(f'chmod -R 777 {repo}-{commit_sha}', shell=True)
+
+        return "offline mode" in output or "has not been downloaded from it before" in output
+
+    def __run_build(self, code_directory: str, compile_command: str) -> None:
+        """
+        Runs a compile command in the directory of a commit.
+
+        In the offline mode, a Maven build that fails because of missing dependencies is retried online,
+        which also adds them to the shared local repository.
+
+        Args:
+            code_directory (str): The directory where the commit was extracted.
+            compile_command (str): The command to run.
+
+        Raises:
+            subprocess.CalledProcessError: If the build fails.
+        """
+
         try:
             subprocess.run(
-                f"cd {repo}-{commit_sha} && {self.compile_command}",
+                f"cd {code_directory} && {self.__get_gradle_command(self.__get_maven_command(compile_command, self.offline), code_directory)}",
+                shell=True,
+                check=True,
+                capture_output=True,
+                text=True
+            )
+        except subprocess.CalledProcessError as err:
+            if not self.offline or not self.is_offline_miss(f"{err.output}\n{err.stderr}"):
+                raise
+
+            subprocess.run(
+                f"cd {code_directory} && {self.__get_maven_command(compile_command, False)}",
                 shell=True,
                 check=True,
                 capture_output=True,
                 text=True
             )
 
+    def prefetch_dependencies(self, repo: str, commit_sha: str, workspace: str = ".") -> bool:
+        """
+        Resolves the dependencies and plugins of a commit into the shared local Maven repository, so the
+        next builds can run offline. Errors are logged.
+
+        Args:
+            repo (str): The name of the repository.
+            commit_sha (str): The SHA of the commit.
+            workspace (str, optional): The directory where the commit was extracted. Defaults to ".".
+
+        Returns:
+            bool: True if the dependencies were resolved, False otherwise.
+        """
+
+        if "mvn" not in self.compile_command or self.maven_repository is None:
+            return False
+
+        code_directory = os.path.join(workspace, f"{repo}-{commit_sha}")
+        prefetch_command = self.__get_maven_command("mvn dependency:go-offline -DexcludeReactor=true", False)
+
+        try:
+            subprocess.run(
+                f"cd {code_directory} && {prefetch_command}",
+                shell=True,
+                check=True,
+                capture_output=True,
+                text=True
+            )
+
+            return True
+        except subprocess.CalledProcessError as err:
+            error_lines = err.output.splitlines()
+
+            error_message_lines = self.extract_compile_error_message_lines(error_lines)
+            self.__logger.error(f"Error to prefetch dependencies of commit {commit_sha} of repo {repo}")
+            self.__logger.error('\n' + '\n'.join(error_message_lines) + '\n')
+
+            return False
+
+    def __compute_poms_key(self, code_directory: str) -> str:
+        """
+        Computes a hash of the POM files of a project, which determine its dependency classpath.
+
+        Args:
+            code_directory (str): The directory where the commit was extracted.
+
+        Returns:
+            str: The SHA-256 of the paths and contents of every pom.xml file of the project.
+        """
+
+        pom_files = []
+
+        for dirpath, dirnames, filenames in os.walk(code_directory):
+            dirnames[:] = [dirname for dirname in dirnames if dirname not in ("target", ".git")]
+
+            if "pom.xml" in filenames:
+                pom_files.append(os.path.relpath(os.path.join(dirpath, "pom.xml"), code_directory))
+
+        digest = hashlib.sha256()
+
+        for pom_file in sorted(pom_files):
+            with open(os.path.join(code_directory, pom_file), "rb") as f:
+                digest.update(f"{pom_file}\0{hashlib.sha1(f.read()).hexdigest()}\n".encode())
+
+        return digest.hexdigest()
+
+    def __resolve_maven_classpath(self, repo: str, commit_sha: str, code_directory: str) -> Optional[List[str]]:
+        """
+        Resolves the compile classpath of every module of a Maven project with `dependency:build-classpath`.
+
+        The goal runs after the `compile` phase, with the compiler skipped as the project is already compiled,
+        so the sibling modules are resolved from the reactor, to their `target/classes` directories, instead of
+        the SNAPSHOT jars that other commits may have installed in the shared local repository. These
+        directories are already among the bytecode directories of the project, so they are left out of the
+        dependency classpath, which is shared by the commits with the same POM files.
+
+        Args:
+            repo (str): The name of the repository.
+            commit_sha (str): The SHA of the commit.
+            code_directory (str): The directory where the commit was extracted.
+
+        Returns:
+            List[str]: The absolute paths of the dependencies of all modules, without duplicates, or None if
+                the resolution of a module fails.
+        """
+
+        classpath_file = "target/sonar-classpath.txt"
+        module_classpath_files = []
+
+        for dirpath, dirnames, filenames in os.walk(code_directory):
+            dirnames[:] = [dirname for dirname in dirnames if dirname not in ("target", ".git")]
+
+            if "pom.xml" in filenames:
+                module_classpath_files.append(os.path.join(dirpath, classpath_file))
+
+        # Classpath files left by the resolution of a previous commit (e.g. in incremental builds) must not be read
+        for module_classpath_file in module_classpath_files:
+            if os.path.exists(module_classpath_file):
+                os.remove(module_classpath_file)
+
+        try:
+            self.__run_build(
+                code_directory,
+                f"mvn compile dependency:build-classpath -Dmaven.main.skip=true -Dmdep.includeScope=compile -Dmdep.outputFile={classpath_file}"
+            )
+        except subprocess.CalledProcessError:
+            self.__logger.error(f"Error to resolve the classpath of commit {commit_sha} of repo {repo}")
+            return None
+
+        reactor_directory = os.path.join(os.path.abspath(code_directory), "")
+        libraries = []
+
+        for module_classpath_file in module_classpath_files:
+            if not os.path.exists(module_classpath_file):
+                continue
+
+            with open(module_classpath_file, "r") as f:
+                libraries += [library for library in f.read().strip().split(os.pathsep) if library]
+
+        return [
+            library for library in dict.fromkeys(libraries)
+            if os.path.exists(library) and not os.path.abspath(library).startswith(reactor_directory)
+        ]
+
+    def get_analysis_classpath(self, repo: str, commit_sha: str, workspace: str = ".") -> Tuple[List[str], List[str]]:
+        """
+        Retrieves the bytecode directories of the modules of a compiled Maven project and the classpath of their
+        dependencies, to be passed to the Java analyzer. The dependency classpath is resolved once for each set
+        of POM files. Gradle projects are not supported, as their dependencies are not resolved.
+
+        Args:
+            repo (str): The name of the repository.
+            commit_sha (str): The SHA of the commit.
+            workspace (str, optional): The directory where the commit was extracted. Defaults to ".".
+
+        Returns:
+            Tuple[List[str], List[str]]: The absolute paths of the bytecode directories and of the dependencies.
+        """
+
+        code_directory = os.path.join(workspace, f"{repo}-{commit_sha}")
+        classes_directory = os.path.join("target", "classes")
+
+        binaries = []
+
+        for dirpath, dirnames, _ in os.walk(code_directory):
+            if os.path.isdir(os.path.join(dirpath, classes_directory)):
+                binaries.append(os.path.abspath(os.path.join(dirpath, classes_directory)))
+
+            dirnames[:] = [dirname for dirname in dirnames if dirname not in ("target", ".git")]
+
+        poms_key = self.__compute_poms_key(code_directory)
+
+        with self.__classpaths_lock:
+            libraries = self.__classpaths.get(poms_key)
+
+        if libraries is None:
+            libraries = self.__resolve_maven_classpath(repo, commit_sha, code_directory)
+
+            if libraries is None:
+                return sorted(binaries), []
+
+            with self.__classpaths_lock:
+                self.__classpaths[poms_key] = libraries
+
+        return sorted(binaries), libraries
+
+    def compile_project(self, repo: str, pr_number: int, commit_sha: str, workspace: str = ".", changed_files: List[str] = None) -> bool:
+        """
+        Compiles the project and logs any errors.
+
+        When the changed files are given, only the modules owning them (and the modules they depend on) are
+        compiled. If this scoped build fails, the whole project is compiled. When there is a cache of build
+        outputs, a tree already built with the same command is not compiled again.
+
+        Args:
+            repo (str): The name of the repository.
+            pr_number (int): The number of the pull request.
+            commit_sha (str): The SHA of the commit.
+            workspace (str, optional): The directory where the commit was extracted. Defaults to ".".
+            changed_files (List[str], optional): The files changed by the PR. Defaults to None (full build).
+
+        Returns:
+            bool: True if compilation is successful, False otherwise.
+        """
+
+        code_directory = os.path.join(workspace, f"{repo}-{commit_sha}")
+
+        subprocess.call(f'chmod -R 777 {code_directory}', shell=True)
+
+        modules = self.get_scoped_modules(code_directory, changed_files)
+        scoped_compile_command = self.get_scoped_compile_command(modules)
+        cache_key = None
+
+        if self.output_cache is not None:
+            # Scoped builds of the same tree share its entry, which records the modules already built
+            cache_key = self.output_cache.compute_key(code_directory, self.compile_command)
+
+            if self.output_cache.restore(cache_key, code_directory, modules):
+                return True
+
+        if scoped_compile_command is not None:
+            try:
+                self.__run_build(code_directory, scoped_compile_command)
+                self.__record_task_timings(repo, commit_sha, workspace)
+
+                if cache_key is not None:
+                    self.output_cache.store(cache_key, code_directory, modules)
+
+                return True
+            except subprocess.CalledProcessError:
+                self.__record_task_timings(repo, commit_sha, workspace)
+                self.__logger.error(
+                    f"Scoped build failed for commit {commit_sha} of PR {pr_number} of repo {repo}... Falling back to the full build"
+                )
+
+        try:
+            self.__run_build(code_directory, self.compile_command)
+            self.__record_task_timings(repo, commit_sha, workspace)
+
+            # The outputs of the full build also cover the modules of the scoped build
+            if cache_key is not None:
+                self.output_cache.store(cache_key, code_directory)
+
             return True
         except subprocess.CalledProcessError as err:
+            self.__record_task_timings(repo, commit_sha, workspace)
             error_lines = err.output.splitlines()
 
             error_message_lines = self.extract_compile_error_message_lines(error_lines)
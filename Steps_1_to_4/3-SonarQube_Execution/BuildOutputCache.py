@@ -0,0 +1,205 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import List, Optional
+from urllib.parse import quote, unquote
+
+class BuildOutputCache:
+    """
+    A class for caching the build outputs of source trees on disk, so they can be shared across commits and PRs.
+
+    Entries are keyed by a hash of the source tree and of the compile command of the project, and hold a copy
+    of the build output directories of each module, i.e. the output directories next to a build file. Many PRs
+    share the same base commit, so its build is only run once. As scoped builds of the same tree store the
+    outputs of different modules in the same entry, an entry records the modules it holds: a full build marks
+    the entry as complete, and a scoped build is only skipped when the entry holds all of its modules. The
+    cache is never pruned.
+
+    Attributes:
+        cache_directory (str): The directory where the entries are stored.
+        output_directories (List[str]): The names of the directories with build outputs (e.g. "target").
+        build_files (List[str]): The names of the files that define a module (e.g. "pom.xml").
+    """
+
+    def __init__(self, cache_directory: str, output_directories: List[str], build_files: List[str]) -> None:
+        """
+        Initializes the BuildOutputCache object.
+
+        Args:
+            cache_directory (str): The directory where the entries are stored.
+            output_directories (List[str]): The names of the directories with build outputs (e.g. "target").
+            build_files (List[str]): The names of the files that define a module (e.g. "pom.xml").
+        """
+
+        self.cache_directory = cache_directory
+        self.output_directories = output_directories
+        self.build_files = build_files
+
+        os.makedirs(cache_directory, exist_ok=True)
+
+    def __is_output_directory(self, dirname: str, filenames: List[str]) -> bool:
+        """
+        Checks if a directory holds build outputs, i.e. if it has the name of an output directory and is at the
+        root of a module. Source directories with the same name (e.g. a package named "build") are not outputs.
+
+        Args:
+            dirname (str): The name of the directory.
+            filenames (List[str]): The names of the files of its parent directory.
+
+        Returns:
+            bool: True if the directory holds build outputs, False otherwise.
+        """
+
+        return dirname in self.output_directories and any(build_file in filenames for build_file in self.build_files)
+
+    def __find_output_directories(self, directory: str) -> List[str]:
+        """
+        Finds the build output directories of the modules of a tree, without looking inside them.
+
+        Args:
+            directory (str): The root of the tree.
+
+        Returns:
+            List[str]: The paths of the build output directories, relative to the root of the tree.
+        """
+
+        output_paths = []
+
+        for dirpath, dirnames, filenames in os.walk(directory):
+            for dirname in list(dirnames):
+                if self.__is_output_directory(dirname, filenames):
+                    output_paths.append(os.path.relpath(os.path.join(dirpath, dirname), directory))
+                    dirnames.remove(dirname)
+
+        return output_paths
+
+    def compute_key(self, code_directory: str, compile_command: str) -> str:
+        """
+        Computes the key of a source tree, ignoring its build outputs and the metadata of git and SonarQube.
+
+        Args:
+            code_directory (str): The directory where the commit was materialized.
+            compile_command (str): The command used to compile the whole project, which is the same for the
+                scoped builds of the tree, so that they share its entry.
+
+        Returns:
+            str: The SHA-256 of the compile command and of the paths and contents of the source files.
+        """
+
+        source_files = []
+
+        for dirpath, dirnames, filenames in os.walk(code_directory):
+            dirnames[:] = [
+                dirname for dirname in dirnames
+                if dirname not in (".git", ".scannerwork") and not self.__is_output_directory(dirname, filenames)
+            ]
+
+            for filename in filenames:
+                source_files.append(os.path.relpath(os.path.join(dirpath, filename), code_directory))
+
+        digest = hashlib.sha256(f"{compile_command}\n".encode())
+
+        for source_file in sorted(source_files):
+            with open(os.path.join(code_directory, source_file), "rb") as f:
+                file_sha = hashlib.sha1(f.read()).hexdigest()
+
+            digest.update(f"{source_file}\0{file_sha}\n".encode())
+
+        return digest.hexdigest()
+
+    def __get_stored_outputs(self, key: str) -> List[str]:
+        """
+        Lists the build output directories stored in an entry.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            List[str]: The paths of the build output directories, relative to the root of the tree.
+        """
+
+        outputs_directory = os.path.join(self.cache_directory, key, "outputs")
+
+        if not os.path.isdir(outputs_directory):
+            return []
+
+        # Each output directory is stored under its quoted path, and the hidden ones are still being written
+        return [unquote(name) for name in os.listdir(outputs_directory) if not name.startswith(".")]
+
+    def restore(self, key: str, code_directory: str, modules: Optional[List[str]] = None) -> bool:
+        """
+        Copies the build outputs of an entry into a tree, replacing the build outputs it already has.
+
+        Args:
+            key (str): The key of the entry.
+            code_directory (str): The directory where the commit was materialized.
+            modules (Optional[List[str]], optional): The modules that must have been built, relative to the root of
+                the tree. Defaults to None (the whole project must have been built).
+
+        Returns:
+            bool: True if the entry holds the required modules and was restored, False otherwise.
+        """
+
+        entry_directory = os.path.join(self.cache_directory, key)
+        stored_outputs = self.__get_stored_outputs(key)
+
+        if modules is None:
+            if not os.path.exists(os.path.join(entry_directory, "complete")):
+                return False
+        else:
+            stored_modules = {os.path.dirname(output_path) for output_path in stored_outputs}
+
+            if not stored_outputs or any(os.path.normpath(module) not in stored_modules for module in modules):
+                return False
+
+        for output_path in self.__find_output_directories(code_directory):
+            shutil.rmtree(os.path.join(code_directory, output_path))
+
+        for output_path in stored_outputs:
+            shutil.copytree(
+                os.path.join(entry_directory, "outputs", quote(output_path, safe="")),
+                os.path.join(code_directory, output_path),
+                symlinks=True
+            )
+
+        return True
+
+    def store(self, key: str, code_directory: str, modules: Optional[List[str]] = None) -> None:
+        """
+        Copies the build outputs of the modules of a tree into an entry, keeping the ones it already holds.
+        Each output directory is written to a temporary directory and then renamed, so a partial copy is never read.
+
+        Args:
+            key (str): The key of the entry.
+            code_directory (str): The directory where the commit was built.
+            modules (Optional[List[str]], optional): The modules of the scoped build. Defaults to None (the whole
+                project was built, and the entry is marked as complete).
+        """
+
+        entry_directory = os.path.join(self.cache_directory, key)
+        outputs_directory = os.path.join(entry_directory, "outputs")
+        os.makedirs(outputs_directory, exist_ok=True)
+        stored_outputs = set(self.__get_stored_outputs(key))
+
+        for output_path in self.__find_output_directories(code_directory):
+            if output_path in stored_outputs:
+                continue
+
+            temporary_directory = tempfile.mkdtemp(dir=outputs_directory, prefix=".")
+
+            try:
+                shutil.copytree(
+                    os.path.join(code_directory, output_path),
+                    os.path.join(temporary_directory, "output"),
+                    symlinks=True
+                )
+                os.rename(os.path.join(temporary_directory, "output"), os.path.join(outputs_directory, quote(output_path, safe="")))
+            except OSError:
+                # Another worker stored the same output directory in the meantime
+                pass
+            finally:
+                shutil.rmtree(temporary_directory, ignore_errors=True)
+
+        if modules is None:
+            open(os.path.join(entry_directory, "complete"), "w").close()
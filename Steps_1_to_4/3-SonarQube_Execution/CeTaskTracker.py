@@ -0,0 +1,154 @@
+import threading
+import time
+from commons.SonarQubeApi import SonarQubeApi
+from WebhookReceiver import WebhookReceiver
+
+class CeTaskTracker:
+    """
+    A class for waiting for SonarQube background (Compute Engine) tasks to be processed.
+
+    A single poller thread tracks the tasks of all workers. Each task is polled through `/api/ce/task` with
+    an exponential backoff, from `initial_delay` up to `max_delay` seconds between requests, until it
+    succeeds, fails or reaches its deadline. When there is a webhook receiver, the webhook delivery of the
+    task is awaited first, and the task is only polled if it does not arrive within `webhook_timeout` seconds.
+
+    Attributes:
+        initial_delay (float): The delay, in seconds, before the first poll of a task.
+        max_delay (float): The maximum delay, in seconds, between two polls of a task.
+        webhook_timeout (float): The time, in seconds, to wait for a webhook delivery before polling.
+        __sonar_api (SonarQubeApi): The SonarQube API used to poll the tasks.
+        __webhook_receiver (WebhookReceiver): The receiver of the webhooks of the projects or None.
+        __tasks (dict): The state of each task being tracked, keyed by its ID.
+        __condition (threading.Condition): Condition that wakes the poller when a task is added.
+        __poller (threading.Thread): The poller thread, started on the first wait.
+    """
+
+    def __init__(
+        self,
+        sonar_api: SonarQubeApi,
+        initial_delay: float = 0.5,
+        max_delay: float = 10,
+        webhook_receiver: WebhookReceiver = None,
+        webhook_timeout: float = 60
+    ) -> None:
+        """
+        Initializes the CeTaskTracker object.
+
+        Args:
+            sonar_api (SonarQubeApi): The SonarQube API used to poll the tasks.
+            initial_delay (float, optional): The delay, in seconds, before the first poll of a task. Defaults to 0.5.
+            max_delay (float, optional): The maximum delay, in seconds, between two polls of a task. Defaults to 10.
+            webhook_receiver (WebhookReceiver, optional): The receiver of the webhooks of the projects. Defaults to None.
+            webhook_timeout (float, optional): The time, in seconds, to wait for a webhook delivery before polling.
+                Defaults to 60.
+        """
+
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.webhook_timeout = webhook_timeout
+        self.__sonar_api = sonar_api
+        self.__webhook_receiver = webhook_receiver
+        self.__tasks = {}
+        self.__condition = threading.Condition()
+        self.__poller = None
+
+    def __poll(self, task_id: str, task: dict) -> None:
+        """
+        Polls a task once and, if it is finished, records its outcome and wakes its waiter.
+
+        Args:
+            task_id (str): The ID of the task.
+            task (dict): The state of the task.
+        """
+
+        try:
+            status = self.__sonar_api.get_ce_task(task_id)["status"]
+        except Exception as exception:
+            # Transient API errors are retried until the deadline
+            status = None
+            task["last_error"] = exception
+
+        if status == "SUCCESS":
+            task["error"] = None
+        elif status in ("FAILED", "CANCELED"):
+            task["error"] = RuntimeError(f"Background task {task_id} finished with status {status}")
+        elif time.monotonic() >= task["deadline"]:
+            last_status = status if status is not None else repr(task.get("last_error"))
+            task["error"] = TimeoutError(f"Background task {task_id} was not processed before the deadline (last status: {last_status})")
+        else:
+            task["delay"] = min(task["delay"] * 2, self.max_delay)
+            task["next_poll"] = time.monotonic() + task["delay"]
+            return
+
+        with self.__condition:
+            del self.__tasks[task_id]
+
+        task["done"].set()
+
+    def __run(self) -> None:
+        """
+        Polls the tasks whose next poll is due, sleeping until the next one otherwise.
+        """
+
+        while True:
+            with self.__condition:
+                while not self.__tasks:
+                    self.__condition.wait()
+
+                now = time.monotonic()
+                due_tasks = [(task_id, task) for task_id, task in self.__tasks.items() if task["next_poll"] <= now]
+
+                if not due_tasks:
+                    next_poll = min(task["next_poll"] for task in self.__tasks.values())
+                    self.__condition.wait(next_poll - now)
+                    continue
+
+            for task_id, task in due_tasks:
+                self.__poll(task_id, task)
+
+    def wait(self, task_id: str, timeout: float) -> None:
+        """
+        Waits for a task to be processed.
+
+        Args:
+            task_id (str): The ID of the task, as written by the scanner in report-task.txt.
+            timeout (float): The maximum time, in seconds, to wait for the task.
+
+        Raises:
+            RuntimeError: If the task fails or is canceled.
+            TimeoutError: If the task is not processed before the deadline.
+        """
+
+        deadline = time.monotonic() + timeout
+
+        if self.__webhook_receiver is not None:
+            status = self.__webhook_receiver.wait(task_id, min(self.webhook_timeout, timeout))
+
+            if status == "SUCCESS":
+                return
+
+            if status is not None:
+                raise RuntimeError(f"Background task {task_id} finished with status {status}")
+
+        now = time.monotonic()
+
+        task = {
+            "deadline": deadline,
+            "delay": self.initial_delay,
+            "next_poll": now + self.initial_delay,
+            "done": threading.Event(),
+            "error": None
+        }
+
+        with self.__condition:
+            if self.__poller is None:
+                self.__poller = threading.Thread(target=self.__run, name="ce-task-poller", daemon=True)
+                self.__poller.start()
+
+            self.__tasks[task_id] = task
+            self.__condition.notify()
+
+        task["done"].wait()
+
+        if task["error"] is not None:
+            raise task["error"]
@@ -0,0 +1,153 @@
+import queue
+import threading
+from typing import Any, Callable, Iterator, List, Tuple
+
+class CommitPrefetcher:
+    """
+    A class for preparing the next commits (download, extraction and compilation) in a background thread
+    while the current commit is analyzed.
+
+    Commits are prepared strictly in order, PR after PR, and handed out in the same order, so SonarQube
+    analyses within a project keep their sequence. At most `lookahead` prepared items wait to be analyzed,
+    which bounds the disk used by prepared commits. With a look-ahead of zero, each commit is prepared on
+    demand, without a background thread.
+
+    Attributes:
+        lookahead (int): The maximum number of prepared items waiting to be analyzed.
+        __prepare_commit (Callable[[dict, str], Any]): Prepares a commit of a PR and returns the preparation result.
+        __release_commit (Callable[[dict, str, Any], None]): Releases a prepared commit that will not be analyzed.
+        __cancelled_prs (set): The numbers of the PRs whose remaining commits must not be prepared.
+        __next_item (tuple): The item read ahead when the commits of a PR end.
+    """
+
+    def __init__(self, prepare_commit: Callable[[dict, str], Any], release_commit: Callable[[dict, str, Any], None], lookahead: int) -> None:
+        """
+        Initializes the CommitPrefetcher object.
+
+        Args:
+            prepare_commit (Callable[[dict, str], Any]): Prepares a commit of a PR and returns the preparation result.
+                It must clean up after itself when it raises.
+            release_commit (Callable[[dict, str, Any], None]): Releases a prepared commit that will not be analyzed,
+                given its preparation result.
+            lookahead (int): The maximum number of prepared items waiting to be analyzed.
+        """
+
+        self.lookahead = lookahead
+        self.__prepare_commit = prepare_commit
+        self.__release_commit = release_commit
+        self.__cancelled_prs = set()
+        self.__next_item = None
+
+    def __produce(self, prs: Iterator[dict], get_commits: Callable[[dict], List[str]]) -> Iterator[tuple]:
+        """
+        Prepares the commits of each PR in order.
+
+        Yields:
+            tuple: ("pr", pr) when a PR starts, ("commit", pr, commit_sha, result, error) for each commit prepared,
+                where result is returned by the preparation and error is the exception it raised or None,
+                and ("end",) at the end.
+                The preparation of a PR stops at its first error or when the PR is cancelled.
+        """
+
+        for pr in prs:
+            yield ("pr", pr)
+
+            try:
+                commits = get_commits(pr)
+            except Exception:
+                # The error is raised again when the PR is analyzed
+                commits = []
+
+            for commit_sha in commits:
+                if pr["pr_number"] in self.__cancelled_prs:
+                    break
+
+                try:
+                    result = self.__prepare_commit(pr, commit_sha)
+                    error = None
+                except Exception as exception:
+                    result = None
+                    error = exception
+
+                yield ("commit", pr, commit_sha, result, error)
+
+                if error is not None:
+                    break
+
+        yield ("end",)
+
+    def __produce_in_background(self, prs: Iterator[dict], get_commits: Callable[[dict], List[str]]) -> Iterator[tuple]:
+        """
+        Runs the preparation in a background thread and reads the prepared items from a bounded queue.
+
+        Yields:
+            tuple: The items produced by __produce, in the same order.
+        """
+
+        items = queue.Queue(maxsize=self.lookahead)
+
+        def produce() -> None:
+            for item in self.__produce(prs, get_commits):
+                items.put(item)
+
+        producer = threading.Thread(target=produce, name=f"{threading.current_thread().name}-prefetch", daemon=True)
+        producer.start()
+
+        while True:
+            item = items.get()
+            yield item
+
+            if item[0] == "end":
+                return
+
+    def __iterate_pr_commits(self, items: Iterator[tuple]) -> Iterator[Tuple[str, Any, Exception]]:
+        """
+        Hands out the prepared commits of the current PR.
+
+        Yields:
+            Tuple[str, Any, Exception]: The SHA of each prepared commit, its preparation result and the error
+                raised by its preparation, or None.
+        """
+
+        for item in items:
+            if item[0] != "commit":
+                self.__next_item = item
+                return
+
+            _, _, commit_sha, result, error = item
+            yield commit_sha, result, error
+
+    def iterate_prs(self, prs: Iterator[dict], get_commits: Callable[[dict], List[str]]) -> Iterator[Tuple[dict, Iterator[Tuple[str, Any, Exception]]]]:
+        """
+        Iterates over the PRs, handing out the prepared commits of each one.
+
+        When the caller stops consuming the commits of a PR (e.g. after a failure), the PR is cancelled and
+        its commits already prepared are released.
+
+        Args:
+            prs (Iterator[dict]): The pull requests to be analyzed. It is consumed by the preparation.
+            get_commits (Callable[[dict], List[str]]): Returns the SHAs of the commits to be analyzed in a PR.
+
+        Yields:
+            Tuple[dict, Iterator[Tuple[str, Any, Exception]]]: Each PR and an iterator of its prepared commits,
+                with the result of the preparation of each one and the error it raised, or None.
+        """
+
+        if self.lookahead > 0:
+            items = self.__produce_in_background(prs, get_commits)
+        else:
+            items = self.__produce(prs, get_commits)
+
+        self.__next_item = next(items)
+
+        while self.__next_item[0] == "pr":
+            pr = self.__next_item[1]
+            commits = self.__iterate_pr_commits(items)
+
+            yield pr, commits
+
+            self.__cancelled_prs.add(pr["pr_number"])
+
+            for commit_sha, result, error in commits:
+                if error is None:
+                    self.__release_commit(pr, commit_sha, result)
@@ -1,4 +1,5 @@
 import os
+import threading
 from datetime import datetime
 from commons.IOUtils import read_input_file, write_output_file
 
@@ -6,12 +7,17 @@ class ExecutionMonitor:
     """
     A class for monitoring the execution of each commit of each pull request (PR).
 
+    Each worker analyzing PRs in parallel must use its own instance, which share the monitoring data file.
+
     Attributes:
         repo (str): The name of the repository being monitored.
         file (str): The path to the monitoring data file.
         __current_monitoring_data (dict): Dictionary to store current monitoring data.
+        __file_lock (threading.Lock): Lock shared by all instances to update the monitoring data file.
     """
 
+    __file_lock = threading.Lock()
+
     def __init__(self, repo: str) -> None:
         """
         Initializes the ExecutionMonitor object.
@@ -43,11 +49,12 @@ class ExecutionMonitor:
             pr_number (int): The number of the pull request being monitored.
         """
 
-        monitoring = read_input_file(self.file)
+        with ExecutionMonitor.__file_lock:
+            monitoring = read_input_file(self.file)
 
-        monitoring[pr_number] = self.__current_monitoring_data
+            monitoring[pr_number] = self.__current_monitoring_data
 
-        write_output_file(self.file, monitoring)
+            write_output_file(self.file, monitoring)
 
     def start_commit_monitoring(self) -> None:
         """Starts monitoring the execution of a commit."""
@@ -0,0 +1,228 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from typing import List
+
+class GitMirror:
+    """
+    A class for materializing commits of a repository from a local bare mirror.
+
+    The mirror is cloned once and updated incrementally. Each commit is checked out into a git worktree,
+    and released worktrees are kept and reused, so moving to the next commit only rewrites the files that
+    changed between both commits. As the mirror is a `git clone --mirror` of GitHub, it also contains the
+    `refs/pull/*` refs, so commits coming from forks are available as well.
+
+    Attributes:
+        repo (str): The name of the repository.
+        project_url (str): The URL of the project repository.
+        mirror_path (str): The path to the local bare mirror.
+        __idle_worktrees (List[str]): The paths of the worktrees that are not in use.
+        __lock (threading.Lock): Lock that serializes the operations that change the mirror metadata.
+    """
+
+    def __init__(self, repo: str, project_url: str, mirrors_directory: str) -> None:
+        """
+        Initializes the GitMirror object.
+
+        Args:
+            repo (str): The name of the repository.
+            project_url (str): The URL of the project repository.
+            mirrors_directory (str): The directory where the local mirrors are stored.
+        """
+
+        self.repo = repo
+        self.project_url = project_url
+        self.mirror_path = os.path.abspath(os.path.join(mirrors_directory, f"{repo}.git"))
+        self.__idle_worktrees = []
+        self.__lock = threading.Lock()
+
+    def __git(self, args: List[str], cwd: str = None) -> str:
+        """
+        Runs a git command against the mirror.
+
+        Args:
+            args (List[str]): The arguments of the git command.
+            cwd (str, optional): The directory where the command runs. Defaults to the mirror itself.
+
+        Returns:
+            str: The standard output of the command.
+
+        Raises:
+            subprocess.CalledProcessError: If the git command fails.
+        """
+
+        command = ["git"] + args if cwd else ["git", f"--git-dir={self.mirror_path}"] + args
+
+        result = subprocess.run(command, cwd=cwd, check=True, capture_output=True, text=True)
+
+        return result.stdout
+
+    def update(self) -> None:
+        """
+        Clones the mirror if it does not exist yet, otherwise fetches only the new objects and refs.
+        """
+
+        with self.__lock:
+            if not os.path.exists(self.mirror_path):
+                os.makedirs(os.path.dirname(self.mirror_path), exist_ok=True)
+                subprocess.run(
+                    ["git", "clone", "--mirror", self.project_url, self.mirror_path],
+                    check=True,
+                    capture_output=True,
+                    text=True
+                )
+                return
+
+            self.__git(["remote", "update", "--prune"])
+
+    def __ensure_commit(self, commit_sha: str) -> None:
+        """
+        Fetches a commit that is not in the mirror yet (e.g. a commit whose PR ref was removed).
+
+        Args:
+            commit_sha (str): The SHA of the commit.
+        """
+
+        try:
+            self.__git(["cat-file", "-e", f"{commit_sha}^{{commit}}"])
+        except subprocess.CalledProcessError:
+            with self.__lock:
+                self.__git(["fetch", "origin", commit_sha])
+
+    # Build files, whose changes may break the build or change the resolved classpath
+    BUILD_FILES = ("pom.xml", "build.gradle", "build.gradle.kts", "settings.gradle", "settings.gradle.kts")
+
+    @staticmethod
+    def is_fingerprinted_file(path: str) -> bool:
+        """
+        Checks whether a file is part of the Java fingerprint of a commit: a .java file or a build file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            bool: True if the file is fingerprinted, False otherwise.
+        """
+
+        return path.endswith(".java") or path.rsplit("/", 1)[-1] in GitMirror.BUILD_FILES
+
+    def get_java_fingerprint(self, commit_sha: str) -> str:
+        """
+        Computes a fingerprint of the Java sources and build files of a commit from its tree, without checking it out.
+
+        Args:
+            commit_sha (str): The SHA of the commit.
+
+        Returns:
+            str: The SHA-256 of the paths and blob hashes of every .java file and build file of the commit.
+        """
+
+        self.__ensure_commit(commit_sha)
+
+        digest = hashlib.sha256()
+        tree = self.__git(["ls-tree", "-r", "--full-tree", commit_sha])
+
+        for line in sorted(tree.splitlines()):
+            metadata, path = line.split("\t", 1)
+
+            if self.is_fingerprinted_file(path):
+                blob_sha = metadata.split()[2]
+                digest.update(f"{path}\0{blob_sha}\n".encode())
+
+        return digest.hexdigest()
+
+    def get_changed_files(self, from_commit_sha: str, to_commit_sha: str) -> List[str]:
+        """
+        Lists the files that differ between two commits, from their trees, without checking them out.
+
+        Args:
+            from_commit_sha (str): The SHA of the older commit.
+            to_commit_sha (str): The SHA of the newer commit.
+
+        Returns:
+            List[str]: The paths of the added, modified and deleted files. Moved files are listed with both names.
+        """
+
+        self.__ensure_commit(from_commit_sha)
+        self.__ensure_commit(to_commit_sha)
+
+        return self.__git(["diff", "--name-only", "--no-renames", from_commit_sha, to_commit_sha]).splitlines()
+
+    def __take_idle_worktree(self) -> str:
+        """
+        Takes a worktree that is not in use, discarding the ones removed from disk in the meantime.
+
+        Returns:
+            str: The path of the worktree or None if there is no idle worktree.
+        """
+
+        with self.__lock:
+            while self.__idle_worktrees:
+                worktree = self.__idle_worktrees.pop()
+
+                if os.path.exists(worktree):
+                    return worktree
+
+            self.__git(["worktree", "prune"])
+
+        return None
+
+    def checkout(self, commit_sha: str, directory: str, keep_directories: List[str] = None) -> None:
+        """
+        Materializes a commit in the given directory, reusing an idle worktree when there is one.
+
+        Args:
+            commit_sha (str): The SHA of the commit.
+            directory (str): The directory where the commit must be materialized. It must not exist.
+            keep_directories (List[str], optional): The names of the untracked directories of a reused worktree
+                that are kept (e.g. build outputs). Defaults to None (the worktree is fully cleaned).
+        """
+
+        directory = os.path.abspath(directory)
+
+        self.__ensure_commit(commit_sha)
+
+        worktree = self.__take_idle_worktree()
+
+        if worktree is None:
+            with self.__lock:
+                self.__git(["worktree", "add", "--detach", "--force", directory, commit_sha])
+            return
+
+        if worktree != directory:
+            with self.__lock:
+                self.__git(["worktree", "move", worktree, directory])
+
+        self.__git(["checkout", "--detach", "--force", commit_sha], cwd=directory)
+        exclusions = [f"--exclude={name}/" for name in keep_directories or []]
+        self.__git(["clean", "-ffdx"] + exclusions, cwd=directory)
+
+    def release(self, directory: str) -> None:
+        """
+        Releases the worktree of a directory so it can be reused by the next checkout.
+
+        Args:
+            directory (str): The directory where a commit was materialized.
+        """
+
+        directory = os.path.abspath(directory)
+
+        if not os.path.exists(directory):
+            return
+
+        with self.__lock:
+            self.__idle_worktrees.append(directory)
+
+    def cleanup(self) -> None:
+        """
+        Removes all idle worktrees from disk.
+        """
+
+        with self.__lock:
+            for worktree in self.__idle_worktrees:
+                shutil.rmtree(worktree, ignore_errors=True)
+
+            self.__idle_worktrees = []
+            self.__git(["worktree", "prune"])
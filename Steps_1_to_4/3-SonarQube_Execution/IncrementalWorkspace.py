@@ -0,0 +1,152 @@
+import filecmp
+import os
+import shutil
+import threading
+from typing import List
+
+class IncrementalWorkspace:
+    """
+    A class for applying extracted commits on top of previously built trees, so build tools can compile incrementally.
+
+    Released trees are kept, with their build outputs, and reused by the next commit: the extracted tree is
+    synchronized onto a released one, which is then renamed to the directory of the new commit. Only the files
+    whose content changed are replaced (and get a new modification time), so build tools only recompile the
+    sources that changed.
+
+    Attributes:
+        output_directories (List[str]): The names of the directories with build outputs, which are kept.
+        build_files (List[str]): The names of the files that define a module, next to which the build outputs are.
+        __idle_directories (List[str]): The paths of the released trees that are not in use.
+        __lock (threading.Lock): Lock that guards the list of released trees.
+    """
+
+    def __init__(self, output_directories: List[str], build_files: List[str]) -> None:
+        """
+        Initializes the IncrementalWorkspace object.
+
+        Args:
+            output_directories (List[str]): The names of the directories with build outputs (e.g. "target").
+            build_files (List[str]): The names of the files that define a module (e.g. "pom.xml").
+        """
+
+        self.output_directories = output_directories
+        self.build_files = build_files
+        self.__idle_directories = []
+        self.__lock = threading.Lock()
+
+    def __take_idle_directory(self) -> str:
+        """
+        Takes a released tree that is not in use, discarding the ones removed from disk in the meantime.
+
+        Returns:
+            str: The path of the tree or None if there is no released tree.
+        """
+
+        with self.__lock:
+            while self.__idle_directories:
+                directory = self.__idle_directories.pop()
+
+                if os.path.exists(directory):
+                    return directory
+
+        return None
+
+    def __synchronize(self, source: str, target: str) -> None:
+        """
+        Makes the target tree identical to the source tree, except for the build outputs of the target.
+        Only the output directories at the root of a module (next to a build file) are build outputs, so source
+        directories with the same name (e.g. a package named "build") are synchronized like the others.
+        The files of the source tree are moved, so the source tree must be discarded afterwards.
+
+        Args:
+            source (str): The extracted tree of the new commit.
+            target (str): The released tree to be updated.
+        """
+
+        # Removes the files and directories that no longer exist
+        for dirpath, dirnames, filenames in os.walk(target):
+            relative_path = os.path.relpath(dirpath, target)
+            source_path = os.path.join(source, relative_path)
+
+            output_dirnames = set()
+
+            if any(build_file in filenames for build_file in self.build_files):
+                output_dirnames = set(self.output_directories)
+
+            for dirname in list(dirnames):
+                if dirname in output_dirnames or os.path.isdir(os.path.join(source_path, dirname)):
+                    continue
+
+                shutil.rmtree(os.path.join(dirpath, dirname))
+                dirnames.remove(dirname)
+
+            dirnames[:] = [dirname for dirname in dirnames if dirname not in output_dirnames]
+
+            for filename in filenames:
+                if not os.path.isfile(os.path.join(source_path, filename)):
+                    os.remove(os.path.join(dirpath, filename))
+
+        # Replaces the files that were added or changed, keeping the unchanged ones untouched
+        for dirpath, dirnames, filenames in os.walk(source):
+            relative_path = os.path.relpath(dirpath, source)
+            target_path = os.path.normpath(os.path.join(target, relative_path))
+            os.makedirs(target_path, exist_ok=True)
+
+            for filename in filenames:
+                source_file = os.path.join(dirpath, filename)
+                target_file = os.path.join(target_path, filename)
+
+                if os.path.isfile(target_file) and filecmp.cmp(source_file, target_file, shallow=False):
+                    continue
+
+                if os.path.isdir(target_file):
+                    shutil.rmtree(target_file)
+
+                os.replace(source_file, target_file)
+
+                # Archives keep the commit date, which would look older than the build outputs
+                os.utime(target_file)
+
+    def apply(self, extracted_directory: str, directory: str) -> None:
+        """
+        Materializes an extracted commit in the given directory, on top of a released tree when there is one.
+
+        Args:
+            extracted_directory (str): The directory where the commit was extracted. It is removed.
+            directory (str): The directory where the commit must be materialized. It must not exist.
+        """
+
+        idle_directory = self.__take_idle_directory()
+
+        if idle_directory is None:
+            os.rename(extracted_directory, directory)
+            return
+
+        self.__synchronize(extracted_directory, idle_directory)
+        os.rename(idle_directory, directory)
+        shutil.rmtree(extracted_directory)
+
+    def release(self, directory: str) -> None:
+        """
+        Releases a tree so it can be reused by the next commit.
+
+        Args:
+            directory (str): The directory where a commit was materialized.
+        """
+
+        if not os.path.exists(directory):
+            return
+
+        with self.__lock:
+            self.__idle_directories.append(directory)
+
+    def cleanup(self) -> None:
+        """
+        Removes all released trees from disk.
+        """
+
+        with self.__lock:
+            for directory in self.__idle_directories:
+                shutil.rmtree(directory, ignore_errors=True)
+
+            self.__idle_directories = []
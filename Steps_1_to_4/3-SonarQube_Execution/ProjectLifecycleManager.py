@@ -0,0 +1,251 @@
+import collections
+import logging
+import os
+import queue
+import threading
+from commons.SonarQubeApi import SonarQubeApi
+from typing import List, Optional
+
+class ProjectLifecycleManager:
+    """
+    A class for creating and deleting the SonarQube projects of the PRs of one host in the background.
+
+    The projects of the upcoming PRs are provisioned in bulk: their existence is checked with one request per
+    page of projects and only the missing ones are created, so the analysis of a PR does not wait for its
+    project. A project is only created by one thread at a time, without holding the lock during the request.
+    Once the results of a PR are written to its output file, which is the archive of the project, its project
+    is retained until `retention` more recent PRs complete, and is then deleted. Deletions go
+    through a queue and are sent in batches by a background thread, so they never block the analyses.
+
+    Attributes:
+        retention (Optional[int]): The number of completed projects kept in SonarQube, or None to keep them all.
+        batch_size (int): The maximum number of projects deleted with one request.
+        __sonar_api (SonarQubeApi): The SonarQube API of the host.
+        __provisioned (set): The keys of the projects known to exist.
+        __creations (Dict[str, threading.Event]): The events of the projects being created, set once they are.
+        __retained (collections.deque): The completed projects kept, oldest first, with their output files.
+        __lock (threading.Lock): Lock that guards the provisioned, created and retained projects.
+        __queue (queue.Queue): The provisioning and deletion jobs of the background thread.
+        __thread (threading.Thread): The background thread.
+        __log_file (str): The path to the log file.
+        __logger (logging.Logger): The logger object for logging the creations and deletions.
+    """
+
+    def __init__(self, sonar_api: SonarQubeApi, retention: Optional[int] = None, batch_size: int = 50) -> None:
+        """
+        Initializes the ProjectLifecycleManager object and starts its background thread.
+
+        Args:
+            sonar_api (SonarQubeApi): The SonarQube API of the host.
+            retention (Optional[int], optional): The number of completed projects kept in SonarQube, or None to
+                keep them all. Defaults to None.
+            batch_size (int, optional): The maximum number of projects deleted with one request. Defaults to 50.
+        """
+
+        self.retention = retention
+        self.batch_size = batch_size
+        self.__sonar_api = sonar_api
+        self.__provisioned = set()
+        self.__creations = {}
+        self.__retained = collections.deque()
+        self.__lock = threading.Lock()
+        self.__queue = queue.Queue()
+        self.__log_file = "./3-SonarQube_Execution/logs/project-lifecycle.log"
+        self.__logger = self.__setup_logger()
+        self.__thread = threading.Thread(target=self.__run, name="project-lifecycle", daemon=True)
+        self.__thread.start()
+
+    def __setup_logger(self) -> logging.Logger:
+        """
+        Sets up the logger for the ProjectLifecycleManager object.
+
+        Returns:
+            logging.Logger: The logger object configured for logging the creations and deletions.
+        """
+
+        logger = logging.getLogger(__name__)
+        logger.setLevel(logging.DEBUG)
+
+        # The managers of all SonarQube hosts share the logger of the module
+        if not logger.handlers:
+            file_handler = logging.FileHandler(self.__log_file)
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            file_handler.setFormatter(formatter)
+            logger.addHandler(file_handler)
+
+        return logger
+
+    def __create_project(self, project: str, check_existence: bool) -> None:
+        """
+        Creates a project unless it is known to exist.
+
+        Args:
+            project (str): The key of the project.
+            check_existence (bool): Whether to ask SonarQube if the project exists before creating it.
+        """
+
+        with self.__lock:
+            if project in self.__provisioned:
+                return
+
+            creation = self.__creations.get(project)
+            is_creator = creation is None
+
+            if is_creator:
+                creation = self.__creations[project] = threading.Event()
+
+        # The project is being created by the other thread, which may fail, so its existence is checked again afterwards
+        if not is_creator:
+            creation.wait()
+            self.__create_project(project, check_existence=True)
+            return
+
+        # The request is sent outside of the lock, so a creation does not block the other projects
+        try:
+            self.__sonar_api.create_project(project, project, check_existence=check_existence)
+
+            with self.__lock:
+                self.__provisioned.add(project)
+        finally:
+            with self.__lock:
+                del self.__creations[project]
+
+            creation.set()
+
+    def __provision(self, projects: List[str]) -> None:
+        """
+        Creates the projects that do not exist yet, checking their existence in bulk.
+
+        Args:
+            projects (List[str]): The keys of the projects.
+        """
+
+        existing_projects = self.__sonar_api.search_existing_projects(projects)
+
+        with self.__lock:
+            self.__provisioned.update(existing_projects)
+
+        for project in projects:
+            self.__create_project(project, check_existence=False)
+
+        self.__logger.debug(f"Provisioned {len(projects)} project(s), {len(existing_projects)} already existed")
+
+    def __delete(self, projects: List[str]) -> None:
+        """
+        Deletes projects with one request.
+
+        Args:
+            projects (List[str]): The keys of the projects.
+        """
+
+        with self.__lock:
+            self.__provisioned.difference_update(projects)
+
+        self.__sonar_api.bulk_delete_projects(projects)
+        self.__logger.debug(f"Deleted project(s) {', '.join(projects)}")
+
+    def __run(self) -> None:
+        """
+        Runs the provisioning and deletion jobs of the queue, batching the deletions queued together.
+        """
+
+        next_job = None
+
+        while True:
+            action, projects = next_job if next_job is not None else self.__queue.get()
+            next_job = None
+
+            if action == "stop":
+                return
+
+            # The deletions queued right after this one are sent with it, up to the batch size
+            while action == "delete" and len(projects) < self.batch_size:
+                try:
+                    next_job = self.__queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if next_job[0] != "delete":
+                    break
+
+                projects = projects + next_job[1]
+                next_job = None
+
+            try:
+                if action == "provision":
+                    self.__provision(projects)
+                else:
+                    self.__delete(projects)
+            except Exception as error:
+                # Projects that failed to be provisioned are created on demand, and deletions are not critical
+                self.__logger.warning(f"Failed to {action} project(s) {', '.join(projects)}: {error}")
+
+    def provision(self, projects: List[str], page_size: int = 100) -> None:
+        """
+        Queues the provisioning of the projects of upcoming PRs, one page of projects at a time.
+
+        Args:
+            projects (List[str]): The keys of the projects, in the order they will be analyzed.
+            page_size (int, optional): The number of projects checked and created per job. Defaults to 100.
+        """
+
+        for k in range(0, len(projects), page_size):
+            self.__queue.put(("provision", projects[k:k + page_size]))
+
+    def ensure_project(self, project: str) -> None:
+        """
+        Creates a project now if it was not provisioned yet.
+
+        Args:
+            project (str): The key of the project.
+        """
+
+        self.__create_project(project, check_existence=True)
+
+    def retire(self, project: str, output_file: str) -> None:
+        """
+        Records a project whose results were written, queuing the deletion of the oldest projects beyond the retention.
+
+        Args:
+            project (str): The key of the project.
+            output_file (str): The output file holding the results of the project.
+        """
+
+        if self.retention is None:
+            return
+
+        expired_projects = []
+
+        with self.__lock:
+            self.__retained.append((project, output_file))
+
+            while len(self.__retained) > self.retention:
+                expired_projects.append(self.__retained.popleft())
+
+        for expired_project, expired_output_file in expired_projects:
+            # Only projects whose results are safely on disk are deleted
+            if os.path.isfile(expired_output_file) and os.path.getsize(expired_output_file) > 0:
+                self.__queue.put(("delete", [expired_project]))
+            else:
+                self.__logger.warning(f"Keeping project {expired_project}: its output file {expired_output_file} is missing")
+
+    def discard(self, project: str) -> None:
+        """
+        Queues the deletion of a project whose results are not kept (e.g. its analysis failed).
+
+        Args:
+            project (str): The key of the project.
+        """
+
+        with self.__lock:
+            self.__provisioned.discard(project)
+
+        self.__queue.put(("delete", [project]))
+
+    def close(self) -> None:
+        """
+        Waits for the queued jobs to finish and stops the background thread.
+        """
+
+        self.__queue.put(("stop", []))
+        self.__thread.join()
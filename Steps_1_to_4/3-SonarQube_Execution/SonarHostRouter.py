@@ -0,0 +1,129 @@
+import bisect
+import hashlib
+import threading
+from typing import Optional
+
+class SonarHostRouter:
+    """
+    A class for pinning the SonarQube projects of the PRs to one of several SonarQube hosts.
+
+    A project is pinned to a host when it is acquired, and every scan, poll and collection of the PR then
+    goes to that host. With the "consistent" strategy, the host is chosen by consistent hashing of the project
+    key, so a project is always routed to the same host across executions and adding a host only moves the
+    projects of a fraction of the ring. With the "least_loaded" strategy, the host with the fewest projects
+    being analyzed is chosen, and the project stays pinned to it until it is released.
+
+    Attributes:
+        hosts_count (int): The number of SonarQube hosts.
+        strategy (str): The routing strategy, "consistent" or "least_loaded".
+        __ring (List[Tuple[int, int]]): The points of the hash ring, sorted, with the index of their host.
+        __assignments (dict): The index of the host of each acquired project, keyed by the project key.
+        __loads (List[int]): The number of acquired projects of each host.
+        __lock (threading.Lock): Lock that guards the assignments and loads.
+    """
+
+    STRATEGIES = ("consistent", "least_loaded")
+
+    def __init__(self, hosts: list, strategy: str = "consistent", virtual_nodes: int = 64) -> None:
+        """
+        Initializes the SonarHostRouter object.
+
+        Args:
+            hosts (list): The SonarQube hosts (e.g. their URLs), identifying their points on the hash ring.
+            strategy (str, optional): The routing strategy, "consistent" or "least_loaded". Defaults to "consistent".
+            virtual_nodes (int, optional): The number of points of each host on the hash ring. Defaults to 64.
+
+        Raises:
+            ValueError: If there are no hosts or the strategy is unknown.
+        """
+
+        if not hosts:
+            raise ValueError("At least one SonarQube host is required")
+
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown routing strategy {strategy}, expected one of {', '.join(self.STRATEGIES)}")
+
+        self.hosts_count = len(hosts)
+        self.strategy = strategy
+        self.__ring = sorted(
+            (self.__hash(f"{host}#{node}"), index)
+            for index, host in enumerate(hosts)
+            for node in range(virtual_nodes)
+        )
+        self.__assignments = {}
+        self.__loads = [0] * self.hosts_count
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def __hash(key: str) -> int:
+        """
+        Hashes a key to a point of the hash ring.
+
+        Args:
+            key (str): The key to hash.
+
+        Returns:
+            int: The point of the key, a 64-bit integer.
+        """
+
+        return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:8], "big")
+
+    def get_consistent_host(self, project: str) -> int:
+        """
+        Finds the host of a project on the hash ring: the host of the first point at or after the point of the project.
+
+        Args:
+            project (str): The key of the project.
+
+        Returns:
+            int: The index of the host.
+        """
+
+        position = bisect.bisect_left(self.__ring, (self.__hash(project), -1))
+
+        return self.__ring[position % len(self.__ring)][1]
+
+    def acquire(self, project: str, host: Optional[int] = None) -> int:
+        """
+        Pins a project to a host, or returns its host if it is already pinned.
+
+        Args:
+            project (str): The key of the project.
+            host (Optional[int], optional): The index of the host that already holds the project (e.g. to resume
+                its analysis), chosen regardless of the strategy. Defaults to None.
+
+        Returns:
+            int: The index of the host of the project.
+        """
+
+        with self.__lock:
+            if project not in self.__assignments and host is not None:
+                self.__assignments[project] = host
+                self.__loads[host] += 1
+
+            host = self.__assignments.get(project)
+
+            if host is None:
+                if self.strategy == "consistent":
+                    host = self.get_consistent_host(project)
+                else:
+                    host = min(range(self.hosts_count), key=lambda index: self.__loads[index])
+
+                self.__assignments[project] = host
+                self.__loads[host] += 1
+
+            return host
+
+    def release(self, project: str) -> None:
+        """
+        Unpins a project whose analysis ended, so that it no longer counts in the load of its host.
+
+        Args:
+            project (str): The key of the project.
+        """
+
+        with self.__lock:
+            host = self.__assignments.pop(project, None)
+
+            if host is not None:
+                self.__loads[host] -= 1
@@ -10,20 +10,24 @@ class SonarQubeRunner:
     Any errors that occur during the analysis are logged to a file.
 
     Attributes:
-        __token (str): The SonarQube authentication token, retrieved from the environment.
-        host (str): The SonarQube server host URL, retrieved from the environment.
+        __token (str): The SonarQube authentication token.
+        host (str): The SonarQube server host URL.
         __log_file (str): The path to the SonarQube execution errors log file.
         __logger (logging.Logger): The logger object for logging execution errors.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, host: str = None, token: str = None) -> None:
         """
         Initializes the SonarQubeRunner object.
+
+        Args:
+            host (str, optional): The SonarQube server host URL. Defaults to the SONAR_HOST environment variable.
+            token (str, optional): The SonarQube authentication token. Defaults to the SONAR_TOKEN environment variable.
         """
 
         load_dotenv()
-        self.__token = os.getenv("SONAR_TOKEN")
-        self.host = os.getenv("SONAR_HOST")
+        self.__token = token or os.getenv("SONAR_TOKEN")
+        self.host = host or os.getenv("SONAR_HOST")
         self.__log_file = "./3-SonarQube_Execution/logs/sonar-execution-errors.log"
         self.__logger = self.__setup_logger()
 
@@ -38,10 +42,12 @@ class SonarQubeRunner:
         logger = logging.getLogger(__name__)
         logger.setLevel(logging.ERROR)
         
-        file_handler = logging.FileHandler(self.__log_file)
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        # The clients of all SonarQube hosts share the logger of the module
+        if not logger.handlers:
+            file_handler = logging.FileHandler(self.__log_file)
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            file_handler.setFormatter(formatter)
+            logger.addHandler(file_handler)
         
         return logger
 
@@ -70,21 +76,103 @@ class SonarQubeRunner:
         return error_lines[start_index-10:start_index]
 
     
-    def run_analysis(self, repo: str, pr_number: int, commit_sha: str, projectKey: str, projectName: str) -> bool:
+    @staticmethod
+    def get_ce_task_id(repo: str, commit_sha: str, workspace: str = ".") -> str:
+        """
+        Retrieves the ID of the background task that processes the report of the last analysis of a commit,
+        from the report-task.txt file written by Sonar Scanner.
+
+        Args:
+            repo (str): The name of the repository.
+            commit_sha (str): The SHA of the commit.
+            workspace (str, optional): The directory where the commit was extracted. Defaults to ".".
+
+        Returns:
+            str: The ID of the background task.
+
+        Raises:
+            RuntimeError: If the report-task.txt file does not exist or has no task ID.
+        """
+
+        report_task_file = os.path.join(workspace, f"{repo}-{commit_sha}", ".scannerwork", "report-task.txt")
+
+        if not os.path.exists(report_task_file):
+            raise RuntimeError(f"Report task file not found for commit {commit_sha}")
+
+        with open(report_task_file, "r") as f:
+            for line in f:
+                key, _, value = line.strip().partition("=")
+
+                if key == "ceTaskId":
+                    return value
+
+        raise RuntimeError(f"Background task ID not found for commit {commit_sha}")
+
+    @staticmethod
+    def write_analysis_settings(settings_file: str, binaries: List[str], libraries: List[str], inclusions: List[str]) -> None:
+        """
+        Writes the bytecode directories, the dependencies and the files to be analyzed to a scanner settings file.
+
+        Args:
+            settings_file (str): The path to the settings file.
+            binaries (List[str]): The absolute paths of the bytecode directories or None to search the tree for them.
+            libraries (List[str]): The absolute paths of the dependencies.
+            inclusions (List[str]): The paths of the files to be analyzed or None to analyze every file.
+        """
+
+        separator = ",\\\n    "
+
+        with open(settings_file, "w") as f:
+            f.write(f"sonar.java.binaries={separator.join(binaries) if binaries else '**/target/classes'}\n")
+            f.write(f"sonar.java.libraries={separator.join(libraries or [])}\n")
+
+            if inclusions is not None:
+                f.write(f"sonar.inclusions={separator.join(inclusions)}\n")
+
+    def run_analysis(
+        self,
+        repo: str,
+        pr_number: int,
+        commit_sha: str,
+        projectKey: str,
+        projectName: str,
+        workspace: str = ".",
+        binaries: List[str] = None,
+        libraries: List[str] = None,
+        inclusions: List[str] = None
+    ) -> bool:
         """
         Executes SonarQube analysis on the specified project using Sonar Scanner.
 
+        When the bytecode directories are given, they are passed to the Java analyzer with the dependencies
+        through a settings file, instead of searching the tree for compiled classes. When the files to be
+        analyzed are given, the other files are not analyzed, although their bytecode is still used to resolve types.
+
         Args:
             repo (str): The name of the repository.
             pr_number (int): The number of the pull request.
             commit_sha (str): The SHA of the commit.
             projectKey (str): The key of the project in SonarQube.
             projectName (str): The name of the project in SonarQube.
+            workspace (str, optional): The directory where the commit was extracted. Defaults to ".".
+            binaries (List[str], optional): The absolute paths of the bytecode directories. Defaults to None.
+            libraries (List[str], optional): The absolute paths of the dependencies. Defaults to None.
+            inclusions (List[str], optional): The paths of the files to be analyzed, relative to the root of the
+                repository. Defaults to None (every file).
 
         Returns:
             bool: True if the analysis is successful, False otherwise.
         """
-                
+
+        code_directory = os.path.join(workspace, f"{repo}-{commit_sha}")
+        settings_file = os.path.abspath(os.path.join(workspace, f"{repo}-{commit_sha}.sonar.properties"))
+
+        if binaries or inclusions is not None:
+            self.write_analysis_settings(settings_file, binaries, libraries, inclusions)
+            settings_options = f"-Dproject.settings={settings_file}"
+        else:
+            settings_options = "-Dsonar.java.binaries=**/target/classes"
+
         sonar_scanner_command = f"sonar-scanner -Dsonar.token={self.__token}  \
             -Dsonar.projectKey={projectKey} \
             -Dsonar.projectName='{projectName}' \
@@ -92,12 +180,12 @@ class SonarQubeRunner:
             -Dsonar.host.url={self.host} \
             -Dsonar.scm.disabled=true \
             -Dsonar.language=java \
-            -Dsonar.java.binaries=**/target/classes \
+            {settings_options} \
             -Dsonar.exclusions=**/*.py,**/*.css,**/*.js,**/*.ts,**/*.jsx,**/*.tsx,**/*.xml,,**/*.yaml,**/*.html"
-        
+
         try:
             subprocess.run(
-                f"cd {repo}-{commit_sha} && {sonar_scanner_command}",
+                f"cd {code_directory} && {sonar_scanner_command}",
                 shell=True,
                 check=True,
                 capture_output=True,
@@ -113,3 +201,7 @@ class SonarQubeRunner:
             self.__logger.error(f"Error to execute sonar in commit {commit_sha} of PR {pr_number} of repo {repo}")
             self.__logger.error('\n' + '\n'.join(error_message_lines) + '\n')
             return False
+
+        finally:
+            if os.path.exists(settings_file):
+                os.remove(settings_file)
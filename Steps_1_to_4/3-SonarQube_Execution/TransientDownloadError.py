@@ -0,0 +1,5 @@
+class TransientDownloadError(RuntimeError):
+    """
+    An error raised when the download of an archive fails in a way that may succeed if retried: a server
+    error (5xx), a rate limit (429) or a connection cut off before the whole archive was received.
+    """
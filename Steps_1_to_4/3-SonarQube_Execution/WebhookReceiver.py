@@ -0,0 +1,164 @@
+import hashlib
+import hmac
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+class WebhookReceiver:
+    """
+    A class for receiving the webhooks that SonarQube sends when the report of an analysis is processed.
+
+    A local HTTP server, running in a background thread, records the status of each background task
+    (`taskId` in the payload) and wakes the worker waiting for it. Deliveries that arrive before the
+    worker starts waiting are kept until it does.
+
+    Attributes:
+        host (str): The address the server listens on.
+        port (int): The port the server listens on.
+        __secret (str): The secret used to sign the deliveries or None to accept unsigned deliveries.
+        __statuses (dict): The status of each background task delivered, keyed by its ID.
+        __events (dict): The event set when each background task is delivered, keyed by its ID.
+        __lock (threading.Lock): Lock that guards the statuses and events.
+        __server (ThreadingHTTPServer): The HTTP server, created when the receiver starts.
+    """
+
+    def __init__(self, host: str, port: int, secret: str = None) -> None:
+        """
+        Initializes the WebhookReceiver object.
+
+        Args:
+            host (str): The address the server listens on.
+            port (int): The port the server listens on.
+            secret (str, optional): The secret used to sign the deliveries. Defaults to None (no signature check).
+        """
+
+        self.host = host
+        self.port = port
+        self.__secret = secret
+        self.__statuses = {}
+        self.__events = {}
+        self.__lock = threading.Lock()
+        self.__server = None
+
+    def __get_event(self, task_id: str) -> threading.Event:
+        """
+        Retrieves the event of a background task, creating it if needed.
+
+        Args:
+            task_id (str): The ID of the background task.
+
+        Returns:
+            threading.Event: The event set when the background task is delivered.
+        """
+
+        with self.__lock:
+            if task_id not in self.__events:
+                self.__events[task_id] = threading.Event()
+
+            return self.__events[task_id]
+
+    def __is_signature_valid(self, body: bytes, signature: Optional[str]) -> bool:
+        """
+        Checks the HMAC-SHA256 signature SonarQube sends in the X-Sonar-Webhook-HMAC-SHA256 header.
+
+        Args:
+            body (bytes): The body of the delivery.
+            signature (Optional[str]): The value of the signature header.
+
+        Returns:
+            bool: True if there is no secret or the signature matches, False otherwise.
+        """
+
+        if self.__secret is None:
+            return True
+
+        if signature is None:
+            return False
+
+        expected_signature = hmac.new(self.__secret.encode(), body, hashlib.sha256).hexdigest()
+
+        return hmac.compare_digest(expected_signature, signature)
+
+    def __deliver(self, body: bytes, signature: Optional[str]) -> int:
+        """
+        Records a delivery and wakes the worker waiting for its background task.
+
+        Args:
+            body (bytes): The body of the delivery.
+            signature (Optional[str]): The value of the signature header.
+
+        Returns:
+            int: The HTTP status code of the response.
+        """
+
+        if not self.__is_signature_valid(body, signature):
+            return 401
+
+        try:
+            payload = json.loads(body)
+            task_id = payload["taskId"]
+            status = payload["status"]
+        except (ValueError, KeyError, TypeError):
+            return 400
+
+        with self.__lock:
+            self.__statuses[task_id] = status
+
+        self.__get_event(task_id).set()
+
+        return 200
+
+    def start(self) -> None:
+        """
+        Starts the HTTP server in a background thread.
+        """
+
+        deliver = self.__deliver
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status_code = deliver(body, self.headers.get("X-Sonar-Webhook-HMAC-SHA256"))
+
+                self.send_response(status_code)
+                self.end_headers()
+
+            def log_message(self, format: str, *args) -> None:
+                # Deliveries are not logged to the standard error
+                pass
+
+        self.__server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.__server.daemon_threads = True
+
+        threading.Thread(target=self.__server.serve_forever, name="webhook-receiver", daemon=True).start()
+
+    def stop(self) -> None:
+        """
+        Stops the HTTP server.
+        """
+
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+    def wait(self, task_id: str, timeout: float) -> Optional[str]:
+        """
+        Waits for the delivery of a background task.
+
+        Args:
+            task_id (str): The ID of the background task.
+            timeout (float): The maximum time, in seconds, to wait for the delivery.
+
+        Returns:
+            Optional[str]: The status of the background task (SUCCESS or FAILED), or None if it was not delivered in time.
+        """
+
+        is_delivered = self.__get_event(task_id).wait(timeout)
+
+        with self.__lock:
+            self.__events.pop(task_id, None)
+            status = self.__statuses.pop(task_id, None)
+
+        return status if is_delivered else None
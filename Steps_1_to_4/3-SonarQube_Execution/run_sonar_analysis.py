@@ -1,19 +1,38 @@
-import io
+import aiohttp
+import hashlib
+import itertools
 import logging
 import os
+import queue
 import requests
 import shutil
 import sys
-import time
+import tempfile
+import threading
 import traceback
-import zipfile
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from ArchiveDownloader import ArchiveDownloader
 from BuildHandler import BuildHandler
+from BuildOutputCache import BuildOutputCache
+from CeTaskTracker import CeTaskTracker
+from CommitPrefetcher import CommitPrefetcher
 from commons.IOUtils import read_input_file, write_output_file
+from commons.SonarDatabaseCollector import SonarDatabaseCollector
+from commons.SonarIssuesCollector import SonarIssuesCollector
 from commons.SonarQubeApi import SonarQubeApi
+from commons.SonarQubeApiError import SonarQubeApiError
+from commons.SonarQubeApiFacade import SonarQubeApiFacade
 from commons.SonarMetricsCollector import SonarMetricsCollector
+from dotenv import load_dotenv
 from ExecutionMonitor import ExecutionMonitor
+from GitMirror import GitMirror
+from IncrementalWorkspace import IncrementalWorkspace
+from ProjectLifecycleManager import ProjectLifecycleManager
+from SonarHostRouter import SonarHostRouter
 from SonarQubeRunner import SonarQubeRunner
-from typing import List, Dict
+from TransientDownloadError import TransientDownloadError
+from WebhookReceiver import WebhookReceiver
+from typing import Iterator, List, Dict, Optional, Tuple
 
 def setup_logger() -> logging.Logger:
     """
@@ -25,7 +44,7 @@ def setup_logger() -> logging.Logger:
         
     logger = logging.getLogger("SonarQube-executions")
     logger.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - [%(threadName)s] %(message)s')
     
     file_handler = logging.FileHandler("./3-SonarQube_Execution/logs/executions.log")
     file_handler.setFormatter(formatter)
@@ -58,6 +77,8 @@ def create_exclude_prs_file(repo: str) -> None:
     
     write_output_file(exclude_file_path, {})
 
+exclude_prs_lock = threading.Lock()
+
 def add_pr_to_exclude_prs(repo: str, pr_number: int, reason: str) -> None:
     """
     Adds a pull request to the list of excluded PRs for a given project.
@@ -76,11 +97,31 @@ def add_pr_to_exclude_prs(repo: str, pr_number: int, reason: str) -> None:
         
     exclude_file_path = f"./3-SonarQube_Execution/logs/exclude_prs_{repo}.json"
 
-    excluded_prs = read_input_file(exclude_file_path)
+    with exclude_prs_lock:
+        excluded_prs = read_input_file(exclude_file_path)
+
+        excluded_prs[pr_number] = reason
+
+        write_output_file(exclude_file_path, excluded_prs)
+
+def is_pr_excluded(repo: str, pr_number: int) -> bool:
+    """
+    Checks whether a pull request was excluded, i.e. it failed permanently (e.g. a compilation error).
+
+    Args:
+        repo (str): The name of the repository.
+        pr_number (int): The number of the pull request.
+
+    Returns:
+        bool: True if the pull request is in the list of excluded PRs, False otherwise.
+    """
+
+    exclude_file_path = f"./3-SonarQube_Execution/logs/exclude_prs_{repo}.json"
 
-    excluded_prs[pr_number] = reason
+    with exclude_prs_lock:
+        excluded_prs = read_input_file(exclude_file_path)
 
-    write_output_file(exclude_file_path, excluded_prs)
+    return str(pr_number) in excluded_prs
 
 def check_prs_to_process(repo: str, output_directory: str, exclude_prs_file: str, prs: List[Dict]) -> List[Dict]:
     """
@@ -138,44 +179,48 @@ def set_first_commit(commits: List[Dict], start_commit_sha: str, is_pr_commit_fi
 
     return commits
 
-def download_commit(project_url: str, commit_sha: str) -> None:
+def delete_code_directory(repo: str, commit_sha: str, workspace: str = ".") -> None:
     """
-    Downloads the code corresponding to a given commit SHA and extracts it.
+    Deletes the directory containing code associated with a specific commit.
 
-    This method downloads the code associated with a specific commit SHA from the project's URL
-    and then extracts the downloaded ZIP file to the current directory.
+    This method removes the directory containing the code related to a specific commit
+    from the file system.
 
     Args:
-        project_url (str): The URL of the project repository.
-        commit_sha (str): The SHA of the commit to be downloaded.
+        repo (str): The name of the repository.
+        commit_sha (str): The SHA of the commit whose directory should be deleted.
+        workspace (str, optional): The directory where the commit was extracted. Defaults to ".".
 
     Returns:
         None
     """
+        
+    shutil.rmtree(os.path.join(workspace, f"{repo}-{commit_sha}"))
 
-    commit_url = f"{project_url}/archive/{commit_sha}.zip"
-
-    response = requests.get(commit_url, stream=True)
-
-    zip = zipfile.ZipFile(io.BytesIO(response.content))
-    zip.extractall()
-
-def delete_code_directory(repo: str, commit_sha: str) -> None:
+def release_code_directory(repo: str, commit_sha: str, git_mirror: Optional[GitMirror], workspace: str = ".") -> None:
     """
-    Deletes the directory containing code associated with a specific commit.
+    Releases the directory containing code associated with a specific commit.
 
-    This method removes the directory containing the code related to a specific commit
-    from the file system.
+    When commits are checked out from a local git mirror, the worktree is kept to be reused by the next
+    checkout. With incremental builds, the tree is kept to be reused by the next extracted commit.
+    Otherwise, the directory is deleted.
 
     Args:
         repo (str): The name of the repository.
-        commit_sha (str): The SHA of the commit whose directory should be deleted.
+        commit_sha (str): The SHA of the commit whose directory should be released.
+        git_mirror (Optional[GitMirror]): The local git mirror of the repository, if it is used.
+        workspace (str, optional): The directory where the commit was extracted. Defaults to ".".
 
     Returns:
         None
     """
-        
-    shutil.rmtree(f"./{repo}-{commit_sha}")
+
+    if git_mirror is not None:
+        git_mirror.release(os.path.join(workspace, f"{repo}-{commit_sha}"))
+    elif incremental_workspace is not None:
+        incremental_workspace.release(os.path.join(workspace, f"{repo}-{commit_sha}"))
+    else:
+        delete_code_directory(repo, commit_sha, workspace)
 
 def get_build_command_for_repo(repo: str) -> str:
     """
@@ -198,109 +243,820 @@ def get_build_command_for_repo(repo: str) -> str:
 
     return build_commands[REPO]
 
-REPO = "helix"
-PROJECT_URL = f"https://www.github.com/apache/{REPO}"
-EXCLUDE_PRS_FILE = f"./3-SonarQube_Execution/logs/exclude_prs_{REPO}.json"
-INPUT_DIRECTORY = "./2-PRs_Processing/2.5-Identify_Start_Commit/Output"
-OUTPUT_DIRECTORY = "./3-SonarQube_Execution/Output"
-BUILD_COMMANDS_FILE = "./3-SonarQube_Execution/build_commands.json"
+def get_workers_count(cores_per_worker: int, memory_per_worker: float, reserved_memory: float) -> int:
+    """
+    Computes how many PRs can be analyzed at once with the cores and the memory of the machine.
 
-create_exclude_prs_file(REPO)
+    Each worker runs one JVM at a time (Maven or Sonar Scanner), which is pinned at -Xmx2g by the
+    environment setup, so the memory per worker must cover that heap plus the JVM overhead.
 
-prs = read_input_file(f"{INPUT_DIRECTORY}/{REPO}.json")
-prs = check_prs_to_process(REPO, OUTPUT_DIRECTORY, EXCLUDE_PRS_FILE, prs)
+    Args:
+        cores_per_worker (int): The number of CPU cores given to each worker.
+        memory_per_worker (float): The memory, in GiB, given to each worker.
+        reserved_memory (float): The memory, in GiB, kept for SonarQube and the operating system.
 
-logger = setup_logger()
-sonar_api = SonarQubeApi(True)
-metrics_collector = SonarMetricsCollector(sonar_api)
-execution_monitor = ExecutionMonitor(REPO)
-build_handler = BuildHandler(get_build_command_for_repo(REPO))
-sonarqube_runner = SonarQubeRunner()
-
-for i in range(len(prs)):
-    pr_number = prs[i]["pr_number"]
+    Returns:
+        int: The number of workers, at least one.
+    """
+
+    cores = os.cpu_count() or 1
+    memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024 ** 3
+
+    workers_by_cores = cores // cores_per_worker
+    workers_by_memory = int((memory - reserved_memory) // memory_per_worker)
+
+    return max(1, min(workers_by_cores, workers_by_memory))
+
+def get_sonar_hosts() -> List[Dict[str, Optional[str]]]:
+    """
+    Reads the SonarQube hosts from a .env file: the comma-separated lists SONAR_HOSTS, SONAR_TOKENS and
+    SONAR_DB_URLS (a single token or database URL is shared by all hosts), or SONAR_HOST, SONAR_TOKEN and
+    SONAR_DB_URL when there is only one host.
+
+    Returns:
+        List[Dict[str, Optional[str]]]: The URL ("host"), token ("token") and database URL ("database_url") of each host.
+
+    Raises:
+        RuntimeError: If a list does not have one value per host.
+    """
+
+    load_dotenv()
+
+    def split_variable(name: str, fallback_name: str) -> List[Optional[str]]:
+        value = os.getenv(name) or os.getenv(fallback_name)
+        return [item.strip() for item in value.split(",")] if value else [None]
+
+    hosts = split_variable("SONAR_HOSTS", "SONAR_HOST")
+    hosts_count = len(hosts)
+    tokens = split_variable("SONAR_TOKENS", "SONAR_TOKEN")
+    database_urls = split_variable("SONAR_DB_URLS", "SONAR_DB_URL")
+
+    for name, values in (("SONAR_TOKENS", tokens), ("SONAR_DB_URLS", database_urls)):
+        if len(values) not in (1, hosts_count):
+            raise RuntimeError(f"{name} has {len(values)} values, but there are {hosts_count} SonarQube hosts")
+
+    return [
+        {
+            "host": hosts[k],
+            "token": tokens[k if len(tokens) > 1 else 0],
+            "database_url": database_urls[k if len(database_urls) > 1 else 0]
+        }
+        for k in range(hosts_count)
+    ]
+
+def create_sonar_services(sonar_host: Dict[str, Optional[str]]) -> dict:
+    """
+    Creates the clients used to scan a SonarQube host, wait for its background tasks and collect its results.
+
+    Args:
+        sonar_host (Dict[str, Optional[str]]): The URL, token and database URL of the host, as returned by `get_sonar_hosts`.
+
+    Returns:
+        dict: The API client ("api"), collection backend ("collection_backend"), metrics collector ("metrics_collector"),
+            issues collector ("issues_collector"), scanner runner ("runner"), task tracker ("ce_task_tracker") and
+            project lifecycle manager ("project_manager") of the host.
+    """
+
+    host, token = sonar_host["host"], sonar_host["token"]
+
+    if ASYNC_SONAR_API:
+        sonar_api = SonarQubeApiFacade(True, SONAR_API_CONNECTIONS, host, token)
+    else:
+        sonar_api = SonarQubeApi(True, host=host, token=token)
+
+    if COLLECTION_BACKEND == "database":
+        collection_backend = SonarDatabaseCollector(True, database_url=sonar_host["database_url"])
+    else:
+        collection_backend = sonar_api
+
+    return {
+        "api": sonar_api,
+        "collection_backend": collection_backend,
+        "metrics_collector": SonarMetricsCollector(collection_backend),
+        "issues_collector": SonarIssuesCollector(collection_backend),
+        "runner": SonarQubeRunner(host, token),
+        "ce_task_tracker": CeTaskTracker(sonar_api, webhook_receiver=webhook_receiver, webhook_timeout=WEBHOOK_TIMEOUT),
+        "project_manager": ProjectLifecycleManager(sonar_api, PROJECT_RETENTION)
+    }
+
+def select_commits(commits: List[str], analysis_mode: str, intermediate_metrics: bool) -> List[str]:
+    """
+    Selects the commits to be analyzed according to the analysis mode.
+
+    In the "all" mode, every commit is analyzed. In the "endpoints" mode, only the start commit and the
+    last commit are analyzed, as they are the only ones used to classify issues as PRE-EXISTING or NEW,
+    unless metrics of the intermediate commits are also requested.
+
+    Args:
+        commits (List[str]): The SHAs of the commits of the PR, starting with the start commit.
+        analysis_mode (str): The analysis mode, either "all" or "endpoints".
+        intermediate_metrics (bool): Whether metrics of the intermediate commits are requested.
+
+    Returns:
+        List[str]: The SHAs of the commits to be analyzed, in order.
+    """
+
+    if analysis_mode == "all" or intermediate_metrics or len(commits) <= 2:
+        return commits
+
+    return [commits[0], commits[-1]]
+
+def get_commits_to_analyze(pr: dict) -> List[str]:
+    """
+    Retrieves the SHAs of the commits of a pull request to be analyzed, in order.
+
+    Args:
+        pr (dict): The pull request to be analyzed.
+
+    Returns:
+        List[str]: The SHAs of the commits, starting with the start commit.
+    """
+
+    commits = [commit["sha"] for commit in pr["commits"]]
+    commits = set_first_commit(commits, pr["start_commit"], pr["is_pr_commit_first"])
+
+    return select_commits(commits, ANALYSIS_MODE, INTERMEDIATE_METRICS)
+
+def get_checkpoint_file(pr_number: int) -> str:
+    """
+    Retrieves the path of the checkpoint of a pull request.
+
+    Args:
+        pr_number (int): The number of the pull request.
+
+    Returns:
+        str: The path of the checkpoint file.
+    """
+
+    return os.path.join(CHECKPOINTS_DIRECTORY, f"{REPO}_{pr_number}.json")
+
+def read_checkpoint(pr_number: int) -> Optional[dict]:
+    """
+    Reads the checkpoint of a pull request: the results of its commits analyzed so far.
+
+    Args:
+        pr_number (int): The number of the pull request.
+
+    Returns:
+        Optional[dict]: The SonarQube host of the project ("sonar_host"), the last commit analyzed by SonarQube
+            ("last_analyzed_commit") and the results of each commit processed ("issues"), or None if there is no checkpoint.
+    """
+
+    checkpoint_file = get_checkpoint_file(pr_number)
+
+    if not os.path.exists(checkpoint_file):
+        return None
+
+    return read_input_file(checkpoint_file)
+
+def write_checkpoint(pr_number: int, sonar_host: str, last_analyzed_commit: Optional[str], issues: List[Dict]) -> None:
+    """
+    Writes the checkpoint of a pull request, replacing the previous one at once so that it is never left incomplete.
+
+    Args:
+        pr_number (int): The number of the pull request.
+        sonar_host (str): The SonarQube host of the project of the pull request.
+        last_analyzed_commit (Optional[str]): The last commit analyzed by SonarQube.
+        issues (List[Dict]): The results of each commit processed so far, as in the issues file.
+    """
+
+    checkpoint_file = get_checkpoint_file(pr_number)
+
+    write_output_file(f"{checkpoint_file}.tmp", {
+        "sonar_host": sonar_host,
+        "last_analyzed_commit": last_analyzed_commit,
+        "issues": issues
+    })
+    os.replace(f"{checkpoint_file}.tmp", checkpoint_file)
+
+def delete_checkpoint(pr_number: int) -> None:
+    """
+    Deletes the checkpoint of a pull request, if there is one.
+
+    Args:
+        pr_number (int): The number of the pull request.
+    """
+
+    try:
+        os.remove(get_checkpoint_file(pr_number))
+    except FileNotFoundError:
+        pass
+
+def get_commits_to_resume(pr: dict) -> List[str]:
+    """
+    Retrieves the SHAs of the commits of a pull request that were not processed yet, according to its checkpoint.
+
+    Args:
+        pr (dict): The pull request to be analyzed.
+
+    Returns:
+        List[str]: The SHAs of the remaining commits to be analyzed, in order.
+    """
+
+    commits = get_commits_to_analyze(pr)
+    checkpoint = read_checkpoint(pr["pr_number"])
+
+    return commits if checkpoint is None else commits[len(checkpoint["issues"]):]
+
+def validate_checkpoints(prs: List[Dict]) -> None:
+    """
+    Discards the checkpoints that cannot be resumed: their SonarQube host is no longer configured, their project
+    no longer exists, or the commits they processed are not the first commits to be analyzed.
+
+    Args:
+        prs (List[Dict]): The pull requests to be analyzed.
+    """
+
+    for pr in prs:
+        pr_number = pr["pr_number"]
+        checkpoint = read_checkpoint(pr_number)
+
+        if checkpoint is None:
+            continue
+
+        processed_commits = [commit["commit_sha"] for commit in checkpoint["issues"]]
+        is_resumable = (
+            checkpoint["sonar_host"] in sonar_host_urls
+            and get_commits_to_analyze(pr)[:len(processed_commits)] == processed_commits
+            and sonar_hosts_services[sonar_host_urls.index(checkpoint["sonar_host"])]["api"].check_project_already_exists(f"{REPO}-{pr_number}")
+        )
+
+        if is_resumable:
+            logger.debug(f"PR {pr_number} will resume at commit {len(processed_commits) + 1}")
+        else:
+            logger.debug(f"Discarding the checkpoint of PR {pr_number}, which cannot be resumed")
+            delete_checkpoint(pr_number)
+
+def get_pr_workspace(workspace: str, pr_number: int) -> str:
+    """
+    Retrieves the directory where the commits of a pull request are extracted.
+
+    Each PR has its own directory, so a commit shared by two PRs (e.g. the same start commit) can be
+    prepared for the next PR while it is still being analyzed for the current one.
+
+    Args:
+        workspace (str): The directory of the worker.
+        pr_number (int): The number of the pull request.
+
+    Returns:
+        str: The directory of the PR inside the worker directory.
+    """
+
+    return os.path.join(workspace, str(pr_number))
+
+def select_dependency_prefetch_commits(prs: List[Dict], prs_count: int) -> List[str]:
+    """
+    Selects representative commits whose dependencies are resolved before the analysis: the start commit
+    and the last commit of PRs evenly spaced in the order of their numbers.
+
+    Args:
+        prs (List[Dict]): The pull requests to be analyzed.
+        prs_count (int): The number of PRs whose commits are selected.
+
+    Returns:
+        List[str]: The SHAs of the selected commits, without duplicates.
+    """
+
+    if prs_count <= 0 or not prs:
+        return []
+
+    sorted_prs = sorted(prs, key=lambda pr: pr["pr_number"])
+    step = max(len(sorted_prs) / prs_count, 1)
+    selected_prs = [sorted_prs[int(k * step)] for k in range(min(prs_count, len(sorted_prs)))]
+
+    commits = []
+
+    for pr in selected_prs:
+        commits += [pr["start_commit"], pr["commits"][-1]["sha"]]
+
+    return list(dict.fromkeys(commits))
+
+def prefetch_dependencies(commits: List[str], workspace: str) -> None:
+    """
+    Resolves the dependencies of the given commits into the shared local Maven repository, so the builds
+    of the analysis can run offline.
+
+    Args:
+        commits (List[str]): The SHAs of the commits.
+        workspace (str): The directory where the commits are extracted.
+
+    Returns:
+        None
+    """
+
+    os.makedirs(workspace, exist_ok=True)
+
+    for commit_sha in commits:
+        logger.debug(f"Prefetching dependencies of commit {commit_sha}...")
+
+        try:
+            if git_mirror is not None:
+                git_mirror.checkout(commit_sha, os.path.join(workspace, f"{REPO}-{commit_sha}"))
+            else:
+                archive_downloader.download_commit(commit_sha, workspace)
+        except Exception:
+            logger.error(traceback.format_exc())
+            continue
+
+        is_prefetch_success = build_handler.prefetch_dependencies(REPO, commit_sha, workspace)
+        logger.debug(f"Dependencies of commit {commit_sha} {'resolved' if is_prefetch_success else 'partially resolved'}")
+
+        release_code_directory(REPO, commit_sha, git_mirror, workspace)
+
+def compute_java_fingerprint(code_directory: str) -> str:
+    """
+    Computes a fingerprint of the Java sources and build files of an extracted commit.
+
+    Args:
+        code_directory (str): The directory where the commit was extracted.
+
+    Returns:
+        str: The SHA-256 of the paths and contents of every .java file and build file of the commit.
+    """
+
+    java_files = []
+
+    for dirpath, dirnames, filenames in os.walk(code_directory):
+        dirnames[:] = [dirname for dirname in dirnames if dirname != ".git"]
+
+        for filename in filenames:
+            if GitMirror.is_fingerprinted_file(filename):
+                java_files.append(os.path.relpath(os.path.join(dirpath, filename), code_directory))
+
+    digest = hashlib.sha256()
+
+    for java_file in sorted(java_files):
+        with open(os.path.join(code_directory, java_file), "rb") as f:
+            file_sha = hashlib.sha1(f.read()).hexdigest()
+
+        digest.update(f"{java_file}\0{file_sha}\n".encode())
+
+    return digest.hexdigest()
+
+def compute_file_hashes(code_directory: str, files: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Computes the hash of the content of the given files of a materialized commit.
+
+    Args:
+        code_directory (str): The directory where the commit was materialized.
+        files (List[str]): The paths of the files, relative to the root of the commit.
+
+    Returns:
+        Dict[str, Optional[str]]: The SHA-1 of each file, or None for the files that do not exist in the commit.
+    """
+
+    file_hashes = {}
+
+    for file in files:
+        file_path = os.path.join(code_directory, file)
+
+        if not os.path.isfile(file_path):
+            file_hashes[file] = None
+            continue
+
+        with open(file_path, "rb") as f:
+            file_hashes[file] = hashlib.sha1(f.read()).hexdigest()
+
+    return file_hashes
+
+def get_touched_files(previous_file_hashes: Optional[Dict[str, Optional[str]]], file_hashes: Optional[Dict[str, Optional[str]]]) -> Optional[List[str]]:
+    """
+    Retrieves the files whose content changed between two commits.
+
+    Args:
+        previous_file_hashes (Optional[Dict[str, Optional[str]]]): The hashes of the files in the previous commit.
+        file_hashes (Optional[Dict[str, Optional[str]]]): The hashes of the files in the current commit.
+
+    Returns:
+        Optional[List[str]]: The touched files, or None if the hashes of any of the commits are unknown.
+    """
+
+    if previous_file_hashes is None or file_hashes is None:
+        return None
+
+    return [file for file, file_hash in file_hashes.items() if previous_file_hashes.get(file) != file_hash]
+
+def prepare_commit(pr: dict, commit_sha: str, workspace: str, java_fingerprints: Dict[int, str]) -> dict:
+    """
+    Downloads (or checks out), checks and compiles a commit of a pull request.
+
+    When SKIP_UNCHANGED_JAVA_COMMITS is enabled and the Java sources and build files of the commit are identical to the
+    ones of the previous commit of the PR, the commit is neither compiled nor kept on disk, as its
+    analysis results are carried over from the previous commit.
+
+    Args:
+        pr (dict): The pull request of the commit.
+        commit_sha (str): The SHA of the commit.
+        workspace (str): The directory of the worker preparing the commit.
+        java_fingerprints (Dict[int, str]): The Java fingerprint of the last commit prepared for each PR.
+
+    Returns:
+        dict: The Java fingerprint of the commit, whether its results are carried over from the previous commit
+            and, if not, the bytecode directories and the dependencies to be passed to the analysis and, with
+            DELTA_COLLECTION, the hashes of the changed files (and old names of moved files) of the PR.
+
+    Raises:
+        Exception: If the build files are missing or the compilation fails. In the latter case, the PR
+            is added to the excluded PRs. In both cases, the directory of the commit is removed.
+    """
+
+    pr_number = pr["pr_number"]
+    workspace = get_pr_workspace(workspace, pr_number)
+    os.makedirs(workspace, exist_ok=True)
+
+    previous_java_fingerprint = java_fingerprints.get(pr_number)
+    java_fingerprint = None
+
+    if SKIP_UNCHANGED_JAVA_COMMITS and git_mirror is not None:
+        java_fingerprint = git_mirror.get_java_fingerprint(commit_sha)
+        java_fingerprints[pr_number] = java_fingerprint
+
+        if java_fingerprint == previous_java_fingerprint:
+            logger.debug(f"Java sources of commit {commit_sha} are unchanged... Skipping checkout")
+            return { "java_fingerprint": java_fingerprint, "carried_over": True }
+
+    code_directory = os.path.join(workspace, f"{REPO}-{commit_sha}")
+
+    if git_mirror is not None:
+        logger.debug(f"Checking out commit {commit_sha}...")
+        git_mirror.checkout(commit_sha, code_directory, build_output_directories if INCREMENTAL_BUILDS else None)
+    else:
+        # With incremental builds, the commit is extracted aside and then applied on top of a previous tree
+        extract_directory = tempfile.mkdtemp(dir=workspace) if incremental_workspace is not None else workspace
+
+        try:
+            logger.debug(f"Downloading commit {commit_sha}...")
+            download_stats = archive_downloader.download_commit(commit_sha, extract_directory)
+            logger.debug(
+                f"Downloaded {download_stats['size']} bytes (sha256 {download_stats['sha256']}) - "
+                f"connect: {download_stats['connect']:.2f}s, download: {download_stats['download']:.2f}s, "
+                f"extract: {download_stats['extract']:.2f}s"
+            )
+
+            if incremental_workspace is not None:
+                incremental_workspace.apply(os.path.join(extract_directory, f"{REPO}-{commit_sha}"), code_directory)
+        finally:
+            if incremental_workspace is not None:
+                shutil.rmtree(extract_directory, ignore_errors=True)
+
+    if SKIP_UNCHANGED_JAVA_COMMITS and git_mirror is None:
+        java_fingerprint = compute_java_fingerprint(code_directory)
+        java_fingerprints[pr_number] = java_fingerprint
+
+        if java_fingerprint == previous_java_fingerprint:
+            logger.debug(f"Java sources of commit {commit_sha} are unchanged... Skipping build")
+            release_code_directory(REPO, commit_sha, git_mirror, workspace)
+            return { "java_fingerprint": java_fingerprint, "carried_over": True }
+
+    logger.debug("Checking build files...")
+    try:
+        build_handler.check_build_files(REPO, pr_number, commit_sha, workspace)
+    except Exception as error:
+        add_pr_to_exclude_prs(REPO, pr_number, f"{error}... PR: {pr_number}, commit: {commit_sha}")
+        raise
+
+    logger.debug(f"Compiling commit {commit_sha}...")
+    changed_files = pr["changed_files"] if SCOPED_BUILDS else None
+    is_compile_success = build_handler.compile_project(REPO, pr_number, commit_sha, workspace, changed_files)
+
+    if not is_compile_success:
+        release_code_directory(REPO, commit_sha, git_mirror, workspace)
+        error_msg = f"Failed to compile... PR: {pr_number}, commit: {commit_sha}"
+        add_pr_to_exclude_prs(REPO, pr_number, error_msg)
+        raise Exception(error_msg)
+
+    binaries, libraries = [], []
+
+    if EXPLICIT_CLASSPATH and "mvn" in build_handler.compile_command:
+        logger.debug("Resolving bytecode directories and classpath...")
+        binaries, libraries = build_handler.get_analysis_classpath(REPO, commit_sha, workspace)
+
+    file_hashes = None
+
+    if DELTA_COLLECTION:
+        tracked_files = SonarMetricsCollector.get_moved_counterparts(pr["changed_files"], pr["moved_files"])
+        file_hashes = compute_file_hashes(code_directory, tracked_files)
+
+    return {
+        "java_fingerprint": java_fingerprint,
+        "carried_over": False,
+        "binaries": binaries,
+        "libraries": libraries,
+        "file_hashes": file_hashes
+    }
+
+def release_prepared_commit(pr: dict, commit_sha: str, prepared_commit: dict, workspace: str) -> None:
+    """
+    Releases a prepared commit that will not be analyzed.
+
+    Args:
+        pr (dict): The pull request of the commit.
+        commit_sha (str): The SHA of the commit.
+        prepared_commit (dict): The result of the preparation of the commit.
+        workspace (str): The directory of the worker that prepared the commit.
+
+    Returns:
+        None
+    """
+
+    # Carried over commits are not kept on disk
+    if prepared_commit["carried_over"]:
+        return
+
+    release_code_directory(REPO, commit_sha, git_mirror, get_pr_workspace(workspace, pr["pr_number"]))
+
+def prepare_pr_commits(pr: dict, workspace: str) -> List[Tuple[str, dict, Exception]]:
+    """
+    Prepares all the commits of a pull request not processed yet before any of them is analyzed, compiling up to
+    BUILD_PARALLELISM commits at once, as their builds are independent.
+
+    As soon as the preparation of a commit fails, the preparations not started are cancelled and the commits
+    already prepared are released, so a PR that does not compile is excluded without analyzing any commit.
+    Commits whose Java sources are identical to the ones of the previous commit are carried over, as when
+    the commits are prepared in order.
+
+    Args:
+        pr (dict): The pull request to be analyzed.
+        workspace (str): The directory of the worker preparing the commits.
+
+    Returns:
+        List[Tuple[str, dict, Exception]]: The SHA of each commit, in order, with the result of its preparation
+            and None or, if a preparation failed, only the first failed commit, with None and the error it raised.
+    """
+
+    commits = get_commits_to_resume(pr)
+
+    with ThreadPoolExecutor(max_workers=BUILD_PARALLELISM, thread_name_prefix=f"{threading.current_thread().name}-build") as executor:
+        # Each commit is fingerprinted on its own, the carried over commits are found once all are prepared
+        futures = [executor.submit(prepare_commit, pr, commit_sha, workspace, {}) for commit_sha in commits]
+        _, pending_futures = wait(futures, return_when=FIRST_EXCEPTION)
+
+        for future in pending_futures:
+            future.cancel()
+
+    failed_commits = [
+        (commit_sha, future.exception())
+        for commit_sha, future in zip(commits, futures)
+        if not future.cancelled() and future.exception() is not None
+    ]
+
+    if failed_commits:
+        for commit_sha, future in zip(commits, futures):
+            if not future.cancelled() and future.exception() is None:
+                release_prepared_commit(pr, commit_sha, future.result(), workspace)
+
+        commit_sha, error = failed_commits[0]
+        return [(commit_sha, None, error)]
+
+    prepared_commits = []
+    previous_java_fingerprint = None
+
+    for commit_sha, future in zip(commits, futures):
+        prepared_commit = future.result()
+        java_fingerprint = prepared_commit["java_fingerprint"]
+
+        if SKIP_UNCHANGED_JAVA_COMMITS and prepared_commits and java_fingerprint == previous_java_fingerprint:
+            logger.debug(f"Java sources of commit {commit_sha} are unchanged... Releasing its build")
+            release_prepared_commit(pr, commit_sha, prepared_commit, workspace)
+            prepared_commit = { "java_fingerprint": java_fingerprint, "carried_over": True }
+
+        previous_java_fingerprint = java_fingerprint
+        prepared_commits.append((commit_sha, prepared_commit, None))
+
+    return prepared_commits
+
+def iterate_compiled_prs(prs: Iterator[dict], workspace: str) -> Iterator[Tuple[dict, Iterator[Tuple[str, dict, Exception]]]]:
+    """
+    Iterates over the pull requests, preparing all the commits of each one before handing them out.
+
+    When the analysis of a PR stops consuming its commits (e.g. after a failure), its remaining commits are released.
+
+    Args:
+        prs (Iterator[dict]): The pull requests to be analyzed.
+        workspace (str): The directory of the worker, where the commits of its PRs are extracted.
+
+    Yields:
+        Tuple[dict, Iterator[Tuple[str, dict, Exception]]]: Each PR and an iterator of its prepared commits,
+            as returned by `prepare_pr_commits`.
+    """
+
+    for pr in prs:
+        logger.debug(f"Compiling the commits of PR {pr['pr_number']}...")
+        prepared_commits = iter(prepare_pr_commits(pr, workspace))
+
+        yield pr, prepared_commits
+
+        for commit_sha, prepared_commit, error in prepared_commits:
+            if error is None:
+                release_prepared_commit(pr, commit_sha, prepared_commit, workspace)
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Checks if an error is transient, i.e. a network error, a timeout, an error of the SonarQube server (5xx) or
+    a download of an archive that failed on the side of GitHub or was cut off, after which the analysis of a PR
+    can be resumed.
+
+    Args:
+        error (Exception): The error that interrupted the analysis.
+
+    Returns:
+        bool: True if the error is transient, False otherwise.
+    """
+
+    if isinstance(error, (requests.RequestException, aiohttp.ClientError, TimeoutError, TransientDownloadError)):
+        return True
+
+    return isinstance(error, SonarQubeApiError) and error.status_code // 100 == 5
+
+def analyze_pr(pr: dict, prepared_commits: Iterator[Tuple[str, dict, Exception]], workspace: str, execution_monitor: ExecutionMonitor) -> bool:
+    """
+    Analyzes every commit of a pull request with SonarQube and saves the issues found.
+
+    The results of each commit are saved in a checkpoint as soon as they are collected, and the analysis
+    resumes after the last commit of the checkpoint. If a commit fails with a transient error (a network
+    error, a timeout or a SonarQube server error), the SonarQube project and the checkpoint of the PR are kept,
+    so the PR can be resumed. Any other failure is permanent (e.g. a compilation error, which excludes the PR)
+    and both are deleted.
+
+    Args:
+        pr (dict): The pull request to be analyzed.
+        prepared_commits (Iterator[Tuple[str, dict, Exception]]): The commits of the PR not processed yet, in order,
+            already compiled, with the result of the preparation of each one and the error it raised, or None.
+        workspace (str): The directory of the worker analyzing the PR.
+        execution_monitor (ExecutionMonitor): The execution monitor of the worker analyzing the PR.
+
+    Returns:
+        bool: True if the PR failed with a transient error and can be resumed, False otherwise.
+    """
+
+    pr_number = pr["pr_number"]
+    workspace = get_pr_workspace(workspace, pr_number)
         
     sonar_project = f"{REPO}-{pr_number}"
 
+    checkpoint = read_checkpoint(pr_number)
+    checkpoint_host = sonar_host_urls.index(checkpoint["sonar_host"]) if checkpoint is not None else None
+
+    # Every scan, poll and collection of the PR goes to the SonarQube host its project is pinned to
+    sonar_host = sonar_router.acquire(sonar_project, checkpoint_host)
+    sonar_services = sonar_hosts_services[sonar_host]
+    sonar_api = sonar_services["api"]
+    sonarqube_runner = sonar_services["runner"]
+    ce_task_tracker = sonar_services["ce_task_tracker"]
+    metrics_collector = sonar_services["metrics_collector"]
+    issues_collector = sonar_services["issues_collector"]
+    project_manager = sonar_services["project_manager"]
+
     try:
         logger.debug(f"Starting PR {pr_number}")
 
         execution_monitor.start_monitoring()
 
+        # A PR whose first commit failed to be prepared (with COMPILE_ALL_FIRST, any commit that does not
+        # compile) fails before any SonarQube request, so it only costs its build
+        logger.debug("Waiting for the first commit to be prepared...")
+        first_prepared_commit = next(prepared_commits, None)
+
+        if first_prepared_commit is not None:
+            if first_prepared_commit[2] is not None:
+                raise first_prepared_commit[2]
+
+            prepared_commits = itertools.chain([first_prepared_commit], prepared_commits)
+
         logger.debug(f"Creating sonar project: {sonar_project}...")
-        sonar_api.create_project(sonar_project, sonar_project)
+        project_manager.ensure_project(sonar_project)
 
-        changed_files = prs[i]["changed_files"]
+        # The checkpoint also records the host of the project, to resume on it even before the first commit is processed
+        if checkpoint is None:
+            write_checkpoint(pr_number, sonar_host_urls[sonar_host], None, [])
+
+        if webhook_receiver is not None:
+            sonar_api.create_webhook("analysis-completed", sonar_project, WEBHOOK_URL, WEBHOOK_SECRET)
+
+        changed_files = pr["changed_files"]
 
         issues_json = f"{OUTPUT_DIRECTORY}/issues_{REPO}_{pr_number}.json"
-        issues = []
+        issues = checkpoint["issues"] if checkpoint is not None else []
 
-        commits = [commit["sha"] for commit in prs[i]["commits"]]
-        start_commit = prs[i]["start_commit"]
-        is_pr_commit_first = prs[i]["is_pr_commit_first"]
-        
         logger.debug(f"Setting first commit...")
-        commits = set_first_commit(commits, start_commit, is_pr_commit_first)
+        commits = get_commits_to_analyze(pr)
 
         commits_length = len(commits)
         logger.debug(f"Total commits: {commits_length}")
 
-        for j in range(commits_length):
+        # Old names of moved files are analyzed too, as their issues are collected for both names
+        analysis_inclusions = None
+
+        if SCOPED_ANALYSIS:
+            analysis_inclusions = list(dict.fromkeys(changed_files + [file["old_filename"] for file in pr["moved_files"]]))
+
+        last_analyzed_commit = checkpoint["last_analyzed_commit"] if checkpoint is not None else None
+        last_collected_issues = None
+
+        # With DELTA_COLLECTION, the last collected metrics, with the file hashes of their commit
+        metrics_baseline = (None, None)
+
+        if issues:
+            logger.debug(f"Resuming at commit {len(issues) + 1} from the checkpoint")
+
+        for j in range(len(issues), commits_length):
             commit_sha = commits[j]
             logger.debug(f"Starting to process commit {j+1} of {commits_length} [{commit_sha}]")
             execution_monitor.start_commit_monitoring()
 
-            logger.debug("Downloading commit...")
-            download_commit(PROJECT_URL, commit_sha)
+            logger.debug("Waiting for commit to be prepared...")
+            _, prepared_commit, preparation_error = next(prepared_commits)
 
-            logger.debug("Checking build files...")
-            build_handler.check_build_files(REPO, pr_number, commit_sha)
+            if preparation_error is not None:
+                raise preparation_error
 
-            logger.debug("Compiling...")
-            is_compile_success = build_handler.compile_project(REPO, pr_number, commit_sha)
+            # In the "endpoints" mode, intermediate commits are only analyzed for their metrics
+            is_endpoint = j == 0 or j == commits_length - 1
+            collect_issues = ANALYSIS_MODE == "all" or is_endpoint
 
-            if not is_compile_success:
-                delete_code_directory(REPO, commit_sha)
-                error_msg = f"Failed to compile... PR: {pr_number}, commit: {commit_sha}"
-                add_pr_to_exclude_prs(REPO, pr_number, error_msg)
-                raise Exception(error_msg)
+            if prepared_commit["carried_over"]:
+                logger.debug(f"Java sources unchanged since commit {last_analyzed_commit}... Carrying over its results")
+                metrics = issues[-1]["metrics"]
+
+                if not collect_issues:
+                    commit_issues = { "issues": [], "total": 0 }
+                elif last_collected_issues is not None:
+                    commit_issues = last_collected_issues
+                else:
+                    # The last analysis in SonarQube has the same Java sources, but its issues were not collected
+                    commit_issues = issues_collector.get_issues(sonar_project, changed_files)
+                    last_collected_issues = commit_issues
+
+                issues.append({
+                    "commit_sha": commit_sha,
+                    "issues": commit_issues,
+                    "metrics": metrics,
+                    "carried_over_from": last_analyzed_commit
+                })
+                write_checkpoint(pr_number, sonar_host_urls[sonar_host], last_analyzed_commit, issues)
+
+                execution_monitor.end_commit_monitoring(commit_sha)
+                logger.debug(f"Execution for PR {pr_number} commit {j+1} ended")
+                continue
 
             logger.debug("Running sonar analysis...")
-            is_analysis_success = sonarqube_runner.run_analysis(REPO, pr_number, commit_sha, sonar_project, sonar_project)
+            is_analysis_success = sonarqube_runner.run_analysis(
+                REPO,
+                pr_number,
+                commit_sha,
+                sonar_project,
+                sonar_project,
+                workspace,
+                prepared_commit["binaries"],
+                prepared_commit["libraries"],
+                analysis_inclusions
+            )
 
             if not is_analysis_success:
-                delete_code_directory(REPO, commit_sha)
+                release_code_directory(REPO, commit_sha, git_mirror, workspace)
                 error_msg = f"Failed to run sonar... PR: {pr_number}, commit: {commit_sha}"
                 add_pr_to_exclude_prs(REPO, pr_number, error_msg)
                 raise Exception(error_msg)
 
-            current_analysis = j + 1
+            last_analyzed_commit = commit_sha
+            ce_task_id = sonarqube_runner.get_ce_task_id(REPO, commit_sha, workspace)
 
-            logger.debug("Waiting for analysis to be available for collect...")
-            while True:
-                total_analyses = sonar_api.get_project_total_analyses(sonar_project)
-                total_analyses_by_activity = sonar_api.get_total_analyses_by_ce_activity(sonar_project)
+            logger.debug(f"Waiting for background task {ce_task_id} to be processed...")
+            try:
+                ce_task_tracker.wait(ce_task_id, ANALYSIS_TIMEOUT)
+            except TimeoutError:
+                release_code_directory(REPO, commit_sha, git_mirror, workspace)
+                raise
+            except RuntimeError as error:
+                release_code_directory(REPO, commit_sha, git_mirror, workspace)
+                add_pr_to_exclude_prs(REPO, pr_number, f"{error}... PR: {pr_number}, commit: {commit_sha}")
+                raise
 
-                is_analysis_available = (
-                    total_analyses == current_analysis and 
-                    total_analyses_by_activity == current_analysis
-                )
+            logger.debug("Analysis available... Collecting issues...")
 
-                if is_analysis_available:
-                    logger.debug("Analysis available... Collecting issues...")
-                    break
-                else:
-                    time.sleep(1)
+            # Only the metrics of the files touched since the last collection are requested again
+            file_hashes = prepared_commit["file_hashes"]
 
             logger.debug("Collecting metrics...")
-            metrics = metrics_collector.get_metrics(sonar_project, changed_files, prs[i]["moved_files"])
+            touched_files = get_touched_files(metrics_baseline[0], file_hashes)
+            metrics = metrics_collector.get_metrics(sonar_project, changed_files, pr["moved_files"], touched_files, metrics_baseline[1])
+            metrics_baseline = (file_hashes, metrics)
+
+            # The issues of a file may change when other files change (e.g. cross-file type resolution), so they are always requested
+            if collect_issues:
+                commit_issues = issues_collector.get_issues(sonar_project, changed_files)
+                last_collected_issues = commit_issues
+            else:
+                commit_issues = { "issues": [], "total": 0 }
+                last_collected_issues = None
 
             issues.append({
                 "commit_sha": commit_sha,
-                "issues": sonar_api.get_issues_for_files(sonar_project, changed_files),
+                "issues": commit_issues,
                 "metrics": metrics
             })
-            delete_code_directory(REPO, commit_sha)
+            write_checkpoint(pr_number, sonar_host_urls[sonar_host], last_analyzed_commit, issues)
+            release_code_directory(REPO, commit_sha, git_mirror, workspace)
 
             execution_monitor.end_commit_monitoring(commit_sha)
             logger.debug(f"Execution for PR {pr_number} commit {j+1} ended")
@@ -308,11 +1064,306 @@ for i in range(len(prs)):
         logger.debug("All commits processed")
         logger.debug("Saving issues data...")
         write_output_file(issues_json, issues)
+        delete_checkpoint(pr_number)
+        project_manager.retire(sonar_project, issues_json)
 
         execution_monitor.end_monitoring(pr_number)
         logger.debug(f"PR {pr_number} was successfully processed!")
 
+        return False
+
     except Exception as error:
-        sonar_api.delete_project(sonar_project)
         logger.debug('\033[91m' + str(error) + '\033[0m')
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
+
+        if is_pr_excluded(REPO, pr_number) or not is_transient_error(error):
+            project_manager.discard(sonar_project)
+            delete_checkpoint(pr_number)
+            return False
+
+        logger.debug(f"PR {pr_number} failed with a transient error... Keeping its project and checkpoint to resume it")
+        return True
+
+    finally:
+        sonar_router.release(sonar_project)
+
+def is_provisioning_enabled() -> bool:
+    """
+    Checks if the projects of the PRs are provisioned ahead, which requires knowing their host in advance.
+
+    Returns:
+        bool: True if PROVISION_PROJECTS is set and there is a single host or the routing is consistent.
+    """
+
+    return PROVISION_PROJECTS and (len(sonar_hosts) == 1 or SONAR_ROUTING == "consistent")
+
+def provision_projects(prs: List[Dict]) -> None:
+    """
+    Queues the provisioning of the projects of upcoming pull requests on their hosts.
+
+    Args:
+        prs (List[Dict]): The upcoming pull requests.
+
+    Returns:
+        None
+    """
+
+    projects_by_host = [[] for _ in sonar_hosts]
+
+    for pr in prs:
+        sonar_project = f"{REPO}-{pr['pr_number']}"
+        projects_by_host[sonar_router.get_consistent_host(sonar_project)].append(sonar_project)
+
+    for sonar_services, projects in zip(sonar_hosts_services, projects_by_host):
+        if projects:
+            sonar_services["project_manager"].provision(projects)
+
+def take_prs(prs_queue: queue.Queue, prs: List[Dict]) -> Iterator[dict]:
+    """
+    Takes pull requests from a shared queue until the queue is empty.
+
+    The queue holds the pull requests with their position in the list. When provisioning is enabled, taking
+    a pull request provisions the project of the one PROVISION_WINDOW positions behind it, so the projects of
+    the next PROVISION_WINDOW pull requests are always being provisioned.
+
+    Args:
+        prs_queue (queue.Queue): The queue of pull requests to be analyzed, shared by all workers.
+        prs (List[Dict]): The pull requests of the queue, in their order.
+
+    Yields:
+        dict: The next pull request to be analyzed.
+    """
+
+    while True:
+        try:
+            position, pr = prs_queue.get_nowait()
+        except queue.Empty:
+            return
+
+        if is_provisioning_enabled() and position + PROVISION_WINDOW < len(prs):
+            provision_projects([prs[position + PROVISION_WINDOW]])
+
+        yield pr
+
+def run_worker(prs_queue: queue.Queue, prs: List[Dict], workspace: str, execution_monitor: ExecutionMonitor, failed_prs: List[Dict]) -> None:
+    """
+    Analyzes pull requests taken from a shared queue until the queue is empty.
+
+    The next commits, including the first commit of the next PR, are prepared in the background while
+    the current one is analyzed, up to PREFETCH_LOOKAHEAD commits ahead. With COMPILE_ALL_FIRST, all the
+    commits of a PR are prepared before it is analyzed instead.
+
+    Args:
+        prs_queue (queue.Queue): The queue of pull requests to be analyzed, shared by all workers.
+        prs (List[Dict]): The pull requests of the queue, in their order.
+        workspace (str): The directory of the worker, where the commits of its PRs are extracted.
+        execution_monitor (ExecutionMonitor): The execution monitor of the worker.
+        failed_prs (List[Dict]): The pull requests that failed with a transient error, shared by all workers.
+
+    Returns:
+        None
+    """
+
+    os.makedirs(workspace, exist_ok=True)
+
+    java_fingerprints = {}
+
+    if COMPILE_ALL_FIRST:
+        prepared_prs = iterate_compiled_prs(take_prs(prs_queue, prs), workspace)
+    else:
+        commit_prefetcher = CommitPrefetcher(
+            lambda pr, commit_sha: prepare_commit(pr, commit_sha, workspace, java_fingerprints),
+            lambda pr, commit_sha, prepared_commit: release_prepared_commit(pr, commit_sha, prepared_commit, workspace),
+            PREFETCH_LOOKAHEAD
+        )
+        prepared_prs = commit_prefetcher.iterate_prs(take_prs(prs_queue, prs), get_commits_to_resume)
+
+    for pr, prepared_commits in prepared_prs:
+        if analyze_pr(pr, prepared_commits, workspace, execution_monitor):
+            failed_prs.append(pr)
+
+        # Removes the directory of the PR, unless it still holds an idle git worktree
+        try:
+            os.rmdir(get_pr_workspace(workspace, pr["pr_number"]))
+        except OSError:
+            pass
+
+def run_workers(prs: List[Dict], workers_count: int) -> List[Dict]:
+    """
+    Analyzes pull requests with several workers, each one in its own thread and directory.
+
+    Args:
+        prs (List[Dict]): The pull requests to be analyzed.
+        workers_count (int): The number of workers.
+
+    Returns:
+        List[Dict]: The pull requests that failed with a transient error.
+    """
+
+    prs_queue = queue.Queue()
+
+    for position, pr in enumerate(prs):
+        prs_queue.put((position, pr))
+
+    if is_provisioning_enabled():
+        provision_projects(prs[:PROVISION_WINDOW])
+
+    failed_prs = []
+    workers = []
+
+    for k in range(workers_count):
+        worker_name = f"worker-{k + 1}"
+        worker = threading.Thread(
+            target=run_worker,
+            args=(prs_queue, prs, os.path.join(WORKSPACES_DIRECTORY, worker_name), ExecutionMonitor(REPO), failed_prs),
+            name=worker_name
+        )
+        worker.start()
+        workers.append(worker)
+
+    for worker in workers:
+        worker.join()
+
+    return failed_prs
+
+REPO = "helix"
+PROJECT_URL = f"https://www.github.com/apache/{REPO}"
+EXCLUDE_PRS_FILE = f"./3-SonarQube_Execution/logs/exclude_prs_{REPO}.json"
+INPUT_DIRECTORY = "./2-PRs_Processing/2.5-Identify_Start_Commit/Output"
+OUTPUT_DIRECTORY = "./3-SonarQube_Execution/Output"
+BUILD_COMMANDS_FILE = "./3-SonarQube_Execution/build_commands.json"
+CHECKOUT_MODE = "archive" # "archive" downloads an archive per commit, "mirror" checks commits out from a local git mirror
+MIRRORS_DIRECTORY = "./3-SonarQube_Execution/mirrors"
+ARCHIVE_FORMAT = "tar.gz" # "tar.gz" is extracted while downloading, "zip" is spooled to the scratch directory first
+SCRATCH_DIRECTORY = None # None uses the system temporary directory
+MAX_ARCHIVE_SIZE = None # in bytes, None means no limit
+WORKSPACES_DIRECTORY = "./3-SonarQube_Execution/workspaces"
+CHECKPOINTS_DIRECTORY = "./3-SonarQube_Execution/checkpoints" # results of the commits processed in each PR, to resume it after a transient failure
+TRANSIENT_RETRIES = 2 # number of times the PRs that failed with a transient error are resumed in the same execution
+WORKERS = None # number of PRs analyzed at once, None computes it from the cores and memory available
+WORKER_CORES = 2
+WORKER_MEMORY = 3 # in GiB, the -Xmx2g heap of Maven or Sonar Scanner plus the JVM overhead
+RESERVED_MEMORY = 4 # in GiB, kept for SonarQube and the operating system
+PREFETCH_LOOKAHEAD = 1 # number of commits prepared ahead of the one being analyzed, 0 disables prefetching
+COMPILE_ALL_FIRST = False # compiles all the commits of a PR before analyzing them, so PRs that do not compile are excluded without any analysis (replaces prefetching)
+BUILD_PARALLELISM = 2 # with COMPILE_ALL_FIRST, number of commits of a PR compiled at once by each worker
+ANALYSIS_TIMEOUT = 1800 # in seconds, maximum time for SonarQube to process the report of an analysis
+WEBHOOK_PORT = None # e.g. 8765 to receive the analysis-completed webhooks of SonarQube, None only polls
+WEBHOOK_ADDRESS = "127.0.0.1" # address the receiver listens on, only reachable from the machine running SonarQube
+WEBHOOK_URL = f"http://localhost:{WEBHOOK_PORT}/" if WEBHOOK_PORT is not None else None # URL SonarQube posts to, reaching the local receiver
+WEBHOOK_SECRET = None # secret used by SonarQube to sign the webhook deliveries, None disables the check
+WEBHOOK_TIMEOUT = 60 # in seconds, time to wait for a webhook delivery before polling the background task
+ANALYSIS_MODE = "all" # "all" analyzes every commit of a PR, "endpoints" only the start commit and the last commit
+INTERMEDIATE_METRICS = False # in the "endpoints" mode, also analyzes the intermediate commits to record their metrics
+SKIP_UNCHANGED_JAVA_COMMITS = False # carries over the results of commits whose Java sources and build files are identical to the previous commit
+SCOPED_BUILDS = True # compiles only the modules owning the changed files (and their dependencies), falling back to the full build
+INCREMENTAL_BUILDS = False # reuses the tree and the build outputs of the previous commit, without the "clean" goal
+BUILD_CACHE_DIRECTORY = None # e.g. "./3-SonarQube_Execution/build-cache" to share build outputs across PRs, None disables the cache
+MAVEN_REPOSITORY = "./3-SonarQube_Execution/maven-repository" # local Maven repository shared by all builds, None uses the default one
+OFFLINE_BUILDS = True # runs Maven offline against MAVEN_REPOSITORY, retrying online when dependencies are missing
+MAVEN_SETTINGS_FILE = None # e.g. "./3-SonarQube_Execution/maven-mirror-settings.xml" to download dependencies from a local repository manager
+DEPENDENCY_PREFETCH_PRS = 3 # number of PRs whose start and last commits have their dependencies resolved before the analysis
+GRADLE_BUILD_CACHE = "./3-SonarQube_Execution/gradle-build-cache" # local Gradle build cache shared by all builds
+GRADLE_USER_HOME = None # Gradle user home shared by all builds (dependencies and daemons), None uses the default one
+EXPLICIT_CLASSPATH = True # passes the bytecode directories and the resolved dependencies of Maven projects to the Java analyzer, instead of "**/target/classes"
+SCOPED_ANALYSIS = False # analyzes only the changed files of each PR, which changes project-wide measures such as duplications
+DELTA_COLLECTION = True # after the first commit of a PR, requests again only the metrics of the files touched since the last collection
+ASYNC_SONAR_API = False # uses the asyncio client, which requests all pages and files at once, through its synchronous facade
+SONAR_API_CONNECTIONS = 8 # maximum number of connections of the asyncio client to SonarQube
+COLLECTION_BACKEND = "api" # "api" or "database" (reads issues and metrics from the SonarQube database, set by SONAR_DB_URL)
+PROVISION_PROJECTS = True # creates the projects of the upcoming PRs in the background (with a single SonarQube host or the "consistent" routing)
+PROVISION_WINDOW = 20 # number of upcoming PRs, taken from the queue, whose projects are provisioned ahead
+PROJECT_RETENTION = None # number of analyzed PR projects kept in each SonarQube host, older ones are deleted in the background, None keeps them all
+SONAR_ROUTING = "consistent" # with several hosts in SONAR_HOSTS, "consistent" hashes each PR project to a host, "least_loaded" picks the host with the fewest PRs in progress
+
+create_exclude_prs_file(REPO)
+
+prs = read_input_file(f"{INPUT_DIRECTORY}/{REPO}.json")
+prs = check_prs_to_process(REPO, OUTPUT_DIRECTORY, EXCLUDE_PRS_FILE, prs)
+
+logger = setup_logger()
+build_command = get_build_command_for_repo(REPO)
+build_output_directories = BuildHandler.get_output_directories(build_command)
+build_files = BuildHandler.get_module_build_files(build_command)
+build_output_cache = BuildOutputCache(BUILD_CACHE_DIRECTORY, build_output_directories, build_files) if BUILD_CACHE_DIRECTORY is not None else None
+build_handler = BuildHandler(
+    build_command,
+    INCREMENTAL_BUILDS,
+    build_output_cache,
+    MAVEN_REPOSITORY,
+    OFFLINE_BUILDS,
+    MAVEN_SETTINGS_FILE,
+    GRADLE_BUILD_CACHE,
+    GRADLE_USER_HOME
+)
+webhook_receiver = None
+
+if WEBHOOK_PORT is not None:
+    webhook_receiver = WebhookReceiver(WEBHOOK_ADDRESS, WEBHOOK_PORT, WEBHOOK_SECRET)
+    webhook_receiver.start()
+
+sonar_hosts = get_sonar_hosts()
+sonar_hosts_services = [create_sonar_services(sonar_host) for sonar_host in sonar_hosts]
+sonar_router = SonarHostRouter([sonar_host["host"] for sonar_host in sonar_hosts], SONAR_ROUTING)
+sonar_host_urls = [sonar_services["runner"].host for sonar_services in sonar_hosts_services]
+logger.debug(f"Analyzing on {len(sonar_hosts)} SonarQube host(s) with the {SONAR_ROUTING} routing")
+
+os.makedirs(CHECKPOINTS_DIRECTORY, exist_ok=True)
+validate_checkpoints(prs)
+
+archive_downloader = ArchiveDownloader(PROJECT_URL, ARCHIVE_FORMAT, SCRATCH_DIRECTORY, max_archive_size=MAX_ARCHIVE_SIZE)
+git_mirror = None
+
+if CHECKOUT_MODE == "mirror":
+    logger.debug(f"Updating git mirror of {REPO}...")
+    git_mirror = GitMirror(REPO, PROJECT_URL, MIRRORS_DIRECTORY)
+    git_mirror.update()
+
+incremental_workspace = None
+
+if INCREMENTAL_BUILDS and git_mirror is None:
+    incremental_workspace = IncrementalWorkspace(build_output_directories, build_files)
+
+if MAVEN_REPOSITORY is not None and "mvn" in build_command:
+    prefetch_dependencies(
+        select_dependency_prefetch_commits(prs, DEPENDENCY_PREFETCH_PRS),
+        os.path.join(WORKSPACES_DIRECTORY, "dependencies")
+    )
+
+# With prefetching, each worker may run a build and a scan at the same time, and with COMPILE_ALL_FIRST, several builds
+if COMPILE_ALL_FIRST:
+    jvms_per_worker = BUILD_PARALLELISM
+else:
+    jvms_per_worker = 2 if PREFETCH_LOOKAHEAD > 0 else 1
+workers_count = WORKERS if WORKERS is not None else get_workers_count(WORKER_CORES, WORKER_MEMORY * jvms_per_worker, RESERVED_MEMORY)
+logger.debug(f"Analyzing {len(prs)} PRs with {workers_count} worker(s)")
+
+failed_prs = run_workers(prs, workers_count)
+
+for retry in range(TRANSIENT_RETRIES):
+    if not failed_prs:
+        break
+
+    logger.debug(f"Resuming {len(failed_prs)} PR(s) that failed with a transient error (retry {retry + 1} of {TRANSIENT_RETRIES})...")
+    failed_prs = run_workers(failed_prs, min(workers_count, len(failed_prs)))
+
+if failed_prs:
+    logger.debug(f"PRs {', '.join(str(pr['pr_number']) for pr in failed_prs)} can be resumed in the next execution")
+
+if git_mirror is not None:
+    git_mirror.cleanup()
+
+if incremental_workspace is not None:
+    incremental_workspace.cleanup()
+
+if webhook_receiver is not None:
+    webhook_receiver.stop()
+
+for sonar_services in sonar_hosts_services:
+    sonar_services["project_manager"].close()
+
+    if ASYNC_SONAR_API:
+        sonar_services["api"].close()
+
+    if COLLECTION_BACKEND == "database":
+        sonar_services["collection_backend"].close()
@@ -2,6 +2,7 @@ import os
 import re
 import pandas as pd
 from commons.IOUtils import read_input_file
+from commons.PRIndex import PRIndex
 from commons.SonarQubeApi import SonarQubeApi
 from commons.SonarMetricsCollector import SonarMetricsCollector
 from typing import List, Dict
@@ -38,27 +39,6 @@ def parse_debt(debt_as_string: str) -> int:
     total_min = days * 8 * 60 + hours * 60 + minutes
     return total_min
 
-def prs_as_dict(prs: List[Dict]) -> dict:
-    """
-    Converts a list of pull requests (PRs) into a dictionary with PR numbers as keys.
-
-    This method converts a list of pull requests (PRs), represented as dictionaries,
-    into a dictionary where the keys are the PR numbers and the values are the corresponding PR dictionaries.
-
-    Args:
-        prs (List[Dict]): A list of pull requests, where each pull request is represented as a dictionary.
-
-    Returns:
-        dict: A dictionary where the keys are PR numbers and the values are the corresponding PR dictionaries.
-    """
-
-    prs_dict = {}
-
-    for pr in prs:
-        prs_dict[pr["pr_number"]] = pr
-
-    return prs_dict
-
 def process_issues(repo, pr, issues):
     """
     Process the issues for a given pull request (PR) in a repository.
@@ -133,12 +113,10 @@ OUTPUT_DIRECTORY = "./4-Post_Processing/4.1-Issues_Processing/Output"
 
 sonar_api = SonarQubeApi(True)
 metrics_collector = SonarMetricsCollector(sonar_api)
+prs_index = PRIndex(PRS_INPUT_DIRECTORY, lambda pr: pr["pr_number"])
 processed_issues = []
 
 for dirpath, dirnames, filenames in os.walk(ISSUES_INPUT_DIRECTORY):
-  
-  current_repo = ""
-  prs = {}
 
   for file in filenames:
     current_issues = read_input_file(f"{ISSUES_INPUT_DIRECTORY}/{file}")
@@ -150,12 +128,7 @@ for dirpath, dirnames, filenames in os.walk(ISSUES_INPUT_DIRECTORY):
 
     print(f"processing repo {repo} pr {pr_number}")
 
-    if repo != current_repo:
-        prs_list = read_input_file(f"{PRS_INPUT_DIRECTORY}/{repo}.json")
-        prs = prs_as_dict(prs_list)
-        current_repo = repo
-
-    current_processed_issues = process_issues(repo, prs[pr_number], current_issues)
+    current_processed_issues = process_issues(repo, prs_index.get(repo, pr_number), current_issues)
 
     processed_issues.extend(current_processed_issues)
 
@@ -0,0 +1,218 @@
+import os
+import sys
+from urllib.parse import urlparse
+from commons.IOUtils import read_input_file
+from commons.SonarIssuesCollector import SonarIssuesCollector
+from commons.SonarMetricsCollector import SonarMetricsCollector
+from commons.SonarQubeApi import SonarQubeApi
+from typing import Dict, List, Optional
+
+# The classes of Step 3 are imported from its directory, like the analysis script does
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "3-SonarQube_Execution"))
+from GitMirror import GitMirror
+
+class ReplayResponse:
+    """
+    A response of the SonarQube API replayed from the results recorded for a commit.
+
+    Attributes:
+        status_code (int): The HTTP status code of the response.
+        content (bytes): The body of the response, for error logs.
+        __data (dict): The JSON of the response.
+    """
+
+    def __init__(self, status_code: int, data: dict = None) -> None:
+        """
+        Initializes the ReplayResponse object.
+
+        Args:
+            status_code (int): The HTTP status code of the response.
+            data (dict, optional): The JSON of the response. Defaults to None.
+        """
+
+        self.status_code = status_code
+        self.content = b""
+        self.__data = data
+
+    def json(self) -> dict:
+        """
+        Retrieves the JSON of the response.
+
+        Returns:
+            dict: The JSON of the response.
+        """
+
+        return self.__data
+
+def replay_request(method: str, url: str, params: dict = None, **kwargs) -> ReplayResponse:
+    """
+    Answers the issues and metrics requests of the collectors with the results of the current commit.
+
+    Args:
+        method (str): The HTTP method of the request.
+        url (str): The URL of the request.
+        params (dict, optional): The parameters of the request. Defaults to None.
+
+    Returns:
+        ReplayResponse: The replayed response.
+    """
+
+    endpoint = urlparse(url).path
+
+    if endpoint.endswith("/measures/component"):
+        metrics = current_commit["metrics"].get(params["component"])
+
+        if metrics is None:
+            return ReplayResponse(404)
+
+        measures = [{"metric": metric, "value": value} for metric, value in metrics.items()]
+
+        return ReplayResponse(200, {"component": {"key": params["component"], "measures": measures}})
+
+    if endpoint.endswith("/issues/search"):
+        files = set(params["files"].split(","))
+        issues = [issue for issue in current_commit["issues"]["issues"] if issue["component"].split(":", 1)[-1] in files]
+        issues.sort(key=lambda issue: (issue["component"], issue.get("textRange", {}).get("startLine", 0)))
+
+        page_start = (params["p"] - 1) * params["ps"]
+
+        return ReplayResponse(200, {"issues": issues[page_start:page_start + params["ps"]], "total": len(issues)})
+
+    return ReplayResponse(404)
+
+def get_touched_files(previous_commit: Optional[dict], commit: dict, files: List[str]) -> Optional[List[str]]:
+    """
+    Retrieves the files touched between two recorded commits from the diff of the commits in the git mirror.
+
+    Args:
+        previous_commit (Optional[dict]): The recorded results of the previous commit or None.
+        commit (dict): The recorded results of the commit.
+        files (List[str]): The files tracked for the PR.
+
+    Returns:
+        Optional[List[str]]: The touched files, or None for the first commit.
+    """
+
+    if previous_commit is None:
+        return None
+
+    changed_files = set(git_mirror.get_changed_files(previous_commit["commit_sha"], commit["commit_sha"]))
+
+    return [file for file in files if file in changed_files]
+
+def benchmark_pr(pr: dict, commits: List[dict]) -> Dict[str, int]:
+    """
+    Collects the recorded results of the commits of a PR with and without delta collection and compares them.
+
+    The delta collection of the analysis script only applies to the metrics. The issues are also collected
+    with a delta here, without counting its requests, to measure how often the issues of untouched files
+    change (e.g. through cross-file type resolution), which would make carried forward issues stale.
+
+    Args:
+        pr (dict): The pull request, as in the input of Step 3.
+        commits (List[dict]): The recorded results of the commits of the PR.
+
+    Returns:
+        Dict[str, int]: The number of requests of each mode and the number of commits whose metrics or
+            issues collected with a delta differ from the recorded ones.
+    """
+
+    global current_commit
+
+    sonar_project = f"{REPO}-{pr['pr_number']}"
+    changed_files = pr["changed_files"]
+    moved_files = pr["moved_files"]
+    tracked_files = SonarMetricsCollector.get_moved_counterparts(changed_files, moved_files)
+
+    full_api = SonarQubeApi(False)
+    delta_api = SonarQubeApi(False)
+    issues_delta_api = SonarQubeApi(False)
+
+    previous_commit = None
+    metrics = None
+    issues = None
+    metrics_mismatches = 0
+    issues_mismatches = 0
+
+    for commit in commits:
+        # Carried over commits are not collected
+        if "carried_over_from" in commit:
+            continue
+
+        current_commit = commit
+
+        full_metrics = SonarMetricsCollector(full_api).get_metrics(sonar_project, changed_files, moved_files)
+        full_issues = SonarIssuesCollector(full_api).get_issues(sonar_project, changed_files)
+
+        touched_files = get_touched_files(previous_commit, commit, tracked_files)
+        metrics = SonarMetricsCollector(delta_api).get_metrics(sonar_project, changed_files, moved_files, touched_files, metrics)
+        SonarIssuesCollector(delta_api).get_issues(sonar_project, changed_files)
+        issues = SonarIssuesCollector(issues_delta_api).get_issues(sonar_project, changed_files, touched_files, issues)
+
+        if metrics != full_metrics:
+            metrics_mismatches += 1
+
+        if issues != full_issues:
+            issues_mismatches += 1
+
+        previous_commit = commit
+
+    return {
+        "full_requests": full_api.request_count,
+        "delta_requests": delta_api.request_count,
+        "metrics_mismatches": metrics_mismatches,
+        "issues_mismatches": issues_mismatches
+    }
+
+def benchmark_repo(repo: str) -> None:
+    """
+    Replays the issues files of a repository and prints the number of API requests of each collection mode.
+
+    Args:
+        repo (str): The name of the repository.
+
+    Returns:
+        None
+    """
+
+    prs = read_input_file(f"{INPUT_DIRECTORY}/{repo}.json")
+    totals = {"prs": 0, "full_requests": 0, "delta_requests": 0, "metrics_mismatches": 0, "issues_mismatches": 0}
+
+    for pr in prs:
+        issues_file = f"{OUTPUT_DIRECTORY}/issues_{repo}_{pr['pr_number']}.json"
+
+        if not os.path.exists(issues_file):
+            continue
+
+        pr_totals = benchmark_pr(pr, read_input_file(issues_file))
+        totals["prs"] += 1
+
+        for key, value in pr_totals.items():
+            totals[key] += value
+
+    print(f"Repo {repo}: {totals['prs']} PRs")
+    print(f"Requests with full collection: {totals['full_requests']}")
+    print(f"Requests with delta collection: {totals['delta_requests']}")
+
+    if totals["full_requests"] > 0:
+        print(f"Reduction: {1 - totals['delta_requests'] / totals['full_requests']:.1%}")
+
+    print(f"Commits whose metrics collected with a delta differ: {totals['metrics_mismatches']}")
+    print(f"Commits whose issues collected with a delta would differ: {totals['issues_mismatches']}")
+
+
+
+REPO = sys.argv[1] if len(sys.argv) > 1 else "commons-io" # name of the repository whose issues files are replayed
+INPUT_DIRECTORY = "2-PRs_Processing/2.5-Identify_Start_Commit/Output"
+OUTPUT_DIRECTORY = "3-SonarQube_Execution/Output"
+PROJECT_URL = f"https://www.github.com/apache/{REPO}"
+MIRRORS_DIRECTORY = "./3-SonarQube_Execution/mirrors" # the mirror of the analysis script is reused when it exists
+
+current_commit = None
+git_mirror = GitMirror(REPO, PROJECT_URL, MIRRORS_DIRECTORY)
+git_mirror.update()
+
+# The requests of the collectors are answered with the recorded results instead of reaching SonarQube
+sys.modules[SonarQubeApi.__module__].requests.request = replay_request
+
+benchmark_repo(REPO)
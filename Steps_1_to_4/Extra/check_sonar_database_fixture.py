@@ -0,0 +1,146 @@
+import os
+import sys
+import psycopg2
+from dotenv import load_dotenv
+from commons.SonarDatabaseCollector import SonarDatabaseCollector
+
+def load_fixture(database_url: str, schema: str) -> str:
+    """
+    Loads the fixture into a dedicated schema of a database, replacing the schema if it exists.
+
+    Args:
+        database_url (str): The URL of the database (e.g. "postgresql://localhost/sonar_fixture").
+        schema (str): The name of the schema where the tables of the fixture are created.
+
+    Returns:
+        str: The URL of the database with the schema as search path, for the collector.
+    """
+
+    with open(FIXTURE_FILE, "r") as f:
+        fixture = f.read()
+
+    connection = psycopg2.connect(database_url)
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+            cursor.execute(f"CREATE SCHEMA {schema}")
+            cursor.execute(f"SET search_path TO {schema}")
+            cursor.execute(fixture)
+
+        connection.commit()
+    finally:
+        connection.close()
+
+    separator = "&" if "?" in database_url else "?"
+
+    return f"{database_url}{separator}options=-csearch_path%3D{schema}"
+
+def drop_fixture(database_url: str, schema: str) -> None:
+    """
+    Removes the schema of the fixture from a database.
+
+    Args:
+        database_url (str): The URL of the database.
+        schema (str): The name of the schema where the tables of the fixture were created.
+
+    Returns:
+        None
+    """
+
+    connection = psycopg2.connect(database_url)
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+
+        connection.commit()
+    finally:
+        connection.close()
+
+def check_fixture(database_url: str) -> None:
+    """
+    Collects the issues and metrics of the fixture and checks them against the results documented in the fixture.
+
+    Args:
+        database_url (str): The URL of the database, with the schema of the fixture as search path.
+
+    Returns:
+        None
+
+    Raises:
+        AssertionError: If the issues or the metrics differ from the expected ones.
+    """
+
+    collector = SonarDatabaseCollector(False, 1, database_url)
+
+    try:
+        issues = collector.get_issues_for_files(PROJECT, FILES)
+        metrics = collector.get_metrics_for_files(PROJECT, FILES)
+    finally:
+        collector.close()
+
+    assert issues == EXPECTED_ISSUES, f"Unexpected issues: {issues}"
+    print("get_issues_for_files: OK")
+
+    assert metrics == EXPECTED_METRICS, f"Unexpected metrics: {metrics}"
+    print("get_metrics_for_files: OK")
+
+
+
+load_dotenv()
+
+DATABASE_URL = sys.argv[1] if len(sys.argv) > 1 else os.getenv("SONAR_DB_URL") # URL of a local database, never the one of a SonarQube instance
+FIXTURE_SCHEMA = "sonar_fixture_check" # schema created, and removed afterwards, for the tables of the fixture
+FIXTURE_FILE = "Extra/sonar_database_fixture.sql"
+PROJECT = "fixture-1"
+FILES = ["src/A.java", "src/B.java", "src/Deleted.java"]
+
+# The results documented at the top of the fixture
+EXPECTED_ISSUES = {
+    "issues": [
+        {
+            "key": "AX-1",
+            "rule": "java:S3776",
+            "severity": "CRITICAL",
+            "component": "fixture-1:src/A.java",
+            "status": "OPEN",
+            "debt": "6min",
+            "type": "CODE_SMELL",
+            "textRange": {"startLine": 3, "endLine": 3, "startOffset": 0, "endOffset": 10}
+        },
+        {
+            "key": "AX-2",
+            "rule": "java:S1192",
+            "severity": "CRITICAL",
+            "component": "fixture-1:src/A.java",
+            "status": "OPEN",
+            "debt": "1h38min",
+            "type": "CODE_SMELL",
+            "textRange": {"startLine": 12, "endLine": 14, "startOffset": 4, "endOffset": 180}
+        },
+        {
+            "key": "AX-3",
+            "rule": "java:S1192",
+            "severity": "MAJOR",
+            "component": "fixture-1:src/B.java",
+            "status": "CLOSED",
+            "type": "BUG"
+        }
+    ],
+    "total": 3
+}
+EXPECTED_METRICS = {
+    "fixture-1:src/A.java": {"ncloc": "84", "complexity": "7"},
+    "fixture-1:src/B.java": {"ncloc": "10", "complexity": None}
+}
+
+if not DATABASE_URL:
+    raise RuntimeError("The URL of the fixture database is neither given as argument nor set in SONAR_DB_URL")
+
+fixture_url = load_fixture(DATABASE_URL, FIXTURE_SCHEMA)
+
+try:
+    check_fixture(fixture_url)
+finally:
+    drop_fixture(DATABASE_URL, FIXTURE_SCHEMA)
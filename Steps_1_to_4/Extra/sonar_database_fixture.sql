@@ -0,0 +1,91 @@
+-- Fixture for commons/SonarDatabaseCollector.py: the subset of the SonarQube 10.0 schema it reads, with the
+-- results of one analysis of the project "fixture-1". Load it in an empty local database, e.g.:
+--
+--   createdb sonar_fixture && psql sonar_fixture -f Extra/sonar_database_fixture.sql
+--
+-- and set SONAR_DB_URL=postgresql://localhost/sonar_fixture, or run Extra/check_sonar_database_fixture.py with that
+-- URL, which loads it in a schema of its own and asserts the results below. For the files "src/A.java", "src/B.java" and
+-- "src/Deleted.java", the collector must return:
+--
+--   get_issues_for_files: issues AX-1 (src/A.java, line 3), AX-2 (src/A.java, line 12) and AX-3 (src/B.java,
+--     without text range nor debt), in this order, with a total of 3. AX-4 (a security hotspot), AX-5
+--     (a rule of another language) and AX-6 (another project) are not returned.
+--   get_metrics_for_files: {"fixture-1:src/A.java": {"ncloc": "84", "complexity": "7"},
+--     "fixture-1:src/B.java": {"ncloc": "10", "complexity": None}}
+
+CREATE TABLE components (
+    uuid VARCHAR(50) PRIMARY KEY,
+    kee VARCHAR(1000),
+    branch_uuid VARCHAR(50) NOT NULL,
+    qualifier VARCHAR(10),
+    path VARCHAR(2000),
+    enabled BOOLEAN NOT NULL DEFAULT TRUE
+);
+
+CREATE TABLE rules (
+    uuid VARCHAR(40) PRIMARY KEY,
+    plugin_name VARCHAR(255) NOT NULL,
+    plugin_rule_key VARCHAR(200) NOT NULL,
+    language VARCHAR(20)
+);
+
+CREATE TABLE issues (
+    kee VARCHAR(50) PRIMARY KEY,
+    rule_uuid VARCHAR(40),
+    severity VARCHAR(10),
+    component_uuid VARCHAR(50),
+    project_uuid VARCHAR(50),
+    status VARCHAR(20),
+    effort BIGINT,
+    issue_type SMALLINT,
+    locations BYTEA
+);
+
+CREATE TABLE metrics (
+    uuid VARCHAR(40) PRIMARY KEY,
+    name VARCHAR(64) NOT NULL
+);
+
+CREATE TABLE live_measures (
+    uuid VARCHAR(40) PRIMARY KEY,
+    project_uuid VARCHAR(50) NOT NULL,
+    component_uuid VARCHAR(50) NOT NULL,
+    metric_uuid VARCHAR(40) NOT NULL,
+    value DOUBLE PRECISION
+);
+
+INSERT INTO components (uuid, kee, branch_uuid, qualifier, path, enabled) VALUES
+    ('p1', 'fixture-1', 'p1', 'TRK', NULL, TRUE),
+    ('p1-a', 'fixture-1:src/A.java', 'p1', 'FIL', 'src/A.java', TRUE),
+    ('p1-b', 'fixture-1:src/B.java', 'p1', 'FIL', 'src/B.java', TRUE),
+    ('p1-deleted', 'fixture-1:src/Deleted.java', 'p1', 'FIL', 'src/Deleted.java', FALSE),
+    ('p2', 'fixture-2', 'p2', 'TRK', NULL, TRUE),
+    ('p2-a', 'fixture-2:src/A.java', 'p2', 'FIL', 'src/A.java', TRUE);
+
+INSERT INTO rules (uuid, plugin_name, plugin_rule_key, language) VALUES
+    ('r1', 'java', 'S3776', 'java'),
+    ('r2', 'java', 'S1192', 'java'),
+    ('r3', 'javasecurity', 'S2076', 'java'),
+    ('r4', 'xml', 'S125', 'xml');
+
+-- The locations are serialized DbIssues.Locations messages holding a text range
+INSERT INTO issues (kee, rule_uuid, severity, component_uuid, project_uuid, status, effort, issue_type, locations) VALUES
+    ('AX-2', 'r2', 'CRITICAL', 'p1-a', 'p1', 'OPEN', 98, 1, '\x0a09080c100e180420b401'),
+    ('AX-1', 'r1', 'CRITICAL', 'p1-a', 'p1', 'OPEN', 6, 1, '\x0a08080310031800200a'),
+    ('AX-3', 'r2', 'MAJOR', 'p1-b', 'p1', 'CLOSED', NULL, 2, NULL),
+    ('AX-4', 'r3', 'MAJOR', 'p1-b', 'p1', 'TO_REVIEW', 30, 4, NULL),
+    ('AX-5', 'r4', 'MINOR', 'p1-b', 'p1', 'OPEN', 5, 1, NULL),
+    ('AX-6', 'r1', 'CRITICAL', 'p2-a', 'p2', 'OPEN', 6, 1, '\x0a0a08ec0110ec0118182022');
+
+INSERT INTO metrics (uuid, name) VALUES
+    ('m1', 'ncloc'),
+    ('m2', 'complexity'),
+    ('m3', 'lines');
+
+INSERT INTO live_measures (uuid, project_uuid, component_uuid, metric_uuid, value) VALUES
+    ('lm1', 'p1', 'p1-a', 'm1', 84),
+    ('lm2', 'p1', 'p1-a', 'm2', 7),
+    ('lm3', 'p1', 'p1-a', 'm3', 120),
+    ('lm4', 'p1', 'p1-b', 'm1', 10),
+    ('lm5', 'p1', 'p1-deleted', 'm1', 50),
+    ('lm6', 'p2', 'p2-a', 'm1', 1);
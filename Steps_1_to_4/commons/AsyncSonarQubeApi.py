@@ -0,0 +1,580 @@
+import aiohttp
+import asyncio
+import os
+import logging
+from dotenv import load_dotenv
+from typing import List, Optional, Tuple
+from commons.SonarQubeApi import SonarQubeApi
+from commons.SonarQubeApiError import SonarQubeApiError
+
+class AsyncSonarQubeApi:
+    """
+    An asyncio-based interface to interact with the SonarQube API, with the same methods as SonarQubeApi.
+
+    All requests share one HTTP session, whose connections are reused and limited to `max_connections` per
+    host, so the pages and files of a retrieval can be requested all at once: requests beyond the limit wait
+    for a free connection. The session must be created and used in the same event loop, and closed with `close`.
+
+    Attributes:
+        base_url (str): The base URL of the SonarQube API.
+        with_logging (bool): A flag indicating whether logging is enabled.
+        max_connections (int): The maximum number of connections open at once to the SonarQube host.
+        request_count (int): The number of requests made to the SonarQube API so far.
+        __token (str): The user token for authentication with the SonarQube API.
+        __session (aiohttp.ClientSession): The HTTP session, created on the first request.
+        __log_file (str): The path to the log file.
+        __logger (logging.Logger): The logger object for logging SonarQube API interactions.
+    """
+
+    def __init__(self, with_logging: bool, max_connections: int = 8, host: str = None, token: str = None) -> None:
+        """
+        Initializes the AsyncSonarQubeApi object, loading the host and user token from a .env file unless they are given.
+
+        Args:
+            with_logging (bool): A flag indicating whether logging is enabled or not.
+            max_connections (int, optional): The maximum number of connections open at once to the SonarQube host.
+                Defaults to 8.
+            host (str, optional): The URL of the SonarQube host. Defaults to the SONAR_HOST environment variable.
+            token (str, optional): The user token of the SonarQube host. Defaults to the SONAR_TOKEN environment variable.
+        """
+
+        load_dotenv()
+        self.__token = token or os.getenv("SONAR_TOKEN")
+        self.base_url = f"{host or os.getenv('SONAR_HOST')}/api"
+        self.__log_file = "./3-SonarQube_Execution/logs/sonarqube.log"
+        self.with_logging = with_logging
+        self.max_connections = max_connections
+        self.request_count = 0
+        self.__session = None
+        self.__logger = self.__setup_logger()
+
+    def __setup_logger(self) -> logging.Logger:
+        """
+        Sets up the logger for the AsyncSonarQubeApi object.
+
+        Returns:
+            logging.Logger: The logger object configured for logging SonarQube API interactions.
+        """
+
+        logger = logging.getLogger(__name__)
+        logger.setLevel(logging.DEBUG if self.with_logging else logging.NOTSET)
+
+        # The clients of all SonarQube hosts share the logger of the module
+        if not logger.handlers:
+            file_handler = logging.FileHandler(self.__log_file)
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            file_handler.setFormatter(formatter)
+            logger.addHandler(file_handler)
+
+        return logger
+
+    async def close(self) -> None:
+        """
+        Closes the HTTP session and its connections.
+        """
+
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def _make_request(self, method: str, url: str, params: dict = None) -> Tuple[int, Optional[dict], bytes]:
+        """
+        Makes a request to the SonarQube API.
+
+        Args:
+            method (str): The HTTP method to use for the request (e.g., 'GET', 'POST', 'PUT', 'DELETE').
+            url (str): The URL to make the request to.
+            params (dict, optional): The parameters of the query string. Defaults to None.
+
+        Returns:
+            Tuple[int, Optional[dict], bytes]: The status code, the JSON (or None if the body is not JSON)
+                and the body of the response.
+        """
+
+        if self.__session is None:
+            self.__session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=0, limit_per_host=self.max_connections),
+                headers={'Authorization': f'Bearer {self.__token}'}
+            )
+
+        # aiohttp only accepts strings and numbers in the query string
+        params = {key: str(value) for key, value in (params or {}).items() if value is not None}
+
+        self.request_count += 1
+
+        async with self.__session.request(method, url, params=params) as response:
+            content = await response.read()
+
+            try:
+                data = await response.json(content_type=None)
+            except ValueError:
+                data = None
+
+            return response.status, data, content
+
+    async def _make_request_and_check_status(self, method: str, url: str, params: dict = None) -> Optional[dict]:
+        """
+        Makes a request to the SonarQube API and checks that it succeeded.
+
+        Args:
+            method (str): The HTTP method to use for the request (e.g., 'GET', 'POST', 'PUT', 'DELETE').
+            url (str): The URL to make the request to.
+            params (dict, optional): The parameters of the query string. Defaults to None.
+
+        Returns:
+            Optional[dict]: The JSON response from the SonarQube API, or None if the response has no body.
+
+        Raises:
+            SonarQubeApiError: If the response status code is not 2xx.
+        """
+
+        status_code, data, content = await self._make_request(method, url, params)
+
+        if status_code // 100 != 2:
+            error = SonarQubeApiError(status_code)
+            self.__logger.debug(str(error))
+            self.__logger.debug(str(content))
+            raise error
+
+        return data
+
+    async def _make_request_and_get_json(self, method: str, url: str, params: dict = None) -> dict:
+        """
+        Makes a request to the SonarQube API and returns the JSON response.
+
+        Args:
+            method (str): The HTTP method to use for the request (e.g., 'GET', 'POST', 'PUT', 'DELETE').
+            url (str): The URL to make the request to.
+            params (dict, optional): The parameters of the query string. Defaults to None.
+
+        Returns:
+            dict: The JSON response from the SonarQube API.
+
+        Raises:
+            SonarQubeApiError: If the response status code is not 2xx.
+        """
+
+        return await self._make_request_and_check_status(method, url, params)
+
+    async def check_project_already_exists(self, component: str) -> bool:
+        """
+        Checks if a project with the given component key already exists in SonarQube.
+
+        Args:
+            component (str): The component key of the project to check.
+
+        Returns:
+            bool: True if the project exists, False otherwise.
+        """
+
+        endpoint = f"{self.base_url}/components/show"
+
+        status_code, _, _ = await self._make_request("GET", endpoint, params={"component": component})
+
+        return status_code == 200
+
+    async def create_project(self, name: str, project: str, check_existence: bool = True) -> None:
+        """
+        Creates a new project in SonarQube with the given name and project key if it doesn't already exist.
+
+        Args:
+            name (str): The name of the project to create.
+            project (str): The project key of the project to create.
+            check_existence (bool, optional): Whether to check first if the project exists, which the caller may
+                already know from `search_existing_projects`. Defaults to True.
+        """
+
+        if check_existence and await self.check_project_already_exists(project):
+            self.__logger.debug("Sonar project already exists")
+            return
+
+        endpoint = f"{self.base_url}/projects/create"
+
+        querystring = {
+            "name": name,
+            "project": project,
+        }
+
+        await self._make_request_and_get_json("POST", endpoint, params=querystring)
+
+    async def search_existing_projects(self, projects: List[str], page_size: int = 100) -> List[str]:
+        """
+        Checks which of the given projects exist in SonarQube, with one request per page of projects, all at once.
+
+        Args:
+            projects (List[str]): The project keys to check.
+            page_size (int, optional): The number of projects checked per request (at most 500). Defaults to 100.
+
+        Returns:
+            List[str]: The keys of the projects that exist.
+        """
+
+        endpoint = f"{self.base_url}/projects/search"
+
+        pages = await asyncio.gather(*(
+            self._make_request_and_get_json(
+                "GET",
+                endpoint,
+                params={"projects": ",".join(projects[k:k + page_size]), "ps": page_size}
+            )
+            for k in range(0, len(projects), page_size)
+        ))
+
+        return [component["key"] for data in pages for component in data["components"]]
+
+    async def create_analysis_token(self, name: str, projectKey: str) -> str:
+        """
+        Creates an analysis token for the specified project in SonarQube.
+
+        Args:
+            name (str): The name of the analysis token.
+            projectKey (str): The project key for which the analysis token is created.
+
+        Returns:
+            str: The generated analysis token.
+        """
+
+        self.__logger.debug(f"Creating analysis token for: {name}")
+        endpoint = f"{self.base_url}/user_tokens/generate"
+
+        querystring = {
+            "name": name,
+            "projectKey": projectKey,
+            "type": "PROJECT_ANALYSIS_TOKEN",
+        }
+
+        data = await self._make_request_and_get_json("POST", endpoint, params=querystring)
+
+        return data["token"]
+
+    async def get_project_total_analyses(self, project: str) -> int:
+        """
+        Retrieves the total number of analyses for a specified project in SonarQube.
+
+        Args:
+            project (str): The project key for which to retrieve the total number of analyses.
+
+        Returns:
+            int: The total number of analyses for the specified project.
+        """
+
+        endpoint = f"{self.base_url}/project_analyses/search"
+
+        data = await self._make_request_and_get_json("GET", endpoint, params={"project": project})
+
+        return data["paging"]["total"]
+
+    async def get_total_analyses_by_ce_activity(self, project: str) -> int:
+        """
+        Retrieves the total number of analyses for a specified project in SonarQube, using the /ce/activity endpoint.
+
+        Args:
+            project (str): The project key for which to retrieve the total number of analyses.
+
+        Returns:
+            int: The total number of analyses for the specified project.
+        """
+
+        endpoint = f"{self.base_url}/ce/activity"
+
+        data = await self._make_request_and_get_json("GET", endpoint, params={"component": project})
+
+        return data["paging"]["total"]
+
+    async def get_ce_task(self, task_id: str) -> dict:
+        """
+        Retrieves a background (Compute Engine) task from SonarQube, such as the processing of an analysis report.
+
+        Args:
+            task_id (str): The ID of the task.
+
+        Returns:
+            dict: The task, with its status (PENDING, IN_PROGRESS, SUCCESS, FAILED or CANCELED).
+        """
+
+        endpoint = f"{self.base_url}/ce/task"
+
+        data = await self._make_request_and_get_json("GET", endpoint, params={"id": task_id})
+
+        return data["task"]
+
+    async def create_webhook(self, name: str, project: str, url: str, secret: str = None) -> None:
+        """
+        Creates a webhook in a project, called when the report of each analysis is processed, unless the
+        project already has a webhook with the same URL.
+
+        Args:
+            name (str): The name of the webhook.
+            project (str): The project key of the project.
+            url (str): The URL the webhook posts to.
+            secret (str, optional): The secret used to sign the deliveries. Defaults to None.
+        """
+
+        endpoint = f"{self.base_url}/webhooks/list"
+
+        data = await self._make_request_and_get_json("GET", endpoint, params={"project": project})
+
+        if any(webhook["url"] == url for webhook in data["webhooks"]):
+            self.__logger.debug("Webhook already exists")
+            return
+
+        endpoint = f"{self.base_url}/webhooks/create"
+
+        querystring = {
+            "name": name,
+            "project": project,
+            "url": url,
+            "secret": secret
+        }
+
+        await self._make_request_and_get_json("POST", endpoint, params=querystring)
+
+    async def delete_project(self, project: str) -> None:
+        """
+        Deletes a project from SonarQube.
+
+        Args:
+            project (str): The project key of the project to delete.
+
+        Raises:
+            SonarQubeApiError: If the response status code is not 2xx.
+        """
+
+        endpoint = f"{self.base_url}/projects/delete"
+
+        # The endpoint answers 204 No Content
+        await self._make_request_and_check_status("POST", endpoint, params={"project": project})
+
+    async def bulk_delete_projects(self, projects: List[str]) -> None:
+        """
+        Deletes several projects from SonarQube with a single request.
+
+        Args:
+            projects (List[str]): The project keys of the projects to delete.
+
+        Raises:
+            SonarQubeApiError: If the response status code is not 2xx.
+        """
+
+        endpoint = f"{self.base_url}/projects/bulk_delete"
+
+        # The endpoint answers 204 No Content
+        await self._make_request_and_check_status("POST", endpoint, params={"projects": ",".join(projects)})
+
+    async def get_issues(self, component: str, page: int, page_size: int, files: str, filters: dict = None) -> dict:
+        """
+        Retrieves issues from SonarQube for a specified component.
+
+        Args:
+            component (str): The component key for which to retrieve issues.
+            page (int): The page number of the results.
+            page_size (int): The number of issues per page.
+            files (str): Comma-separated list of files to filter issues by.
+            filters (dict, optional): Additional parameters of the search (e.g. types, rules or facets). Defaults to None.
+
+        Returns:
+            dict: A dictionary containing the JSON of retrieved issues.
+        """
+
+        endpoint = f"{self.base_url}/issues/search"
+
+        querystring = {
+            "componentKeys": component,
+            "languages": "java",
+            "p": page,
+            "ps": page_size,
+            "files": files,
+            "s": "FILE_LINE"
+        }
+
+        querystring.update(filters or {})
+
+        return await self._make_request_and_get_json("GET", endpoint, params=querystring)
+
+    async def __split_issues_search(self, component: str, files: List[str], filters: dict, total: int) -> List[Tuple[List[str], dict]]:
+        """
+        Splits a search with more issues than SonarQube returns (see `SonarQubeApi.split_issues_search`),
+        running the queries the split needs at once.
+
+        Args:
+            component (str): The component key for which to retrieve issues.
+            files (List[str]): The files of the search.
+            filters (dict): The additional filters of the search.
+            total (int): The number of issues of the search.
+
+        Returns:
+            List[Tuple[List[str], dict]]: The files and filters of each new search.
+
+        Raises:
+            RuntimeError: If the search cannot be split anymore.
+        """
+
+        responses = []
+
+        while True:
+            new_searches, queries = SonarQubeApi.split_issues_search(files, filters, total, responses)
+
+            if not queries:
+                return new_searches
+
+            responses += await asyncio.gather(*[self.get_issues(component, 1, 1, ",".join(files), query) for query in queries])
+
+    async def __get_search_issues(self, component: str, files: List[str], filters: dict) -> List[dict]:
+        """
+        Retrieves every issue of a search, splitting it when it has more issues than SonarQube returns.
+
+        Args:
+            component (str): The component key for which to retrieve issues.
+            files (List[str]): The files of the search.
+            filters (dict): The additional filters of the search.
+
+        Returns:
+            List[dict]: The issues of the search.
+
+        Raises:
+            RuntimeError: If the search has more issues than SonarQube returns and cannot be split.
+        """
+
+        page_size = SonarQubeApi.ISSUES_PAGE_SIZE
+        max_results = SonarQubeApi.ISSUES_MAX_RESULTS
+
+        first_page = await self.get_issues(component, 1, page_size, ",".join(files), filters)
+        total = first_page["total"]
+
+        if total > max_results:
+            new_searches = await self.__split_issues_search(component, files, filters, total)
+
+            searches_issues = await asyncio.gather(*[
+                self.__get_search_issues(component, search_files, search_filters)
+                for search_files, search_filters in new_searches
+            ])
+
+            return [issue for search_issues in searches_issues for issue in search_issues]
+
+        self.__logger.debug(f"total issues {total} for {len(files)} file(s) with {filters}")
+
+        remaining_pages = await asyncio.gather(*[
+            self.get_issues(component, page, page_size, ",".join(files), filters)
+            for page in range(2, SonarQubeApi.get_issues_pages_count(total) + 1)
+        ])
+
+        return first_page["issues"] + [issue for page_data in remaining_pages for issue in page_data["issues"]]
+
+    async def get_issues_for_files(self, component: str, files: List[str], max_files_length: int = 4000) -> dict:
+        """
+        Retrieves all issues for each file in a specified component from SonarQube.
+
+        The files are requested in groups, whose list fits in the URL, and all groups and pages are requested
+        at once. Searches with more than 10,000 issues are split as in SonarQubeApi.
+
+        Args:
+            component (str): The component key for which to retrieve issues.
+            files (List[str]): A list of file paths.
+            max_files_length (int, optional): The maximum length of the encoded list of files of each request.
+                Defaults to 4000.
+
+        Returns:
+            dict: A dictionary containing all retrieved issues for the specified files, in the order of the files.
+        """
+
+        batches_issues = await asyncio.gather(*[
+            self.__get_search_issues(component, batch, {})
+            for batch in SonarQubeApi.batch_files(files, max_files_length)
+        ])
+
+        return SonarQubeApi.build_issues_result([issue for batch_issues in batches_issues for issue in batch_issues], files)
+
+    async def get_metrics(self, project: str) -> dict:
+        """
+        Retrieves metrics for each class within a specified project from SonarQube.
+
+        The first page is requested alone, to know the number of pages, and the others all at once.
+
+        Args:
+            project (str): The component key of the project for which to retrieve metrics.
+
+        Returns:
+            dict: A dictionary containing the retrieved metrics for each class in the project.
+                The keys are the paths of the classes, and the values are dictionaries with
+                'ncloc' and 'complexity' metrics for each class.
+        """
+
+        endpoint = f"{self.base_url}/measures/component_tree"
+        page_size = 500
+
+        get_page = lambda page: self._make_request_and_get_json("GET", endpoint, params={
+            "component": project,
+            "metricKeys": "ncloc,complexity",
+            "p": page,
+            "ps": page_size
+        })
+
+        first_page = await get_page(1)
+        total_pages = -(-first_page["paging"]["total"] // page_size)
+        remaining_pages = await asyncio.gather(*[get_page(page) for page in range(2, total_pages + 1)])
+
+        metrics = {}
+
+        for data in [first_page] + list(remaining_pages):
+            for component in data["components"]:
+                metrics[component["key"]] = SonarQubeApi.get_metric_values(component["measures"])
+
+        return metrics
+
+    async def __get_component_metrics(self, component: str) -> Optional[dict]:
+        """
+        Retrieves the ncloc and complexity metrics of a single component from SonarQube.
+
+        Args:
+            component (str): The key of the component (e.g. "project:path/to/File.java").
+
+        Returns:
+            Optional[dict]: A dictionary with the 'ncloc' and 'complexity' metrics, or None if the component
+                does not exist in the last analysis (e.g. a deleted file).
+
+        Raises:
+            SonarQubeApiError: If the response status code is neither 2xx nor 404.
+        """
+
+        endpoint = f"{self.base_url}/measures/component"
+
+        querystring = {
+            "component": component,
+            "metricKeys": "ncloc,complexity"
+        }
+
+        status_code, data, content = await self._make_request("GET", endpoint, params=querystring)
+
+        if status_code == 404:
+            return None
+
+        if status_code // 100 != 2:
+            error = SonarQubeApiError(status_code)
+            self.__logger.debug(str(error))
+            self.__logger.debug(str(content))
+            raise error
+
+        return SonarQubeApi.get_metric_values(data["component"]["measures"])
+
+    async def get_metrics_for_files(self, project: str, files: List[str]) -> dict:
+        """
+        Retrieves metrics for the given files of a project from SonarQube, all requested at once.
+
+        Args:
+            project (str): The component key of the project for which to retrieve metrics.
+            files (List[str]): A list of file paths.
+
+        Returns:
+            dict: A dictionary containing the retrieved metrics for each file that exists in the project.
+                The keys are the component keys of the files, and the values are dictionaries with
+                'ncloc' and 'complexity' metrics for each file.
+        """
+
+        components = list(dict.fromkeys(f"{project}:{file}" for file in files))
+        component_metrics = await asyncio.gather(*[self.__get_component_metrics(component) for component in components])
+
+        return {
+            component: metrics
+            for component, metrics in zip(components, component_metrics)
+            if metrics is not None
+        }
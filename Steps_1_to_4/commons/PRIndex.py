@@ -0,0 +1,142 @@
+import json
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+class PRIndex:
+    """
+    A class for looking up pull requests (PRs) stored in per-repo JSON files.
+
+    The first lookup in a repo file scans it once and keeps only the byte offset and length of each PR,
+    indexed by its key. PRs are then decoded on demand and kept in a bounded LRU cache, so lookups do not
+    depend on the order in which repos are visited.
+
+    Attributes:
+        input_directory (str): The directory containing the JSON files with PRs, one file per repo.
+        cache_size (int): The maximum number of decoded PRs kept in memory.
+        __key_function (Callable[[dict], int]): A function that returns the key (PR number) of a PR.
+        __indexes (Dict[str, Dict[int, Tuple[int, int]]]): The offset index of each repo file already scanned.
+        __cache (OrderedDict): The LRU cache of decoded PRs, keyed by (repo, PR number).
+    """
+
+    def __init__(self, input_directory: str, key_function: Callable[[dict], int], cache_size: int = 256) -> None:
+        """
+        Initializes the PRIndex object.
+
+        Args:
+            input_directory (str): The directory containing the JSON files with PRs, one file per repo.
+            key_function (Callable[[dict], int]): A function that returns the key (PR number) of a PR.
+            cache_size (int, optional): The maximum number of decoded PRs kept in memory. Defaults to 256.
+        """
+
+        self.input_directory = input_directory
+        self.cache_size = cache_size
+        self.__key_function = key_function
+        self.__indexes = {}
+        self.__cache = OrderedDict()
+
+    def __get_repo_file(self, repo: str) -> str:
+        """
+        Returns the path of the JSON file with the PRs of a repo.
+
+        Args:
+            repo (str): The name of the repository.
+
+        Returns:
+            str: The path to the repo file.
+        """
+
+        return os.path.join(self.input_directory, f"{repo}.json")
+
+    def __build_index(self, repo: str) -> Dict[int, Tuple[int, int]]:
+        """
+        Scans a repo file once and records the byte offset and length of each PR in the top-level list.
+
+        Args:
+            repo (str): The name of the repository.
+
+        Returns:
+            Dict[int, Tuple[int, int]]: A dictionary where the keys are PR numbers and the values are
+                (offset, length) pairs in bytes.
+        """
+
+        with open(self.__get_repo_file(repo), "r") as f:
+            content = f.read()
+
+        decoder = json.JSONDecoder()
+        index = {}
+
+        position = content.index("[") + 1
+        byte_position = len(content[:position].encode())
+
+        while True:
+            # Skips whitespaces and separators between PRs
+            next_position = position
+            while content[next_position] in " \t\r\n,":
+                next_position += 1
+
+            byte_position += next_position - position
+            position = next_position
+
+            if content[position] == "]":
+                break
+
+            pr, end_position = decoder.raw_decode(content, position)
+            length = len(content[position:end_position].encode())
+
+            index[self.__key_function(pr)] = (byte_position, length)
+
+            byte_position += length
+            position = end_position
+
+        return index
+
+    def __get_index(self, repo: str) -> Dict[int, Tuple[int, int]]:
+        """
+        Returns the offset index of a repo file, building it on the first call.
+
+        Args:
+            repo (str): The name of the repository.
+
+        Returns:
+            Dict[int, Tuple[int, int]]: The offset index of the repo file.
+        """
+
+        if repo not in self.__indexes:
+            self.__indexes[repo] = self.__build_index(repo)
+
+        return self.__indexes[repo]
+
+    def get(self, repo: str, pr_number: int) -> dict:
+        """
+        Retrieves a PR of a repo by its number.
+
+        Args:
+            repo (str): The name of the repository.
+            pr_number (int): The number of the pull request.
+
+        Returns:
+            dict: The pull request represented as a dictionary.
+
+        Raises:
+            KeyError: If the PR is not in the repo file.
+        """
+
+        cache_key = (repo, pr_number)
+
+        if cache_key in self.__cache:
+            self.__cache.move_to_end(cache_key)
+            return self.__cache[cache_key]
+
+        offset, length = self.__get_index(repo)[pr_number]
+
+        with open(self.__get_repo_file(repo), "rb") as f:
+            f.seek(offset)
+            pr = json.loads(f.read(length))
+
+        self.__cache[cache_key] = pr
+
+        if len(self.__cache) > self.cache_size:
+            self.__cache.popitem(last=False)
+
+        return pr
@@ -0,0 +1,72 @@
+from typing import List
+from commons import SonarQubeApi
+
+class SonarIssuesCollector:
+    """
+    A class for collecting issues from SonarQube for files in a pull request.
+    """
+
+    def __init__(self, sonar_api: SonarQubeApi) -> None:
+        """
+        Initializes a SonarIssuesCollector instance.
+
+        Args:
+            sonar_api (SonarQubeApi): An instance of the SonarQubeApi class for interacting with the SonarQube API.
+        """
+
+        self.__sonar_api = sonar_api
+
+    def get_issues(
+        self,
+        component: str,
+        changed_files: List[str],
+        touched_files: List[str] = None,
+        previous_issues: dict = None
+    ) -> dict:
+        """
+        Retrieves the issues of the changed files of a pull request (PR) for a given SonarQube component.
+
+        When the issues of a previous commit are given, only the issues of the files touched since that commit
+        are retrieved, and the issues of the other files are carried forward from the previous commit. The
+        result has the same structure and order as a full retrieval.
+
+        Args:
+            component (str): The SonarQube component for which issues are to be retrieved.
+            changed_files (List[str]): The list of modified files in the PR.
+            touched_files (List[str], optional): The files touched since the previous commit. Defaults to None.
+            previous_issues (dict, optional): The issues returned for the previous commit. Defaults to None.
+
+        Returns:
+            dict: A dictionary containing the issues of the changed files and their total.
+        """
+
+        if previous_issues is None or touched_files is None:
+            return self.__sonar_api.get_issues_for_files(component, changed_files)
+
+        touched_files_set = set(touched_files)
+        touched_changed_files = [file for file in changed_files if file in touched_files_set]
+
+        carried_issues = [
+            issue for issue in previous_issues["issues"]
+            if issue["component"].split(":", 1)[-1] not in touched_files_set
+        ]
+
+        if touched_changed_files:
+            touched_issues = self.__sonar_api.get_issues_for_files(component, touched_changed_files)["issues"]
+        else:
+            touched_issues = []
+
+        # Keeps the order of a full retrieval: by file, then by line
+        file_positions = {file: position for position, file in enumerate(changed_files)}
+        merged_issues = sorted(
+            carried_issues + touched_issues,
+            key=lambda issue: (
+                file_positions.get(issue["component"].split(":", 1)[-1], len(changed_files)),
+                issue.get("textRange", {}).get("startLine", 0)
+            )
+        )
+
+        return {
+            "issues": merged_issues,
+            "total": len(merged_issues)
+        }
@@ -16,7 +16,44 @@ class SonarMetricsCollector:
 
         self.__sonar_api = sonar_api
 
-    def get_metrics(self, component: str, changed_files: List[str], moved_files: List[Dict]) -> dict:
+    @staticmethod
+    def get_moved_counterparts(files: List[str], moved_files: List[Dict]) -> List[str]:
+        """
+        Adds the other name of every moved file of a list, as the results of both names are linked.
+
+        Args:
+            files (List[str]): The list of files.
+            moved_files (List[Dict]): The list of moved files dicts.
+
+        Returns:
+            List[str]: The files and the other names of the moved ones, without duplicates.
+        """
+
+        files = list(files)
+        files_set = set(files)
+
+        for file in moved_files:
+            old_filename = file["old_filename"]
+            new_filename = file["new_filename"]
+
+            if old_filename in files_set and new_filename not in files_set:
+                files.append(new_filename)
+                files_set.add(new_filename)
+
+            if new_filename in files_set and old_filename not in files_set:
+                files.append(old_filename)
+                files_set.add(old_filename)
+
+        return files
+
+    def get_metrics(
+        self,
+        component: str,
+        changed_files: List[str],
+        moved_files: List[Dict],
+        touched_files: List[str] = None,
+        previous_metrics: dict = None
+    ) -> dict:
         """
         Retrieves metrics for a given SonarQube component and adjusts them for moved files in a pull request (PR).
 
@@ -24,36 +61,48 @@ class SonarMetricsCollector:
         in a pull request (PR). If a file has been moved, the metrics for the old filepath are set equal to the metrics
         for the new filepath, and vice versa.
 
+        When the metrics of the previous commit are given, only the metrics of the files touched since that commit
+        are retrieved, and the metrics of the other files are carried forward from the previous commit.
+
         Args:
             component (str): The SonarQube component for which metrics are to be retrieved.
-            moved_files (List[Dict]): The list of moved files dicts.
             changed_files (List[str]): The list of modified files in the PR.
+            moved_files (List[Dict]): The list of moved files dicts.
+            touched_files (List[str], optional): The files touched since the previous commit. Defaults to None.
+            previous_metrics (dict, optional): The metrics returned for the previous commit. Defaults to None.
 
         Returns:
             dict: A dictionary containing the adjusted metrics for the specified SonarQube component.
         """
-            
-        metrics = self.__sonar_api.get_metrics(component)
-        changed_files_set = set(changed_files)
 
-        # Removes metrics that are not related with the PR
-        for component_file, _ in list(metrics.items()):
-            file = component_file.split(":")[1]
+        if previous_metrics is None or touched_files is None:
+            # Only the metrics of the files of the PR are requested
+            metrics = self.__sonar_api.get_metrics_for_files(component, changed_files)
+        else:
+            # A moved file copies the metrics of its other name, so both are refreshed together
+            touched_files_set = set(self.get_moved_counterparts(touched_files, moved_files))
+            changed_files_set = set(changed_files)
+
+            metrics = {
+                component_file: file_metrics
+                for component_file, file_metrics in previous_metrics.items()
+                if component_file.split(":", 1)[1] in changed_files_set - touched_files_set
+            }
 
-            if file not in changed_files_set:
-                del metrics[component_file]
+            touched_changed_files = [file for file in changed_files if file in touched_files_set]
+            metrics.update(self.__sonar_api.get_metrics_for_files(component, touched_changed_files))
 
         # Sets metrics for old filepath equal to new filepath
         for file in moved_files:
             old_filename = file["old_filename"]
             new_filename = file["new_filename"]
-            
+
             old_component = f"{component}:{old_filename}"
             new_component = f"{component}:{new_filename}"
 
             if old_component in metrics and new_component not in metrics:
                 metrics[new_component] = metrics[old_component]
-            
+
             if new_component in metrics and old_component not in metrics:
                 metrics[old_component] = metrics[new_component]
 
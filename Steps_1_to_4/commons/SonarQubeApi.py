@@ -1,8 +1,13 @@
 import requests
 import os
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
-from typing import List, Dict
+from commons.SonarQubeApiError import SonarQubeApiError
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import quote
 
 class SonarQubeApi:
     """
@@ -11,24 +16,36 @@ class SonarQubeApi:
     Attributes:
         base_url (str): The base URL of the SonarQube API.
         with_logging (bool): A flag indicating whether logging is enabled.
-        __token (str): The user token for authentication with the SonarQube API, retrieved from the environment.
+        max_workers (int): The maximum number of requests made at once when retrieving issues and metrics.
+        request_count (int): The number of requests made to the SonarQube API so far.
+        __token (str): The user token for authentication with the SonarQube API.
+        __request_count_lock (threading.Lock): Lock that guards the request count.
         __log_file (str): The path to the log file.
         __logger (logging.Logger): The logger object for logging SonarQube API interactions.
     """
 
-    def __init__(self, with_logging: bool) -> None:
+    ISSUES_PAGE_SIZE = 500 # the maximum number of issues per page of issues/search
+    ISSUES_MAX_RESULTS = 10000 # the maximum number of issues returned by a search
+
+    def __init__(self, with_logging: bool, max_workers: int = 4, host: str = None, token: str = None) -> None:
         """
-        Initializes the SonarQubeApi object by loading the user token from a .env file.
+        Initializes the SonarQubeApi object, loading the host and user token from a .env file unless they are given.
 
         Args:
             with_logging (bool): A flag indicating whether logging is enabled or not.
+            max_workers (int, optional): The maximum number of requests made at once when retrieving issues and metrics. Defaults to 4.
+            host (str, optional): The URL of the SonarQube host. Defaults to the SONAR_HOST environment variable.
+            token (str, optional): The user token of the SonarQube host. Defaults to the SONAR_TOKEN environment variable.
         """
 
         load_dotenv()
-        self.__token = os.getenv("SONAR_TOKEN")
-        self.base_url = f"{os.getenv('SONAR_HOST')}/api"
+        self.__token = token or os.getenv("SONAR_TOKEN")
+        self.base_url = f"{host or os.getenv('SONAR_HOST')}/api"
         self.__log_file = "./3-SonarQube_Execution/logs/sonarqube.log"
         self.with_logging = with_logging
+        self.max_workers = max_workers
+        self.request_count = 0
+        self.__request_count_lock = threading.Lock()
         self.__logger = self.__setup_logger()
     
     def __setup_logger(self) -> logging.Logger:
@@ -42,10 +59,12 @@ class SonarQubeApi:
         logger = logging.getLogger(__name__)
         logger.setLevel(logging.DEBUG if self.with_logging else logging.NOTSET)
         
-        file_handler = logging.FileHandler(self.__log_file)
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        # The clients of all SonarQube hosts share the logger of the module
+        if not logger.handlers:
+            file_handler = logging.FileHandler(self.__log_file)
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            file_handler.setFormatter(formatter)
+            logger.addHandler(file_handler)
         
         return logger
 
@@ -62,14 +81,17 @@ class SonarQubeApi:
             dict: The response from the SonarQube API.
         """
 
+        with self.__request_count_lock:
+            self.request_count += 1
+
         headers = {'Authorization': f'Bearer {self.__token}'}
         response = requests.request(method, url, headers=headers, **kwargs)
 
         return response
 
-    def _make_request_and_get_json(self, method: str, url: str, **kwargs) -> dict:
+    def _make_request_and_check_status(self, method: str, url: str, **kwargs) -> requests.Response:
         """
-        Makes a request to the SonarQube API and returns the JSON response.
+        Makes a request to the SonarQube API and checks that it succeeded, for requests whose response has no body.
 
         Args:
             method (str): The HTTP method to use for the request (e.g., 'GET', 'POST', 'PUT', 'DELETE').
@@ -77,22 +99,40 @@ class SonarQubeApi:
             **kwargs: Additional keyword arguments to pass to the requests.request() function.
 
         Returns:
-            dict: The JSON response from the SonarQube API.
+            requests.Response: The response from the SonarQube API.
 
         Raises:
-            RuntimeError: If the response status code is not 2xx.
+            SonarQubeApiError: If the response status code is not 2xx.
         """
         response = self._make_request(method, url, **kwargs)
 
         status_code_is_not_2xx = response.status_code // 100 != 2
 
         if (status_code_is_not_2xx):
-            message = f"Error calling SonarQube API. Status Code: {response.status_code}"
-            self.__logger.debug(message)
+            error = SonarQubeApiError(response.status_code)
+            self.__logger.debug(str(error))
             self.__logger.debug(str(response.content))
-            raise RuntimeError(message)
+            raise error
+
+        return response
 
-        return response.json()
+    def _make_request_and_get_json(self, method: str, url: str, **kwargs) -> dict:
+        """
+        Makes a request to the SonarQube API and returns the JSON response.
+
+        Args:
+            method (str): The HTTP method to use for the request (e.g., 'GET', 'POST', 'PUT', 'DELETE').
+            url (str): The URL to make the request to.
+            **kwargs: Additional keyword arguments to pass to the requests.request() function.
+
+        Returns:
+            dict: The JSON response from the SonarQube API.
+
+        Raises:
+            SonarQubeApiError: If the response status code is not 2xx.
+        """
+
+        return self._make_request_and_check_status(method, url, **kwargs).json()
 
     def check_project_already_exists(self, component: str) -> bool:
         """
@@ -113,16 +153,18 @@ class SonarQubeApi:
         
         return response.status_code == 200
 
-    def create_project(self, name: str, project: str) -> None:
+    def create_project(self, name: str, project: str, check_existence: bool = True) -> None:
         """
         Creates a new project in SonarQube with the given name and project key if it doesn't already exist.
 
         Args:
             name (str): The name of the project to create.
             project (str): The project key of the project to create.
+            check_existence (bool, optional): Whether to check first if the project exists, which the caller may
+                already know from `search_existing_projects`. Defaults to True.
         """
 
-        if self.check_project_already_exists(project):
+        if check_existence and self.check_project_already_exists(project):
             self.__logger.debug("Sonar project already exists")
             return
 
@@ -135,6 +177,32 @@ class SonarQubeApi:
 
         self._make_request_and_get_json("POST", endpoint, params=querystring)
 
+    def search_existing_projects(self, projects: List[str], page_size: int = 100) -> List[str]:
+        """
+        Checks which of the given projects exist in SonarQube, with one request per page of projects.
+
+        Args:
+            projects (List[str]): The project keys to check.
+            page_size (int, optional): The number of projects checked per request (at most 500). Defaults to 100.
+
+        Returns:
+            List[str]: The keys of the projects that exist.
+        """
+
+        endpoint = f"{self.base_url}/projects/search"
+        existing_projects = []
+
+        for k in range(0, len(projects), page_size):
+            querystring = {
+                "projects": ",".join(projects[k:k + page_size]),
+                "ps": page_size
+            }
+
+            data = self._make_request_and_get_json("GET", endpoint, params=querystring)
+            existing_projects.extend(component["key"] for component in data["components"])
+
+        return existing_projects
+
     def create_analysis_token(self, name: str, projectKey: str) -> str:
         """
         Creates an analysis token for the specified project in SonarQube.
@@ -201,12 +269,69 @@ class SonarQubeApi:
 
         return data["paging"]["total"]
 
+    def get_ce_task(self, task_id: str) -> dict:
+        """
+        Retrieves a background (Compute Engine) task from SonarQube, such as the processing of an analysis report.
+
+        Args:
+            task_id (str): The ID of the task.
+
+        Returns:
+            dict: The task, with its status (PENDING, IN_PROGRESS, SUCCESS, FAILED or CANCELED).
+        """
+
+        endpoint = f"{self.base_url}/ce/task"
+
+        querystring = {
+            "id": task_id
+        }
+
+        data = self._make_request_and_get_json("GET", endpoint, params=querystring)
+
+        return data["task"]
+
+    def create_webhook(self, name: str, project: str, url: str, secret: str = None) -> None:
+        """
+        Creates a webhook in a project, called when the report of each analysis is processed, unless the
+        project already has a webhook with the same URL.
+
+        Args:
+            name (str): The name of the webhook.
+            project (str): The project key of the project.
+            url (str): The URL the webhook posts to.
+            secret (str, optional): The secret used to sign the deliveries. Defaults to None.
+        """
+
+        endpoint = f"{self.base_url}/webhooks/list"
+
+        data = self._make_request_and_get_json("GET", endpoint, params={"project": project})
+
+        if any(webhook["url"] == url for webhook in data["webhooks"]):
+            self.__logger.debug("Webhook already exists")
+            return
+
+        endpoint = f"{self.base_url}/webhooks/create"
+
+        querystring = {
+            "name": name,
+            "project": project,
+            "url": url
+        }
+
+        if secret is not None:
+            querystring["secret"] = secret
+
+        self._make_request_and_get_json("POST", endpoint, params=querystring)
+
     def delete_project(self, project: str) -> None:
         """
         Deletes a project from SonarQube.
 
         Args:
             project (str): The project key of the project to delete.
+
+        Raises:
+            SonarQubeApiError: If the response status code is not 2xx.
         """
 
         endpoint = f"{self.base_url}/projects/delete"
@@ -215,9 +340,30 @@ class SonarQubeApi:
             "project": project
         }
 
-        self._make_request("POST", endpoint, params=querystring)
+        # The endpoint answers 204 No Content
+        self._make_request_and_check_status("POST", endpoint, params=querystring)
 
-    def get_issues(self, component: str, page: int, page_size: int, files: str) -> dict:
+    def bulk_delete_projects(self, projects: List[str]) -> None:
+        """
+        Deletes several projects from SonarQube with a single request.
+
+        Args:
+            projects (List[str]): The project keys of the projects to delete.
+
+        Raises:
+            SonarQubeApiError: If the response status code is not 2xx.
+        """
+
+        endpoint = f"{self.base_url}/projects/bulk_delete"
+
+        querystring = {
+            "projects": ",".join(projects)
+        }
+
+        # The endpoint answers 204 No Content
+        self._make_request_and_check_status("POST", endpoint, params=querystring)
+
+    def get_issues(self, component: str, page: int, page_size: int, files: str, filters: dict = None) -> dict:
         """
         Retrieves issues from SonarQube for a specified component.
 
@@ -226,6 +372,7 @@ class SonarQubeApi:
             page (int): The page number of the results.
             page_size (int): The number of issues per page.
             files (str): Comma-separated list of files to filter issues by.
+            filters (dict, optional): Additional parameters of the search (e.g. types, rules or facets). Defaults to None.
 
         Returns:
             dict: A dictionary containing the JSON of retrieved issues.
@@ -238,21 +385,196 @@ class SonarQubeApi:
             "languages": "java",
             "p": page,
             "ps": page_size,
-            "files": files
+            "files": files,
+            "s": "FILE_LINE"
         }
 
+        querystring.update(filters or {})
+
         return self._make_request_and_get_json("GET", endpoint, params=querystring)
 
-    def get_issues_for_files(self, component: str, files: List[str]) -> dict:
+    @staticmethod
+    def batch_files(files: List[str], max_length: int) -> List[List[str]]:
         """
-        Retrieves all issues for each file in a specified component from SonarQube.
+        Splits a list of files into groups whose comma-separated, URL-encoded list fits in a request.
 
         Args:
-            component (str): The component key for which to retrieve issues.
             files (List[str]): A list of file paths.
+            max_length (int): The maximum length of the encoded list of each group.
+
+        Returns:
+            List[List[str]]: The groups of files, in the order of the list.
+        """
+
+        batches = []
+        batch = []
+        batch_length = 0
+
+        for file in files:
+            file_length = len(quote(file, safe="")) + 3
+
+            if batch and batch_length + file_length > max_length:
+                batches.append(batch)
+                batch = []
+                batch_length = 0
+
+            batch.append(file)
+            batch_length += file_length
+
+        if batch:
+            batches.append(batch)
+
+        return batches
+
+    def __get_issues_pages(self, component: str, pages: List[Tuple[List[str], dict, int]], page_size: int) -> List[dict]:
+        """
+        Retrieves pages of issues of several searches in parallel.
+
+        Args:
+            component (str): The component key for which to retrieve issues.
+            pages (List[Tuple[List[str], dict, int]]): The files, the additional filters and the number of each page.
+            page_size (int): The number of issues per page.
 
         Returns:
-            dict: A dictionary containing all retrieved issues for the specified files.
+            List[dict]: The JSON of each page, in the order of the pages.
+        """
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(
+                lambda query_page: self.get_issues(component, query_page[2], page_size, ",".join(query_page[0]), query_page[1]),
+                pages
+            ))
+
+    @staticmethod
+    def get_issues_pages_count(total: int) -> int:
+        """
+        Computes the number of pages of a search, of which SonarQube returns at most `ISSUES_MAX_RESULTS` issues.
+
+        Args:
+            total (int): The number of issues of the search.
+
+        Returns:
+            int: The number of pages of `ISSUES_PAGE_SIZE` issues.
+        """
+
+        return -(-min(total, SonarQubeApi.ISSUES_MAX_RESULTS) // SonarQubeApi.ISSUES_PAGE_SIZE)
+
+    @staticmethod
+    def split_issues_search(files: List[str], filters: dict, total: int, responses: List[dict]) -> Tuple[Optional[List[Tuple[List[str], dict]]], List[dict]]:
+        """
+        Splits a search with more issues than SonarQube returns into disjoint searches with fewer issues.
+
+        The files are split first, then the issues are partitioned by type, by severity, by status, by scope,
+        by rule (when the facet of rules covers every issue) and, at last, by halves of the range of creation
+        dates. Searches that are still too large are split again. The split by rule and by dates needs the first
+        page of other searches on the same files: they are returned as queries, which the client runs before
+        calling this method again with the responses of all queries so far, in order.
+
+        Args:
+            files (List[str]): The files of the search.
+            filters (dict): The additional filters of the search.
+            total (int): The number of issues of the search.
+            responses (List[dict]): The first page, of one issue, of each query returned so far.
+
+        Returns:
+            Tuple[Optional[List[Tuple[List[str], dict]]], List[dict]]: The files and filters of each new search, or
+                None while queries are still needed, and the filters of the queries still needed, if any.
+
+        Raises:
+            RuntimeError: If the search cannot be split anymore, as only part of its issues could be retrieved.
+        """
+
+        if len(files) > 1:
+            return [(files[:len(files) // 2], filters), (files[len(files) // 2:], filters)], []
+
+        enumerated_facets = {
+            "types": ["CODE_SMELL", "BUG", "VULNERABILITY"],
+            "severities": ["INFO", "MINOR", "MAJOR", "CRITICAL", "BLOCKER"],
+            "statuses": ["OPEN", "CONFIRMED", "REOPENED", "RESOLVED", "CLOSED"],
+            "scopes": ["MAIN", "TEST"]
+        }
+
+        for facet, values in enumerated_facets.items():
+            if facet not in filters:
+                return [(files, {**filters, facet: value}) for value in values], []
+
+        if "rules" not in filters and "createdAfter" not in filters:
+            if not responses:
+                return None, [{**filters, "facets": "rules"}]
+
+            data, responses = responses[0], responses[1:]
+            rules = [value for facet in data.get("facets", []) if facet["property"] == "rules" for value in facet["values"]]
+
+            # The facet only lists the most frequent rules, so it is only used when it covers every issue
+            if sum(rule["count"] for rule in rules) == total:
+                return [(files, {**filters, "rules": rule["val"]}) for rule in rules if rule["count"] > 0], []
+
+        parse_date = lambda date: datetime.strptime(date, "%Y-%m-%dT%H:%M:%S%z")
+
+        if "createdAfter" in filters:
+            created_after = parse_date(filters["createdAfter"])
+            created_before = parse_date(filters["createdBefore"])
+        elif not responses:
+            return None, [{**filters, "s": "CREATION_DATE", "asc": ascending} for ascending in ("true", "false")]
+        else:
+            # The creation date of the oldest issue and the second after the newest one
+            created_after = parse_date(responses[0]["issues"][0]["creationDate"])
+            created_before = parse_date(responses[1]["issues"][0]["creationDate"]) + timedelta(seconds=1)
+
+        seconds = int((created_before - created_after).total_seconds())
+
+        # Without SCM data, the issues raised by the same analysis share the same creation date
+        if seconds <= 1:
+            raise RuntimeError(f"Cannot split the search of {total} issues for {files} with {filters}")
+
+        created_middle = created_after + timedelta(seconds=seconds // 2)
+        date_format = lambda date: date.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S%z")
+
+        return [
+            (files, {**filters, "createdAfter": date_format(created_after), "createdBefore": date_format(created_middle)}),
+            (files, {**filters, "createdAfter": date_format(created_middle), "createdBefore": date_format(created_before)})
+        ], []
+
+    def __split_issues_search(self, component: str, files: List[str], filters: dict, total: int) -> List[Tuple[List[str], dict]]:
+        """
+        Splits a search with more issues than SonarQube returns (see `split_issues_search`), running the
+        queries the split needs.
+
+        Args:
+            component (str): The component key for which to retrieve issues.
+            files (List[str]): The files of the search.
+            filters (dict): The additional filters of the search.
+            total (int): The number of issues of the search.
+
+        Returns:
+            List[Tuple[List[str], dict]]: The files and filters of each new search.
+
+        Raises:
+            RuntimeError: If the search cannot be split anymore.
+        """
+
+        responses = []
+
+        while True:
+            new_searches, queries = self.split_issues_search(files, filters, total, responses)
+
+            if not queries:
+                return new_searches
+
+            responses += [self.get_issues(component, 1, 1, ",".join(files), query) for query in queries]
+
+    @staticmethod
+    def build_issues_result(retrieved_issues: List[dict], files: List[str]) -> dict:
+        """
+        Builds the result of a retrieval of issues: deduplicated by key, in the order of the files and of their
+        lines, and with only the fields of interest.
+
+        Args:
+            retrieved_issues (List[dict]): The issues returned by the searches.
+            files (List[str]): The files the issues were retrieved for.
+
+        Returns:
+            dict: A dictionary containing the issues and their total.
         """
 
         issues_fields_to_retrieve = [
@@ -266,60 +588,106 @@ class SonarQubeApi:
             "textRange"
         ]
 
+        # Keeps the order of the files, as when each file was retrieved on its own
+        file_positions = {file: position for position, file in enumerate(files)}
+        retrieved_issues = {issue["key"]: issue for issue in retrieved_issues}
+        retrieved_issues = sorted(
+            retrieved_issues.values(),
+            key=lambda issue: (
+                file_positions.get(issue["component"].split(":", 1)[-1], len(files)),
+                issue.get("textRange", {}).get("startLine", 0)
+            )
+        )
+
         issues = {
             "issues": [],
             "total": 0
         }
 
-        for file in files:
-            page = 1
-            page_size = 500
+        for issue in retrieved_issues:
+            filtered_issue = {}
+
+            for field in issues_fields_to_retrieve:
+                if field in issue:
+                    filtered_issue[field] = issue[field]
+
+            issues["issues"].append(filtered_issue)
 
-            while True:
-                data = self.get_issues(component, page, page_size, file)
-                current_issues = data["issues"]
+        issues["total"] = len(issues["issues"])
 
-                for issue in current_issues:
-                    filtered_issue = {}
+        return issues
+
+    def get_issues_for_files(self, component: str, files: List[str], max_files_length: int = 4000) -> dict:
+        """
+        Retrieves all issues for each file in a specified component from SonarQube.
+
+        The files are requested in groups, whose list fits in the URL, and the pages of all searches are
+        retrieved in parallel. As SonarQube returns at most 10,000 issues per search, searches with more
+        issues are split into disjoint searches (see `__split_issues_search`) until each one fits.
+
+        Args:
+            component (str): The component key for which to retrieve issues.
+            files (List[str]): A list of file paths.
+            max_files_length (int, optional): The maximum length of the encoded list of files of each request.
+                Defaults to 4000.
 
-                    for field in issues_fields_to_retrieve:
-                        if field in issue:
-                            filtered_issue[field] = issue[field]
+        Returns:
+            dict: A dictionary containing all retrieved issues for the specified files, in the order of the files.
 
-                    issues["issues"].append(filtered_issue)
+        Raises:
+            RuntimeError: If a search has more issues than SonarQube returns and cannot be split.
+        """
 
-                total_issues = data["total"]
-                issues["total"] += len(current_issues)
-                current_number_issues = page * page_size
+        page_size = self.ISSUES_PAGE_SIZE
+        max_results = self.ISSUES_MAX_RESULTS
 
-                self.__logger.debug(f"total issues {total_issues} for file {file}")
-                self.__logger.debug(f"current number issues {current_number_issues}")
+        # Retrieves the first page of each search, splitting the searches with too many issues
+        searches = [(batch, {}) for batch in self.batch_files(files, max_files_length)]
+        first_pages = []
 
-                page += 1
+        while searches:
+            data = self.__get_issues_pages(component, [(batch, filters, 1) for batch, filters in searches], page_size)
+            split_searches = []
 
-                all_issues_collected = current_number_issues >= total_issues or page == 20 or total_issues == 0
+            for (batch, filters), search_data in zip(searches, data):
+                if search_data["total"] > max_results:
+                    split_searches += self.__split_issues_search(component, batch, filters, search_data["total"])
+                    continue
 
-                if all_issues_collected:
-                    break
+                first_pages.append((batch, filters, search_data))
 
-        return issues
+            searches = split_searches
+
+        # Retrieves the remaining pages of all searches at once
+        remaining_pages = []
+
+        for batch, filters, search_data in first_pages:
+            remaining_pages += [(batch, filters, page) for page in range(2, self.get_issues_pages_count(search_data["total"]) + 1)]
+
+            self.__logger.debug(f"total issues {search_data['total']} for {len(batch)} file(s) with {filters}")
+
+        data = [search_data for _, _, search_data in first_pages] + self.__get_issues_pages(component, remaining_pages, page_size)
+
+        return self.build_issues_result([issue for page_data in data for issue in page_data["issues"]], files)
 
     @staticmethod
-    def __get_metric_value(metrics: List[Dict], metric_name: str) -> int:
+    def get_metric_values(measures: List[Dict]) -> dict:
         """
-        Retrieves the value of a specified metric from a list of metrics.
+        Retrieves the values of the ncloc and complexity metrics from a list of measures.
 
         Args:
-            metrics (List[Dict]): A list of dictionaries containing metric information.
-            metric_name (str): The name of the metric to retrieve.
+            measures (List[Dict]): A list of dictionaries containing metric information.
 
         Returns:
-            int: The value of the specified metric.
+            dict: A dictionary with the 'ncloc' and 'complexity' values, or None for the missing ones.
         """
 
-        for metric in metrics:
-            if (metric["metric"] == metric_name):
-                return metric["value"]
+        values = {measure["metric"]: measure.get("value") for measure in measures}
+
+        return {
+            "ncloc": values.get("ncloc"),
+            "complexity": values.get("complexity")
+        }
 
     def __get_metrics(self, project: str, page: int, page_size: int) -> dict:
         """
@@ -368,13 +736,7 @@ class SonarQubeApi:
             components = data["components"]
 
             for component in components:
-                component_path = component["key"]
-                measures = component["measures"]
-
-                metrics[component_path] = {
-                    "ncloc": self.__get_metric_value(measures, "ncloc"),
-                    "complexity": self.__get_metric_value(measures, "complexity")
-                }
+                metrics[component["key"]] = self.get_metric_values(component["measures"])
 
             totalItems = data["paging"]["total"]
 
@@ -382,4 +744,64 @@ class SonarQubeApi:
                 break
 
             current_page += 1
-        return metrics
\ No newline at end of file
+        return metrics
+
+    def __get_component_metrics(self, component: str) -> Optional[dict]:
+        """
+        Retrieves the ncloc and complexity metrics of a single component from SonarQube.
+
+        Args:
+            component (str): The key of the component (e.g. "project:path/to/File.java").
+
+        Returns:
+            Optional[dict]: A dictionary with the 'ncloc' and 'complexity' metrics, or None if the component
+                does not exist in the last analysis (e.g. a deleted file).
+
+        Raises:
+            SonarQubeApiError: If the response status code is neither 2xx nor 404.
+        """
+
+        endpoint = f"{self.base_url}/measures/component"
+
+        querystring = {
+            "component": component,
+            "metricKeys": "ncloc,complexity"
+        }
+
+        response = self._make_request("GET", endpoint, params=querystring)
+
+        if response.status_code == 404:
+            return None
+
+        if response.status_code // 100 != 2:
+            error = SonarQubeApiError(response.status_code)
+            self.__logger.debug(str(error))
+            self.__logger.debug(str(response.content))
+            raise error
+
+        return self.get_metric_values(response.json()["component"]["measures"])
+
+    def get_metrics_for_files(self, project: str, files: List[str]) -> dict:
+        """
+        Retrieves metrics for the given files of a project from SonarQube, in parallel requests.
+
+        Args:
+            project (str): The component key of the project for which to retrieve metrics.
+            files (List[str]): A list of file paths.
+
+        Returns:
+            dict: A dictionary containing the retrieved metrics for each file that exists in the project.
+                The keys are the component keys of the files, and the values are dictionaries with
+                'ncloc' and 'complexity' metrics for each file.
+        """
+
+        components = list(dict.fromkeys(f"{project}:{file}" for file in files))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            component_metrics = list(executor.map(self.__get_component_metrics, components))
+
+        return {
+            component: metrics
+            for component, metrics in zip(components, component_metrics)
+            if metrics is not None
+        }
@@ -0,0 +1,18 @@
+class SonarQubeApiError(RuntimeError):
+    """
+    An error raised when a request to the SonarQube API does not succeed, i.e. its status code is not 2xx.
+
+    Attributes:
+        status_code (int): The status code of the response.
+    """
+
+    def __init__(self, status_code: int) -> None:
+        """
+        Initializes the SonarQubeApiError object.
+
+        Args:
+            status_code (int): The status code of the response.
+        """
+
+        super().__init__(f"Error calling SonarQube API. Status Code: {status_code}")
+        self.status_code = status_code
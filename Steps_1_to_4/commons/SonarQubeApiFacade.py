@@ -0,0 +1,79 @@
+import asyncio
+import threading
+from typing import Any
+from commons.AsyncSonarQubeApi import AsyncSonarQubeApi
+
+class SonarQubeApiFacade:
+    """
+    A synchronous facade of AsyncSonarQubeApi, usable wherever a SonarQubeApi is expected.
+
+    The asynchronous client runs in an event loop of its own, in a background thread. Each method of the
+    facade submits the coroutine of the same method to this loop and blocks until it completes, so the
+    calls of all threads share the connections and the per-host limit of a single client.
+
+    Attributes:
+        __async_api (AsyncSonarQubeApi): The asynchronous client.
+        __loop (asyncio.AbstractEventLoop): The event loop of the client.
+        __thread (threading.Thread): The thread running the event loop.
+    """
+
+    def __init__(self, with_logging: bool, max_connections: int = 8, host: str = None, token: str = None) -> None:
+        """
+        Initializes the SonarQubeApiFacade object and starts the event loop of the client.
+
+        Args:
+            with_logging (bool): A flag indicating whether logging is enabled or not.
+            max_connections (int, optional): The maximum number of connections open at once to the SonarQube host.
+                Defaults to 8.
+            host (str, optional): The URL of the SonarQube host. Defaults to the SONAR_HOST environment variable.
+            token (str, optional): The user token of the SonarQube host. Defaults to the SONAR_TOKEN environment variable.
+        """
+
+        self.__async_api = AsyncSonarQubeApi(with_logging, max_connections, host, token)
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(target=self.__loop.run_forever, name="sonarqube-api", daemon=True)
+        self.__thread.start()
+
+    def __run(self, coroutine: Any) -> Any:
+        """
+        Runs a coroutine in the event loop of the client and waits for its result.
+
+        Args:
+            coroutine (Any): The coroutine to run.
+
+        Returns:
+            Any: The result of the coroutine.
+        """
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self.__loop).result()
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Retrieves an attribute of the client, wrapping its coroutine methods in blocking calls.
+
+        Args:
+            name (str): The name of the attribute.
+
+        Returns:
+            Any: The attribute, or a function that runs the method and returns its result.
+        """
+
+        attribute = getattr(self.__async_api, name)
+
+        if not asyncio.iscoroutinefunction(attribute):
+            return attribute
+
+        def call(*args, **kwargs) -> Any:
+            return self.__run(attribute(*args, **kwargs))
+
+        return call
+
+    def close(self) -> None:
+        """
+        Closes the connections of the client and stops its event loop.
+        """
+
+        self.__run(self.__async_api.close())
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__loop.close()